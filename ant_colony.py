@@ -1,18 +1,1034 @@
-from threading import Thread
+from threading import Thread, Lock
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from array import array
+import math
+import random
+import os
+import tempfile
+import weakref
+import hashlib
+import sqlite3
+import heapq
+import asyncio
+import inspect
+
+#numpy is optional, it is only used to speed up work on whole matrices when it is available
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+def euclidean_distance(start, end):
+	"""
+	straight line distance between two coordinates (of any, but equal, dimension)
+	"""
+	return math.sqrt(sum([pow(a - b, 2) for a, b in zip(start, end)]))
+
+def manhattan_distance(start, end):
+	"""
+	sum of the absolute differences along each axis between two coordinates
+	"""
+	return float(sum([abs(a - b) for a, b in zip(start, end)]))
+
+def chebyshev_distance(start, end):
+	"""
+	largest absolute difference along any axis between two coordinates
+	"""
+	return float(max([abs(a - b) for a, b in zip(start, end)]))
+
+def haversine_distance(start, end):
+	"""
+	great circle distance in kilometers between two (latitude, longitude) pairs given in decimal degrees
+	source: https://en.wikipedia.org/wiki/Haversine_formula
+	"""
+	start_lat, start_long = math.radians(start[0]), math.radians(start[1])
+	end_lat, end_long = math.radians(end[0]), math.radians(end[1])
+	a = pow(math.sin((end_lat - start_lat)/2), 2) + math.cos(start_lat)*math.cos(end_lat)*pow(math.sin((end_long - start_long)/2), 2)
+	return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+def _axis_differences(sources, destinations):
+	"""
+	yields the absolute differences along each axis between every row of sources and every row of destinations
+	one axis at a time, so no (sources x destinations x axes) temporary is ever allocated
+	"""
+	for axis in range(sources.shape[1]):
+		yield numpy.abs(sources[:, axis, numpy.newaxis] - destinations[numpy.newaxis, :, axis])
+
+def _euclidean_block(sources, destinations):
+	"""
+	numpy version of euclidean_distance(), gives the distances from every row of sources to every row of destinations
+	"""
+	total = numpy.zeros((len(sources), len(destinations)))
+	for difference in _axis_differences(sources, destinations):
+		total += difference*difference
+	return numpy.sqrt(total, out=total)
+
+def _manhattan_block(sources, destinations):
+	"""
+	numpy version of manhattan_distance()
+	"""
+	total = numpy.zeros((len(sources), len(destinations)))
+	for difference in _axis_differences(sources, destinations):
+		total += difference
+	return total
+
+def _chebyshev_block(sources, destinations):
+	"""
+	numpy version of chebyshev_distance()
+	"""
+	total = numpy.zeros((len(sources), len(destinations)))
+	for difference in _axis_differences(sources, destinations):
+		numpy.maximum(total, difference, out=total)
+	return total
+
+def _haversine_block(sources, destinations):
+	"""
+	numpy version of haversine_distance()
+	"""
+	sources = numpy.radians(sources)
+	destinations = numpy.radians(destinations)
+	start_lat, start_long = sources[:, 0, numpy.newaxis], sources[:, 1, numpy.newaxis]
+	end_lat, end_long = destinations[numpy.newaxis, :, 0], destinations[numpy.newaxis, :, 1]
+	a = numpy.sin((end_lat - start_lat)/2)**2 + numpy.cos(start_lat)*numpy.cos(end_lat)*numpy.sin((end_long - start_long)/2)**2
+	return 6371.0 * 2 * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))
+
+#number of matrix cells worked on at a time when going over numpy matrices in pieces
+#	keeps temporaries small, and lets the OS page a memmap'd matrix in and out as it is streamed through
+chunk_cells = 1 << 20
+
+#built-in metrics, usable by name in place of a distance_callback
+#	maps metric name -> (distance between a pair of coordinates, numpy distances between blocks of coordinates)
+metrics = {
+	'euclidean': (euclidean_distance, _euclidean_block),
+	'manhattan': (manhattan_distance, _manhattan_block),
+	'chebyshev': (chebyshev_distance, _chebyshev_block),
+	'haversine': (haversine_distance, _haversine_block),
+}
+
+#fewest possible locations for ant._pick_path() to weigh them with numpy, below this numpy's overhead per call outweighs the gain
+vectorized_locations = 32
+
+#how many times ant._pick_path() draws from the whole row of choice_cumulative for an unvisited location
+#	before weighing only the unvisited ones instead (see ant._sample_unvisited())
+rejection_attempts = 8
+
+#ways mainloop() can construct the ants' tours, see ant_colony.__init__()
+backends = ('threads', 'batched', 'processes')
+
+#ways the threads backend can run the ants, besides a thread per ant or a given concurrent.futures Executor, see ant_colony.__init__()
+executors = ('sequential', 'pool')
+
+#lowest ant_colony.pheromone_scale before it is folded back into the stored pheromone amounts (see ant_colony._update_pheromone_map())
+#	low enough to do so rarely, high enough that stored amounts (deposits / pheromone_scale) stay far from overflowing a float32
+pheromone_scale_floor = 1e-12
+
+#how many distances ant_colony.precompute_distances_async() awaits at a time
+async_batch = 1024
+
+#how many random floats a random_stream draws at a time
+random_block = 256
+
+#compact storage for the matrices, usable by name as the dtype of ant_colony
+#	maps dtype name -> (typecode of distance_matrix, typecode of the pheromone maps)
+#	typecodes are those of the array module (4 byte cells), which numpy understands as well
+dtypes = {
+	'float32': ('f', 'f'),
+	'int32': ('i', 'f'),
+}
+
+class symmetric_matrix:
+	"""
+	an NxN symmetric matrix, stored as its packed lower triangle (diagonal included) in one contiguous array
+	read and written as matrix[i][j], like the list of lists matrices, where [i][j] and [j][i] are the same cell
+	so it takes roughly half the memory, and every value only has to be computed or updated once
+	"""
+	def __init__(self, size, value=0.0, typecode='d', values=None):
+		"""
+		values -> if given, an existing buffer of size*(size+1)/2 cells to use (such as a numpy.memmap), instead of a new array
+		"""
+		self.size = size
+		if values is None:
+			values = array(typecode, [value]) * (size*(size+1)//2)
+		self.values = values
+	
+	@staticmethod
+	def index(row, column):
+		"""
+		position of cell [row][column] in self.values
+		"""
+		if row < column:
+			row, column = column, row
+		return row*(row+1)//2 + column
+	
+	def __len__(self):
+		return self.size
+	
+	def __getitem__(self, row):
+		return _symmetric_row(self, row)
+
+class _symmetric_row:
+	"""
+	view of a single row of a symmetric_matrix, so that matrix[i][j] indexing works
+	"""
+	__slots__ = ('values', 'row', 'offset', 'size')
+	
+	def __init__(self, matrix, row):
+		self.values = matrix.values
+		self.row = row
+		#start of this row's part of the lower triangle, holding columns 0 .. row
+		self.offset = row*(row+1)//2
+		self.size = matrix.size
+	
+	def __len__(self):
+		return self.size
+	
+	def __getitem__(self, column):
+		if column <= self.row:
+			return self.values[self.offset + column]
+		return self.values[column*(column+1)//2 + self.row]
+	
+	def __setitem__(self, column, value):
+		if column <= self.row:
+			self.values[self.offset + column] = value
+		else:
+			self.values[column*(column+1)//2 + self.row] = value
+	
+	def __iter__(self):
+		for column in range(self.size):
+			yield self[column]
+
+class bitmap:
+	"""
+	a fixed number of True / False flags, packed 8 to a byte
+	used to record which cells of a matrix hold a computed value, since any value (even 0) may be a valid one
+	"""
+	def __init__(self, size, value=False):
+		self.size = size
+		self.bits = bytearray([0xff if value else 0x00]) * ((size + 7)//8)
+	
+	def __len__(self):
+		return self.size
+	
+	def __getitem__(self, index):
+		return bool(self.bits[index >> 3] & (1 << (index & 7)))
+	
+	def set(self, index):
+		self.bits[index >> 3] |= 1 << (index & 7)
+	
+	def set_range(self, start, stop):
+		"""
+		set all flags from start up to (not including) stop
+		whole bytes are set at once, only the partial bytes at either end are done a flag at a time
+		"""
+		while start < stop and start & 7:
+			self.set(start)
+			start += 1
+		while stop > start and stop & 7:
+			stop -= 1
+			self.set(stop)
+		self.bits[start >> 3:stop >> 3] = b'\xff' * ((stop - start) >> 3)
+	
+	def all(self):
+		"""
+		whether every flag is set
+		"""
+		full, rest = divmod(self.size, 8)
+		if self.bits.count(b'\xff', 0, full) != full:
+			return False
+		return not rest or self.bits[full] & ((1 << rest) - 1) == (1 << rest) - 1
+
+def _gather(row, indices):
+	"""
+	the values of a matrix row at indices (a numpy array of columns), as a float numpy array
+	read straight from the underlying buffer for numpy rows, array.array rows and rows of a symmetric_matrix
+	requires numpy
+	"""
+	if isinstance(row, numpy.ndarray):
+		return row[indices].astype(float)
+	if isinstance(row, _symmetric_row):
+		values = row.values if isinstance(row.values, numpy.ndarray) else numpy.frombuffer(row.values, dtype=row.values.typecode)
+		#same as _symmetric_row.__getitem__(), for all of indices at once
+		cells = numpy.where(indices <= row.row, row.offset + indices, indices*(indices+1)//2 + row.row)
+		return values[cells].astype(float)
+	if isinstance(row, array):
+		return numpy.frombuffer(row, dtype=row.typecode)[indices].astype(float)
+	return numpy.array([row[index] for index in indices], dtype=float)
+
+def _log_attractiveness(pheromone_amount, distance, alpha, beta):
+	"""
+	the attractiveness of a step (tau^alpha * eta^beta, eta = 1/distance) in log space: alpha*log(tau) - beta*log(distance)
+	so it can't underflow to zero (or overflow), however small the pheromone amount or large the distance
+	-inf without pheromone (for alpha > 0), +inf at distance 0 (for beta > 0), which is taken over all others
+	"""
+	log_weight = 0.0
+	if beta:
+		if distance == 0:
+			return float('inf')
+		log_weight -= beta*math.log(distance)
+	if alpha:
+		if pheromone_amount <= 0:
+			return float('-inf')
+		log_weight += alpha*math.log(pheromone_amount)
+	return log_weight
+
+def _log_attractiveness_block(pheromones, distances, alpha, beta):
+	"""
+	numpy version of _log_attractiveness(), for arrays of pheromone amounts and distances
+	requires numpy
+	"""
+	log_weights = numpy.zeros(len(distances))
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		if beta:
+			log_weights -= beta*numpy.log(distances)
+		if alpha:
+			log_weights += alpha*numpy.log(pheromones)
+	#no pheromone at distance 0 (-inf + inf), distance 0 wins as in _log_attractiveness()
+	log_weights[numpy.isnan(log_weights)] = numpy.inf
+	return log_weights
+
+def _shifted_weights(log_weights):
+	"""
+	weights from a numpy array of log_weights, shifted by their highest finite value before exponentiating
+	so the highest finite weight is 1.0, the rest keep their proportions, and a choice between them never sees all zeros
+	-inf gives 0.0, +inf stays infinite (see ant._roulette())
+	requires numpy
+	"""
+	finite = log_weights[numpy.isfinite(log_weights)]
+	highest = finite.max() if len(finite) else 0.0
+	return numpy.exp(log_weights - highest)
+
+def _lockstep_step(rows, visited, candidates, tosses, nearest, q0=0.0):
+	"""
+	picks the next location of each of a number of ants advancing in lockstep (see ant_colony._construct_tours_batched())
+	rows -> the weights of the step from each ant's location to each location (an (ants x N) float array, changed in place)
+		None on the first pass, then any unvisited location is as likely
+	visited -> the locations each ant has visited (an (ants x N) bool array)
+	candidates -> the candidates of each ant's location (an (ants x N) bool array), or None
+	tosses -> a random float in [0, 1) per ant
+	nearest -> a function returning the nearest unvisited location of the ants in a bool array (of ants), for those with all candidates visited
+	q0 -> the probability of an ant taking its most attractive step rather than a random one (as in Ant Colony System), not on the first pass
+		decided by the same toss, which is then stretched back over [0, 1) for the random choice, so every step takes one toss either way
+	the arithmetic of each ant's row does not depend on how many ants there are, so a seeded ant of the threads backend
+		(see ant._pick_path_lockstep()) makes the same choices as it would in the batched backend
+	returns the next location of each ant, as a numpy array
+	requires numpy
+	"""
+	weighted = rows is not None
+	if not weighted:
+		rows = (~visited).astype(float)
+	else:
+		rows[visited] = 0.0
+		if candidates is not None:
+			rows[~candidates] = 0.0
+		
+		#locations at distance 0 have infinite weights, and are taken over all others (see ant._roulette())
+		infinite = ~numpy.isfinite(rows)
+		if infinite.any():
+			rows = numpy.where(infinite.any(axis=1)[:, numpy.newaxis], infinite, rows).astype(float)
+	
+	#no weight left: all candidates visited (take the nearest unvisited location), or all rounded down to zero (any is as likely)
+	empty = ~(rows.sum(axis=1) > 0.0)
+	nearest_locations = None
+	if empty.any():
+		if candidates is not None:
+			nearest_locations = nearest(empty)
+		else:
+			rows[empty] = ~visited[empty]
+	
+	greedy = None
+	if q0 and weighted:
+		#the most attractive step (the first of them on a tie) with a toss below q0, unless there is no weight left
+		greedy = (tosses < q0) & ~empty
+		greedy_locations = rows[greedy].argmax(axis=1)
+		tosses = numpy.where(tosses < q0, tosses / q0, (tosses - q0) / (1 - q0))
+	
+	cumulative = numpy.cumsum(rows, axis=1, out=rows)
+	locations = numpy.minimum((cumulative <= (tosses * cumulative[:, -1])[:, numpy.newaxis]).sum(axis=1), rows.shape[1] - 1)
+	if greedy is not None:
+		locations[greedy] = greedy_locations
+	if nearest_locations is not None:
+		locations[empty] = nearest_locations
+	return locations
+
+class random_stream:
+	"""
+	an independent stream of random floats in [0, 1), for one tour of one ant of a seeded ant_colony (see ant_colony.__init__())
+	seeded from the colony's seed and a key of (iteration, ant), as numpy's SeedSequence(seed, spawn_key=key)
+		(the streams SeedSequence(seed).spawn() gives, spawned again per iteration)
+	so the numbers an ant draws don't depend on which thread or backend constructs its tour, or when
+	the floats are drawn random_block at a time, from numpy's PCG64 generator (or a random.Random seeded with seed and key, without numpy)
+	random() and choice() stand in for those of the random module
+	"""
+	def __init__(self, seed, key):
+		if numpy is not None:
+			self.generator = numpy.random.Generator(numpy.random.PCG64(numpy.random.SeedSequence(seed, spawn_key=key)))
+		else:
+			self.generator = random.Random('/'.join([str(part) for part in (seed,) + tuple(key)]))
+		self.block = []
+		self.position = 0
+	
+	def _draw(self):
+		if numpy is not None:
+			return self.generator.random(random_block).tolist()
+		return [self.generator.random() for x in range(random_block)]
+	
+	def random(self):
+		if self.position == len(self.block):
+			self.block = self._draw()
+			self.position = 0
+		self.position += 1
+		return self.block[self.position - 1]
+	
+	def choice(self, sequence):
+		return sequence[int(self.random()*len(sequence))]
+
+class location_set:
+	"""
+	the locations (node ids, ints from 0) an ant has not visited yet, read like the list it replaces:
+	len(), iteration, indexing (for random.choice()), 'in' and remove()
+	the locations are kept in a list, with a flag per location in a bytearray and its position in the list in an array
+	so membership tests are a byte lookup, and remove() moves the last location into the removed one's place (changing the order)
+	rather than shifting all the ones after it, both O(1)
+	reset() makes it hold a new set of locations, reusing the same buffers, so an ant can reuse it for every tour
+	"""
+	def __init__(self, locations):
+		self.locations = []
+		self.present = bytearray()
+		self.positions = array('l')
+		self.reset(locations)
+	
+	def reset(self, locations):
+		#clear the flags of the locations still held (none, after a whole tour)
+		for location in self.locations:
+			self.present[location] = 0
+		
+		self.locations[:] = locations
+		size = max(self.locations) + 1 if self.locations else 0
+		if len(self.present) < size:
+			self.present.extend(bytearray(size - len(self.present)))
+			self.positions.extend(array('l', [0]) * (size - len(self.positions)))
+		
+		present = self.present
+		positions = self.positions
+		for position, location in enumerate(self.locations):
+			present[location] = 1
+			positions[location] = position
+	
+	def __len__(self):
+		return len(self.locations)
+	
+	def __iter__(self):
+		return iter(self.locations)
+	
+	def __getitem__(self, position):
+		return self.locations[position]
+	
+	def __contains__(self, location):
+		return 0 <= location < len(self.present) and self.present[location] == 1
+	
+	def remove(self, location):
+		if location not in self:
+			raise ValueError("location_set.remove(x): x not in location_set")
+		
+		position = self.positions[location]
+		last = self.locations.pop()
+		if last != location:
+			self.locations[position] = last
+			self.positions[last] = position
+		self.present[location] = 0
+
+class _tour:
+	"""
+	a tour constructed by the batched backend of ant_colony (see ant_colony._construct_tours_batched())
+	read like a finished ant, by ant_colony._populate_ant_updated_pheromone_map() and mainloop()
+	"""
+	__slots__ = ('route', 'distance_traveled')
+	
+	def __init__(self, route, distance_traveled):
+		self.route = route
+		self.distance_traveled = distance_traveled
+	
+	def get_route(self):
+		return self.route
+	
+	def get_distance_traveled(self):
+		return self.distance_traveled
+
+def _initial_pheromone(colony, weight):
+	"""
+	weight * Q / (rho * the shortest distance so far), what the trails of an update_rule start with
+	(the pheromone amount a tour depositing weight times, every iteration, converges to)
+	None without evaporation, where the pheromone amounts have no limit
+	"""
+	rho = colony.pheromone_evaporation_coefficient
+	if not rho or not colony.shortest_distance:
+		return None
+	return weight * colony.pheromone_constant / (rho * colony.shortest_distance)
+
+class update_rule:
+	"""
+	how ant_colony.mainloop() updates the pheromones after each iteration, as its update_strategy
+	as is, plain Ant System: every ant deposits pheromone_constant / its distance traveled along its route
+	subclass it to choose which tours deposit pheromones, and how much (deposits()), how much pheromone all trails start with (initial_pheromone())
+	and to bound the pheromone amounts (bounds())
+	source of the initial pheromone amounts: Dorigo, Stützle, Ant Colony Optimization (2004), 3.4
+	
+	q0 -> the probability of an ant taking the most attractive step rather than a random one (see ant._pick_path_greedy())
+	local_evaporation -> how far each step of an ant moves the pheromone amount of its edge towards the initial amount, as the ant takes it
+		(see ant_colony._local_update_step() and _local_step())
+	both 0.0 but for ant_colony_system
+	"""
+	q0 = 0.0
+	local_evaporation = 0.0
+	
+	def deposits(self, colony, ants):
+		"""
+		the tours that deposit pheromones this iteration, given the colony and its ants that just finished their tours
+		each lays pheromone_constant / its distance traveled along its route (see ant_colony._deposit_pheromones())
+		(tour() gives one depositing a multiple of that, colony.shortest_path_seen and colony.shortest_distance are the best tour so far)
+		"""
+		return ants
+	
+	def initial_pheromone(self, colony):
+		"""
+		None, or the pheromone amount all trails are set to after the first iteration (see ant_colony._bound_pheromones())
+		the ants of the first iteration choose without pheromones, so the pheromone amounts start from there
+		as is, the trails keep the pheromones of the first iteration's ants, and every other trail none
+		"""
+		return None
+	
+	def bounds(self, colony):
+		"""
+		None, or (low, high): the pheromone amounts are then kept between low and high after each update (see ant_colony._bound_pheromones())
+		"""
+		return None
+	
+	@staticmethod
+	def tour(route, distance_traveled, weight=1.0):
+		"""
+		a tour along route depositing weight times the pheromones of an ant that traveled distance_traveled
+		"""
+		return _tour(route, distance_traveled / weight)
+
+class ant_system(update_rule):
+	"""
+	the original Ant System update: every ant deposits pheromones
+	"""
+	pass
+
+class elitist_ant_system(update_rule):
+	"""
+	Elitist Ant System: every ant deposits pheromones, and the shortest tour so far elitist_weight times as much on top
+	elitist_weight -> defaults to the number of ants
+	"""
+	def __init__(self, elitist_weight=None):
+		if elitist_weight is not None:
+			if (type(elitist_weight) is not int) and type(elitist_weight) is not float:
+				raise TypeError("elitist_weight must be int or float")
+			
+			if elitist_weight <= 0:
+				raise ValueError("elitist_weight must be > 0")
+		
+		self.elitist_weight = elitist_weight
+	
+	def _weight(self, colony):
+		return self.elitist_weight if self.elitist_weight is not None else colony.ant_count
+	
+	def deposits(self, colony, ants):
+		return list(ants) + [self.tour(colony.shortest_path_seen, colony.shortest_distance, self._weight(colony))]
+	
+	def initial_pheromone(self, colony):
+		"""
+		(elitist_weight + ants) * Q / (rho * the shortest distance so far)
+		"""
+		return _initial_pheromone(colony, self._weight(colony) + colony.ant_count)
+
+class rank_based_ant_system(update_rule):
+	"""
+	rank-based Ant System: only the ranks-1 shortest tours of the iteration deposit pheromones
+	the r-th shortest of them ranks-r times as much, and the shortest tour so far ranks times as much
+	"""
+	def __init__(self, ranks=6):
+		if type(ranks) is not int:
+			raise TypeError("ranks must be int")
+		
+		if ranks < 1:
+			raise ValueError("ranks must be >= 1")
+		
+		self.ranks = ranks
+	
+	def deposits(self, colony, ants):
+		ranked = sorted(ants, key=lambda ant: ant.get_distance_traveled())[:self.ranks - 1]
+		tours = [self.tour(ant.get_route(), ant.get_distance_traveled(), self.ranks - rank) for rank, ant in enumerate(ranked, 1)]
+		return tours + [self.tour(colony.shortest_path_seen, colony.shortest_distance, self.ranks)]
+	
+	def initial_pheromone(self, colony):
+		"""
+		ranks * (ranks-1) / 2 * Q / (rho * the shortest distance so far)
+		"""
+		return _initial_pheromone(colony, self.ranks * (self.ranks - 1) / 2.0)
+
+class max_min_ant_system(update_rule):
+	"""
+	MAX-MIN Ant System: only one tour deposits pheromones, and the pheromone amounts are kept between tau_min and tau_max
+	best -> which tour deposits:
+		'iteration' -> the shortest tour of the iteration
+		'global' -> the shortest tour so far
+	p_best -> the probability of an ant that converged on the best tour to take it again, which sets tau_min (see bounds())
+	source: Stützle, Hoos, MAX-MIN Ant System, Future Generation Computer Systems 16 (2000)
+	"""
+	def __init__(self, best='iteration', p_best=.05):
+		if not isinstance(best, str):
+			raise TypeError("best must be str")
+		
+		if best not in ('iteration', 'global'):
+			raise ValueError("best must be one of: global, iteration, saw: " + best)
+		
+		if (type(p_best) is not int) and type(p_best) is not float:
+			raise TypeError("p_best must be int or float")
+		
+		if not 0 < p_best < 1:
+			raise ValueError("p_best must be > 0 and < 1")
+		
+		self.best = best
+		self.p_best = float(p_best)
+	
+	def deposits(self, colony, ants):
+		if self.best == 'global':
+			return [self.tour(colony.shortest_path_seen, colony.shortest_distance)]
+		return [min(ants, key=lambda ant: ant.get_distance_traveled())]
+	
+	def initial_pheromone(self, colony):
+		"""
+		tau_max, so the ants explore widely at first
+		"""
+		return _initial_pheromone(colony, 1.0)
+	
+	def bounds(self, colony):
+		"""
+		tau_max = Q / (rho * the shortest distance so far), what the best tour's edges converge to
+		tau_min = tau_max * (1 - p_dec) / ((avg - 1) * p_dec), with p_dec = p_best^(1/N) and avg = N/2 choices per step
+		"""
+		high = _initial_pheromone(colony, 1.0)
+		if high is None:
+			return None
+		
+		size = len(colony.nodes)
+		if size < 3:
+			return (0.0, high)
+		p_dec = pow(self.p_best, 1.0 / size)
+		low = high * (1 - p_dec) / ((size/2.0 - 1) * p_dec)
+		return (min(low, high), high)
+
+class ant_colony_system(update_rule):
+	"""
+	Ant Colony System: ants take the most attractive step with probability q0, otherwise choose as in Ant System
+	each step of an ant moves the pheromone amount of its edge local_evaporation of the way back to tau_0 as it takes it (the local update)
+		so the ants after it are less likely to take the same edge
+		(with the processes backend, whose workers construct their ants' tours on their own, only once all tours are constructed)
+	and only the shortest tour so far deposits pheromones, rho times as much (the global update)
+	tau_0 = Q / (N * the shortest distance of the first iteration), which the pheromone amounts are kept above
+	source: Dorigo, Gambardella, Ant Colony System, IEEE Transactions on Evolutionary Computation 1 (1997)
+	"""
+	def __init__(self, q0=.9, local_evaporation=.1):
+		if (type(q0) is not int) and type(q0) is not float:
+			raise TypeError("q0 must be int or float")
+		
+		if not 0 <= q0 < 1:
+			raise ValueError("q0 must be >= 0 and < 1")
+		
+		if (type(local_evaporation) is not int) and type(local_evaporation) is not float:
+			raise TypeError("local_evaporation must be int or float")
+		
+		if not 0 <= local_evaporation <= 1:
+			raise ValueError("local_evaporation must be >= 0 and <= 1")
+		
+		self.q0 = float(q0)
+		self.local_evaporation = float(local_evaporation)
+	
+	def deposits(self, colony, ants):
+		#tau_xy <- (1-rho)*tau_xy + rho*Q/L, the evaporation as for all strategies (see ant_colony._update_pheromone_map())
+		rho = colony.pheromone_evaporation_coefficient
+		if not rho:
+			return []
+		return [self.tour(colony.shortest_path_seen, colony.shortest_distance, rho)]
+	
+	def initial_pheromone(self, colony):
+		"""
+		tau_0 = Q / (N * the shortest distance so far)
+		"""
+		if not colony.shortest_distance:
+			return None
+		return colony.pheromone_constant / (len(colony.nodes) * colony.shortest_distance)
+	
+	def bounds(self, colony):
+		"""
+		(tau_0, infinity), neither update of Ant Colony System takes a pheromone amount below tau_0
+		"""
+		if colony.initial_pheromone_amount is None:
+			return None
+		return (colony.initial_pheromone_amount, float('inf'))
+
+#update_strategy of ant_colony by name, constructed with the default parameters
+update_strategies = {
+	'ant_system': ant_system,
+	'elitist': elitist_ant_system,
+	'rank': rank_based_ant_system,
+	'max_min': max_min_ant_system,
+	'colony_system': ant_colony_system,
+}
+
+class distance_row_cache:
+	"""
+	stands in for an NxN distance matrix too large to keep: holds at most max_rows rows, computed on demand by compute_row(row)
+	read as matrix[i][j], like the other matrices, the least recently used row is dropped to make room for a new one
+	so memory is max_rows*N cells, rather than N*N
+	safe to use from several ant threads at once
+	"""
+	def __init__(self, size, max_rows, compute_row):
+		self.size = size
+		self.max_rows = max_rows
+		self.compute_row = compute_row
+		#row -> its distances, least recently used first
+		self.rows = OrderedDict()
+		self.lock = Lock()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+	
+	def __len__(self):
+		return self.size
+	
+	def __getitem__(self, row):
+		with self.lock:
+			if row in self.rows:
+				self.hits += 1
+				self.rows.move_to_end(row)
+				return self.rows[row]
+			
+			self.misses += 1
+			if len(self.rows) >= self.max_rows:
+				self.rows.popitem(last=False)
+				self.evictions += 1
+			self.rows[row] = self.compute_row(row)
+			return self.rows[row]
+	
+	def get_stats(self):
+		"""
+		returns how the row lookups were served, as a dict:
+			hits -> lookups of a row that was held
+			misses -> lookups that had to compute the row
+			hit_rate -> hits / (hits + misses), None if there were no lookups yet
+			evictions -> rows dropped to make room for another
+			rows -> rows held now
+		"""
+		lookups = self.hits + self.misses
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'hit_rate': float(self.hits)/lookups if lookups else None,
+			'evictions': self.evictions,
+			'rows': len(self.rows),
+		}
+
+#state of a worker process of ant_colony.precompute_distances(), set once per process by _init_precompute_worker()
+_precompute_worker = {}
+
+def _init_precompute_worker(distance_callback, distance_batch, values, buffer_name):
+	"""
+	runs once in each worker process of ant_colony.precompute_distances()
+	keeps the distance_callback, the node values (by node id) and the shared buffer the distances are written to
+	"""
+	_precompute_worker['distance_callback'] = distance_callback
+	_precompute_worker['distance_batch'] = distance_batch
+	_precompute_worker['values'] = values
+	_precompute_worker['buffer'] = shared_memory.SharedMemory(name=buffer_name)
+
+def _check_distances(distances, count):
+	"""
+	validates the distances of a row from distance_callback (a batch, or one call per pair), which should be count int or float values
+	the same in this process (see ant_colony._compute_distances()) and in the workers of ant_colony.precompute_distances()
+	returns the distances as a float numpy array if numpy is available, as a list otherwise
+	"""
+	if numpy is not None:
+		distances = numpy.asarray(distances)
+		if distances.dtype.kind not in 'iuf':
+			raise TypeError("distance_callback should return a sequence of int or float, saw: " + str(distances.dtype))
+		if distances.shape != (count,):
+			raise ValueError("distance_callback should return " + str(count) + " distances, saw shape: " + str(distances.shape))
+		return distances.astype(float)
+	
+	distances = list(distances)
+	invalid = [type(distance) for distance in distances if (type(distance) is not int) and (type(distance) is not float)]
+	if invalid:
+		raise TypeError("distance_callback should return a sequence of int or float, saw: " + str(invalid[0]))
+	if len(distances) != count:
+		raise ValueError("distance_callback should return " + str(count) + " distances, saw: " + str(len(distances)))
+	return distances
+
+def _precompute_rows(rows):
+	"""
+	computes a block of rows for ant_colony.precompute_distances(), in a worker process
+	rows -> a list of (start, ends, offset), the distances from start to each of ends are written to the shared buffer from offset on
+	the distances are validated by _check_distances(), as with a single worker, a TypeError or ValueError is passed back to the caller
+	"""
+	distance_callback = _precompute_worker['distance_callback']
+	values = _precompute_worker['values']
+	buffer = _precompute_worker['buffer'].buf.cast('d')
+	try:
+		for start, ends, offset in rows:
+			if _precompute_worker['distance_batch']:
+				distances = distance_callback([values[start]]*len(ends), [values[end] for end in ends])
+			else:
+				distances = [distance_callback(values[start], values[end]) for end in ends]
+			
+			distances = _check_distances(distances, len(ends))
+			buffer[offset:offset + len(ends)] = array('d', distances.tolist() if numpy is not None else distances)
+	finally:
+		buffer.release()
+	return len(rows)
+
+def _choice_weights(log_heuristic, pheromones, alpha, typecode):
+	"""
+	the weights (tau^alpha * eta^beta) of the cells of a matrix, from flat numpy arrays of the log of the heuristic (see ant_colony._update_choice_info())
+	and of the pheromone amounts, as alpha*log(tau) + beta*log(eta) shifted by the highest (see _shifted_weights())
+	returns a flat numpy array of typecode (see dtypes)
+	requires numpy
+	"""
+	log_weights = log_heuristic.astype(float)
+	if alpha:
+		with numpy.errstate(divide='ignore', invalid='ignore'):
+			log_weights += alpha*numpy.log(pheromones)
+		log_weights[numpy.isnan(log_weights)] = numpy.inf
+	return _shifted_weights(log_weights).astype(numpy.dtype(typecode), copy=False)
+
+def _candidate_mask(candidates, size):
+	"""
+	the candidates (a list by node of its nearest neighbours) as an NxN bool numpy array, or None without candidates
+	"""
+	if candidates is None:
+		return None
+	mask = numpy.zeros((size, size), dtype=bool)
+	for location, nearest in enumerate(candidates):
+		mask[location, nearest] = True
+	return mask
+
+def _ant_tosses(seed, iteration, ants, generator):
+	"""
+	a function giving a random float in [0, 1) for each of ants (a range of ant indices) per call, for _construct_tours()
+	drawn from each ant's random_stream with a seed (see ant_colony._ant_streams()), otherwise all at once from generator
+	"""
+	if seed is None:
+		return lambda: generator.random(len(ants))
+	streams = [random_stream(seed, (iteration, ant)) for ant in ants]
+	return lambda: numpy.array([stream.random() for stream in streams])
+
+def _construct_tours(weights, distances, candidates, start, ants, tosses, q0=0.0, local=None):
+	"""
+	constructs the tours of a number of ants from start, advancing them in lockstep, one _lockstep_step() per step
+	for the batched and processes backends of ant_colony
+	weights -> the weights of each step (choice_info as an NxN array), None on the first pass
+	distances -> all distances, as an NxN float array
+	candidates -> the candidates of each location (see _candidate_mask()), or None
+	tosses -> a function giving a random float in [0, 1) per ant, called once per step
+	q0 -> the probability of an ant taking its most attractive step (see _lockstep_step())
+	local -> if set (not on the first pass), (pheromones, symmetric, xi, tau_0, alpha) for the local update of Ant Colony System
+		applied with _local_step() to the edges taken after each step (in ant order), so the next steps are chosen from the updated weights
+	the tour lengths are added up step by step, in the same order as ant._update_distance_traveled()
+	returns the routes (an (ants x N) array) and the length of each
+	"""
+	size = len(distances)
+	every_ant = numpy.arange(ants)
+	routes = numpy.empty((ants, size), dtype=numpy.intp)
+	visited = numpy.zeros((ants, size), dtype=bool)
+	lengths = numpy.zeros(ants)
+	location = numpy.full(ants, start, dtype=numpy.intp)
+	routes[:, 0] = location
+	visited[every_ant, location] = True
+	
+	def nearest(empty):
+		#the nearest unvisited location from the current location of each ant in empty
+		return numpy.where(visited[empty], numpy.inf, distances[location[empty]]).argmin(axis=1)
+	
+	for step in range(1, size):
+		previous = location
+		location = _lockstep_step(None if weights is None else weights[location].astype(float), visited, None if candidates is None else candidates[location], tosses(), nearest, q0)
+		
+		routes[:, step] = location
+		visited[every_ant, location] = True
+		lengths += distances[previous, location]
+		if local is not None and weights is not None:
+			_local_step(weights, previous, location, *local)
+	
+	return routes, lengths
+
+def _route_cells(routes, size, symmetric):
+	"""
+	the cells along routes (an (ants x N) numpy array of locations) of a matrix's numpy array, flattened
+	in order, per step of each route: both directions of an NxN array, or the one cell of a symmetric_matrix
+	"""
+	starts = routes[:, :-1].reshape(-1)
+	ends = routes[:, 1:].reshape(-1)
+	if symmetric:
+		#a symmetric_matrix holds both directions in the same cell
+		high = numpy.maximum(starts, ends)
+		return high*(high + 1)//2 + numpy.minimum(starts, ends)
+	cells = numpy.empty((len(starts), 2), dtype=numpy.intp)
+	cells[:, 0] = starts*size + ends
+	cells[:, 1] = ends*size + starts
+	return cells.reshape(-1)
+
+def _local_step(weights, starts, ends, pheromones, symmetric, xi, tau_0, alpha):
+	"""
+	the local update of Ant Colony System for one step of a number of ants advancing in lockstep, from starts to ends (numpy arrays)
+	moves the pheromone amount of each edge taken xi of the way back to tau_0, as many times as ants took it (in ant order)
+		tau_xy <- (1-xi)^k*tau_xy + (1-(1-xi)^k)*tau_0
+	pheromones -> the flat numpy array of a pheromone_map (NxN, or the values of a symmetric_matrix), changed in place, with tau_0 in its units
+	weights -> the weights of each step (an NxN array), of both directions of those edges scaled in place by the change in tau^alpha
+		(left as they are for an edge without pheromone, whose weight can't be scaled)
+	"""
+	size = len(weights)
+	steps = numpy.empty((len(starts), 2), dtype=numpy.intp)
+	steps[:, 0] = starts
+	steps[:, 1] = ends
+	cells, first, counts = numpy.unique(_route_cells(steps, size, symmetric), return_index=True, return_counts=True)
+	
+	old = pheromones[cells].astype(float)
+	kept = pow(1 - xi, counts)
+	new = kept*old + (1 - kept)*tau_0
+	pheromones[cells] = new
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		ratios = numpy.where(old > 0, pow(new / numpy.where(old > 0, old, 1.0), alpha), 1.0)
+	
+	if symmetric:
+		#one cell per step, first is the step of each cell, whose weights are the same both ways
+		rows, columns = starts[first], ends[first]
+		weights[rows, columns] *= ratios
+		weights[columns, rows] = weights[rows, columns]
+	else:
+		weights[cells // size, cells % size] *= ratios
+
+def _remove_files(paths):
+	"""
+	removes the files of a list of paths, those that can't be (still in use, or gone already) are left in the list
+	"""
+	for path in list(paths):
+		try:
+			os.remove(path)
+		except FileNotFoundError:
+			pass
+		except OSError:
+			continue
+		paths.remove(path)
+
+def _construct_segments(size, ant_count, pheromone_typecode):
+	"""
+	the shared memory segments of the processes backend of ant_colony, name -> (shape, numpy dtype)
+	all distances as an NxN float array, the weights (choice_info) as an NxN array of pheromone_typecode (see dtypes)
+	and the routes (as int32) and lengths of the ants' tours
+	"""
+	return {
+		'distances': ((size, size), numpy.float64),
+		'weights': ((size, size), numpy.dtype(pheromone_typecode)),
+		'routes': ((ant_count, size), numpy.int32),
+		'lengths': ((ant_count,), numpy.float64),
+	}
+
+#state of a worker process of the processes backend of ant_colony, set once per process by _init_construct_worker()
+_construct_worker = {}
+
+def _init_construct_worker(segment_names, size, ant_count, pheromone_typecode, candidates, start, seed, q0):
+	"""
+	runs once in each worker process of the processes backend of ant_colony (see ant_colony._construct_tours_processes())
+	attaches to the shared memory segments (see _construct_segments()) and keeps the colony's parameters
+	"""
+	_construct_worker['segments'] = dict([(name, shared_memory.SharedMemory(name=segment_name)) for name, segment_name in segment_names.items()])
+	_construct_worker['shapes'] = _construct_segments(size, ant_count, pheromone_typecode)
+	_construct_worker['candidates'] = _candidate_mask(candidates, size)
+	_construct_worker['start'] = start
+	_construct_worker['seed'] = seed
+	_construct_worker['q0'] = q0
+	#a generator of its own, rather than the state of numpy.random a forked process shares with the others
+	_construct_worker['generator'] = numpy.random.default_rng()
+
+def _construct_worker_array(name):
+	"""
+	a shared memory segment of a worker process of the processes backend, as a numpy array
+	only held while in use, so the segment can be closed when the process exits
+	"""
+	shape, dtype = _construct_worker['shapes'][name]
+	return numpy.ndarray(shape, dtype=dtype, buffer=_construct_worker['segments'][name].buf)
+
+def _construct_batch(task):
+	"""
+	constructs the tours of a batch of ants with _construct_tours(), in a worker process of the processes backend
+	task -> (first ant, last ant + 1, first_pass, iteration)
+	the ants choose their steps by the shared weights, choice_info as the colony computed it (see ant_colony._update_choice_info())
+	the routes and lengths are written to rows first to last of the shared routes and lengths
+	with a seed, each ant draws from its own random_stream, so the tours don't depend on how the ants are split between workers
+	returns the number of ants
+	"""
+	first, last, first_pass, iteration = task
+	size = _construct_worker['shapes']['distances'][0][0]
+	
+	#read in place, _construct_tours() does not write to them (without a local update)
+	weights = None if first_pass else _construct_worker_array('weights')
+	distances = _construct_worker_array('distances')
+	tosses = _ant_tosses(_construct_worker['seed'], iteration, range(first, last), _construct_worker['generator'])
+	routes, lengths = _construct_tours(weights, distances, _construct_worker['candidates'], _construct_worker['start'], last - first, tosses, _construct_worker['q0'])
+	del weights, distances
+	
+	shared_routes = _construct_worker_array('routes')
+	shared_routes[first:last] = routes
+	shared_lengths = _construct_worker_array('lengths')
+	shared_lengths[first:last] = lengths
+	del shared_routes, shared_lengths
+	return last - first
 
 class ant_colony:
 	class ant(Thread):
-		def __init__(self, init_location, possible_locations, pheromone_map, distance_callback, alpha, beta, first_pass=False):
+		#kept between tours, so its buffers are reused (see location_set.reset())
+		possible_locations = None
+		
+		#optional behavior, off unless given to __init__()
+		candidates = None
+		distances_callback = None
+		choice_info = None
+		choice_cumulative = None
+		#(location, next location, distance between them) of the step chosen by _pick_path(), for _update_distance_traveled()
+		next_step = None
+		#where random numbers are drawn from, the random module unless seeded
+		stream = random
+		seeded = False
+		q0 = 0.0
+		local_update = None
+		
+		def __init__(self, init_location, possible_locations, pheromone_map, distance_callback, alpha, beta, first_pass=False, candidates=None, distances_callback=None, choice_info=None, choice_cumulative=None, stream=None, q0=0.0, local_update=None):
 			"""
 			initialized an ant, to traverse the map
 			init_location -> marks where in the map that the ant starts
 			possible_locations -> a list of possible nodes the ant can go to
 				when used internally, gives a list of possible locations the ant can traverse to _minus those nodes already visited_
+				kept as a location_set, so visited nodes are removed (and unvisited ones looked up) in O(1)
 			pheromone_map -> map of pheromone values for each traversal between each node
 			distance_callback -> is a function to calculate the distance between two nodes
 			alpha -> a parameter from the ACO algorithm to control the influence of the amount of pheromone when making a choice in _pick_path()
 			beta -> a parameters from ACO that controls the influence of the distance to the next node in _pick_path()
 			first_pass -> if this is a first pass on a map, then do some steps differently, noted in methods below
+			candidates -> if set, a list (by node) of the nearest neighbours of each node, _pick_path() then only chooses among those
+			distances_callback -> if set (requires numpy), a function to get the distances from one node to a list of nodes, as a numpy array
+				_pick_path() then weighs all possible locations at once with numpy (see _pick_path_vectorized())
+			choice_info -> if set (requires numpy), a matrix of the weights (tau^alpha * eta^beta) of each step for this iteration
+				_pick_path() then only reads those, instead of computing them (see _pick_path_choice_info())
+			choice_cumulative -> if set (with choice_info), the running totals of each row of choice_info
+				_pick_path() then first tries to draw the next location from those, in O(log n) (see _sample_unvisited())
+			stream -> if set, a random_stream to draw random numbers from, instead of the random module
+				with numpy, _pick_path() then chooses as the batched backend of ant_colony does (see _pick_path_lockstep())
+			q0 -> the probability of taking the most attractive next location, rather than a random one (see _pick_path_greedy())
+			local_update -> if set, a function called with (start, end) for each step as the ant takes it, by _traverse()
+				(the local update of Ant Colony System, see ant_colony._local_update_step())
 			
 			route -> a list that is updated with the labels of the nodes that the ant has traversed
 			pheromone_trail -> a list of pheromone amounts deposited along the ants trail, maps to each traversal in route
@@ -24,7 +1040,10 @@ class ant_colony:
 			Thread.__init__(self)
 			
 			self.init_location = init_location
-			self.possible_locations = possible_locations			
+			if isinstance(self.possible_locations, location_set):
+				self.possible_locations.reset(possible_locations)
+			else:
+				self.possible_locations = location_set(possible_locations)
 			self.route = []
 			self.distance_traveled = 0.0
 			self.location = init_location
@@ -33,6 +1052,15 @@ class ant_colony:
 			self.alpha = alpha
 			self.beta = beta
 			self.first_pass = first_pass
+			self.candidates = candidates
+			self.distances_callback = distances_callback
+			self.choice_info = choice_info
+			self.choice_cumulative = choice_cumulative
+			self.next_step = None
+			self.seeded = stream is not None
+			self.stream = stream if self.seeded else random
+			self.q0 = q0
+			self.local_update = local_update
 			
 			#append start location to route, before doing random walk
 			self._update_route(init_location)
@@ -62,57 +1090,66 @@ class ant_colony:
 			implements the path selection algorithm of ACO
 			calculate the attractiveness of each possible transition from the current location
 			then randomly choose a next path, based on its attractiveness
+			with candidates, only the unvisited nearest neighbours of the current location are considered
+				(if all of them were visited, the nearest unvisited node is taken)
 			"""
+			#a seeded ant chooses exactly as it would in the batched backend
+			if self.seeded and numpy is not None and (self.first_pass or self.choice_info is not None):
+				return self._pick_path_lockstep()
+			
 			#on the first pass (no pheromones), then we can just choice() to find the next one
 			if self.first_pass:
-				import random
-				return random.choice(self.possible_locations)
+				return self.stream.choice(self.possible_locations)
 			
-			attractiveness = dict()
-			sum_total = 0.0
+			locations = self.possible_locations
+			if self.candidates is not None:
+				locations = [candidate for candidate in self.candidates[self.location] if candidate in self.possible_locations]
+				if not locations:
+					return min(self.possible_locations, key=lambda location: self.distance_callback(self.location, location))
+			
+			#Ant Colony System's pseudo-random proportional rule: the most attractive location with probability q0
+			if self.q0 and self.stream.random() < self.q0:
+				return self._pick_path_greedy(locations)
+			
+			if self.choice_info is not None:
+				return self._pick_path_choice_info(locations)
+			
+			if self.distances_callback is not None and len(locations) >= vectorized_locations:
+				return self._pick_path_vectorized(locations)
+			
+			log_attractiveness = dict()
+			pheromone_row = self.pheromone_map[self.location]
 			#for each possible location, find its attractiveness (it's (pheromone amount)*1/distance [tau*eta, from the algortihm])
-			#sum all attrativeness amounts for calculating probability of each route in the next step
-			for possible_next_location in self.possible_locations:
+			#kept as a logarithm, see _log_attractiveness()
+			for possible_next_location in locations:
 				#NOTE: do all calculations as float, otherwise we get integer division at times for really hard to track down bugs
-				pheromone_amount = float(self.pheromone_map[self.location][possible_next_location])
+				pheromone_amount = float(pheromone_row[possible_next_location])
 				distance = float(self.distance_callback(self.location, possible_next_location))
 				
-				#tau^alpha * eta^beta
-				attractiveness[possible_next_location] = pow(pheromone_amount, self.alpha)*pow(1/distance, self.beta)
-				sum_total += attractiveness[possible_next_location]
+				#log(tau^alpha * eta^beta)
+				log_attractiveness[possible_next_location] = _log_attractiveness(pheromone_amount, distance, self.alpha, self.beta)
 			
-			#it is possible to have small values for pheromone amount / distance, such that with rounding errors this is equal to zero
-			#rare, but handle when it happens
-			if sum_total == 0.0:
-				#increment all zero's, such that they are the smallest non-zero values supported by the system
-				#source: http://stackoverflow.com/a/10426033/5343977
-				def next_up(x):
-					import math
-					import struct
-					# NaNs and positive infinity map to themselves.
-					if math.isnan(x) or (math.isinf(x) and x > 0):
-						return x
-
-					# 0.0 and -0.0 both map to the smallest +ve float.
-					if x == 0.0:
-						x = 0.0
-
-					n = struct.unpack('<q', struct.pack('<d', x))[0]
-					
-					if n >= 0:
-						n += 1
-					else:
-						n -= 1
-					return struct.unpack('<d', struct.pack('<q', n))[0]
-					
-				for key in attractiveness:
-					attractiveness[key] = next_up(attractiveness[key])
-				sum_total = next_up(sum_total)
+			#a location at distance 0 is taken over all others
+			infinite = [location for location in log_attractiveness if log_attractiveness[location] == float('inf')]
+			if infinite:
+				return infinite[int(self.stream.random()*len(infinite))]
+			
+			#shift by the highest before exponentiating, so the most attractive location has a weight of 1.0
+			#and the sum of all weights can't be rounded down to zero, however small tau^alpha * eta^beta are
+			highest = max(log_attractiveness.values())
+			if highest == float('-inf'):
+				#no pheromone on any of them, all are as likely
+				highest = 0.0
+				log_attractiveness = dict.fromkeys(log_attractiveness, 0.0)
+			attractiveness = dict()
+			sum_total = 0.0
+			for possible_next_location in log_attractiveness:
+				attractiveness[possible_next_location] = math.exp(log_attractiveness[possible_next_location] - highest)
+				sum_total += attractiveness[possible_next_location]
 			
 			#cumulative probability behavior, inspired by: http://stackoverflow.com/a/3679747/5343977
 			#randomly choose the next path
-			import random
-			toss = random.random()
+			toss = self.stream.random()
 					
 			cummulative = 0
 			for possible_next_location in attractiveness:
@@ -120,6 +1157,115 @@ class ant_colony:
 				if toss <= weight + cummulative:
 					return possible_next_location
 				cummulative += weight
+			#the weights can add up to a little less than 1.0 when rounded
+			return possible_next_location
+		
+		def _pick_path_vectorized(self, locations):
+			"""
+			numpy version of the path selection in _pick_path(), used when the ant has a distances_callback
+			gathers the pheromone and distance values of the current location's row for all of locations as arrays
+			weighs them (tau^alpha * eta^beta, in log space, see _shifted_weights()) in one expression
+			then picks one with a cumulative sum and a binary search
+			the distance of the chosen step is kept in next_step, so _update_distance_traveled() doesn't look it up again
+			"""
+			locations = list(locations)
+			indices = numpy.array(locations, dtype=numpy.intp)
+			distances = self.distances_callback(self.location, locations)
+			pheromones = _gather(self.pheromone_map[self.location], indices)
+			
+			#a location at distance 0 gets an infinite weight, see _roulette()
+			weights = _shifted_weights(_log_attractiveness_block(pheromones, distances, self.alpha, self.beta))
+			choice = self._roulette(weights)
+			
+			self.next_step = (self.location, locations[choice], float(distances[choice]))
+			return locations[choice]
+		
+		def _pick_path_greedy(self, locations):
+			"""
+			path selection in _pick_path() with probability q0: the most attractive of locations (the highest tau^alpha * eta^beta)
+			read from choice_info if the colony gave the ant one, otherwise computed as in _pick_path()
+			"""
+			locations = list(locations)
+			if self.choice_info is not None:
+				weights = _gather(self.choice_info[self.location], numpy.array(locations, dtype=numpy.intp))
+				return locations[int(numpy.argmax(weights))]
+			
+			pheromone_row = self.pheromone_map[self.location]
+			return max(locations, key=lambda location: _log_attractiveness(float(pheromone_row[location]), float(self.distance_callback(self.location, location)), self.alpha, self.beta))
+		
+		def _pick_path_choice_info(self, locations):
+			"""
+			path selection in _pick_path() when the colony gave the ant a choice_info matrix
+			the weights (tau^alpha * eta^beta) of this iteration are read from the current location's row, rather than computed
+			with choice_cumulative, a draw from the whole row is tried first (see _sample_unvisited())
+			"""
+			if self.choice_cumulative is not None:
+				choice = self._sample_unvisited()
+				if choice is not None:
+					return choice
+			
+			locations = list(locations)
+			weights = _gather(self.choice_info[self.location], numpy.array(locations, dtype=numpy.intp))
+			return locations[self._roulette(weights)]
+		
+		def _sample_unvisited(self):
+			"""
+			draws the next location from the running totals of the current location's row of choice_info (choice_cumulative)
+			with a binary search, so in O(log n) rather than weighing every unvisited location
+			a draw that lands on a visited location is rejected and drawn again, which leaves each unvisited location
+			exactly as likely as when only those are weighed, as long as one is hit within rejection_attempts draws
+			returns None if none was (the unvisited ones hold too little of the row's total), or the row can't be drawn from
+				(its total is 0, or infinite from a location at distance 0), _pick_path_choice_info() then weighs the unvisited ones
+			"""
+			row = self.choice_cumulative[self.location]
+			total = float(row[-1])
+			if not 0.0 < total < float('inf'):
+				return None
+			
+			for attempt in range(rejection_attempts):
+				choice = int(numpy.searchsorted(row, self.stream.random()*total, side='right'))
+				if choice in self.possible_locations:
+					return choice
+			return None
+		
+		def _roulette(self, weights):
+			"""
+			randomly chooses an index of weights (a numpy array), each as likely as its share of their total
+			with a cumulative sum and a binary search
+			infinite (or undefined) weights, from locations at distance 0, are taken over all others
+			if all weights are zero (no pheromone on any of them, or rounded down from choice_info), all are equally likely
+			"""
+			infinite = numpy.flatnonzero(~numpy.isfinite(weights))
+			if len(infinite):
+				return int(infinite[int(self.stream.random()*len(infinite))])
+			
+			cumulative = numpy.cumsum(weights)
+			if not cumulative[-1] > 0.0:
+				cumulative = numpy.arange(1.0, len(weights) + 1)
+			return min(int(numpy.searchsorted(cumulative, self.stream.random()*cumulative[-1], side='right')), len(weights) - 1)
+		
+		def _pick_path_lockstep(self):
+			"""
+			path selection in _pick_path() for a seeded ant (with a stream), on the first pass or with choice_info
+			made with _lockstep_step() over the current location's whole row of choice_info, as a batch of one ant
+			with one draw from stream per step, the same choices as the batched backend of ant_colony makes for this ant
+			"""
+			size = len(self.possible_locations.present)
+			visited = (numpy.frombuffer(self.possible_locations.present, dtype=numpy.uint8) == 0)[numpy.newaxis]
+			
+			rows = None
+			if not self.first_pass:
+				rows = _gather(self.choice_info[self.location], numpy.arange(size))[numpy.newaxis]
+			candidates = None
+			if self.candidates is not None:
+				candidates = numpy.zeros((1, size), dtype=bool)
+				candidates[0, self.candidates[self.location]] = True
+			
+			def nearest(empty):
+				#the lowest numbered of the nearest, as argmin() gives in the batched backend
+				return [min(self.possible_locations, key=lambda location: (float(self.distance_callback(self.location, location)), location))]
+			
+			return int(_lockstep_step(rows, visited, candidates, numpy.array([self.stream.random()]), nearest, self.q0)[0])
 		
 		def _traverse(self, start, end):
 			"""
@@ -131,6 +1277,8 @@ class ant_colony:
 			self._update_route(end)
 			self._update_distance_traveled(start, end)
 			self.location = end
+			if self.local_update is not None:
+				self.local_update(start, end)
 		
 		def _update_route(self, new):
 			"""
@@ -144,7 +1292,13 @@ class ant_colony:
 		def _update_distance_traveled(self, start, end):
 			"""
 			use self.distance_callback to update self.distance_traveled
+			added up as a float, whatever the type of the distances stored by the colony (see dtypes)
+			if _pick_path() already looked up the distance of this step (next_step), that is used instead
 			"""
+			if self.next_step is not None and self.next_step[:2] == (start, end):
+				self.distance_traveled += self.next_step[2]
+				self.next_step = None
+				return
 			self.distance_traveled += float(self.distance_callback(start, end))
 	
 		def get_route(self):
@@ -157,7 +1311,7 @@ class ant_colony:
 				return self.distance_traveled
 			return None
 		
-	def __init__(self, nodes, distance_callback, start=None, ant_count=50, alpha=.5, beta=1.2,  pheromone_evaporation_coefficient=.40, pheromone_constant=1000.0, iterations=80):
+	def __init__(self, nodes, distance_callback, start=None, ant_count=50, alpha=.5, beta=1.2,  pheromone_evaporation_coefficient=.40, pheromone_constant=1000.0, iterations=80, distance_batch=False, symmetric=False, memmap_dir=None, memmap_pheromones=False, distance_cache=None, distance_cache_key=None, candidate_count=None, dtype=None, distance_rows=None, backend='threads', seed=None, workers=None, executor=None, update_strategy='ant_system'):
 		"""
 		initializes an ant colony (houses a number of worker ants that will traverse a map to find an optimal route as per ACO [Ant Colony Optimization])
 		source: https://en.wikipedia.org/wiki/Ant_colony_optimization_algorithms
@@ -167,6 +1321,9 @@ class ant_colony:
 			
 		distance_callback -> is assumed to take a pair of coordinates and return the distance between them
 			populated into distance_matrix on each call to get_distance()
+			may also be the name of a built-in metric ('euclidean', 'manhattan', 'chebyshev' or 'haversine', see metrics)
+				in which case the node values must be coordinates (for 'haversine': latitude, longitude in decimal degrees)
+				and, if numpy is available, the whole distance_matrix is computed up front in one pass
 			
 		start -> if set, then is assumed to be the node where all ants start their traversal
 			if unset, then assumed to be the first key of nodes when sorted()
@@ -203,6 +1360,89 @@ class ant_colony:
 		
 		iterations -> how many iterations to let the ants traverse the map
 		
+		distance_batch -> if True, distance_callback is assumed to take two equal length lists of node values (starts, ends)
+			and return a sequence (list, numpy array, ...) of the distances between each starts[i] and ends[i]
+			distance_matrix is then filled a whole row per call, see _fill_distance_row()
+		
+		symmetric -> if True, distance_callback is assumed to give the same distance from start to end as from end to start
+			distance_matrix, pheromone_map and ant_updated_pheromone_map are then stored as a symmetric_matrix
+			(a packed triangle), such that each distance is computed only once per pair of nodes
+			and only half of the pheromone values need to be updated per iteration
+		
+		memmap_dir -> if set, a directory where distance_matrix is kept as a numpy.memmap file (distance_matrix_*.dat)
+			a file of its own per colony (so colonies can share the directory), removed when mainloop() finishes
+			for instances too large to hold in memory, requires numpy
+			the matrix is populated lazily, a chunk of rows at a time, as _get_distance() touches them (see _fill_distance_chunk())
+			and the OS page cache keeps the rows in use in memory
+		
+		memmap_pheromones -> if True, pheromone_map and ant_updated_pheromone_map are kept as numpy.memmap files in memmap_dir as well
+		
+		distance_cache -> if set, the path of an SQLite file that keeps the distances computed by distance_callback between runs
+			distances are stored by a hash of the node values on each end and distance_cache_key
+			on __init__() the distances already known for these nodes are loaded into distance_matrix (see _load_distance_cache())
+			so _get_distance() only calls distance_callback for the rest, which are saved at the end of mainloop()
+		
+		distance_cache_key -> names the metric of distance_callback in distance_cache
+			defaults to the name of the built-in metric, or the module and name of distance_callback
+				which must then be a function defined at the top of a module (or a method), other callbacks (lambdas, ...) need distance_cache_key
+			set it when the same function may compute different distances (for example depending on some configuration)
+		
+		candidate_count -> if set, ants only choose between the candidate_count nearest neighbours of their location
+			(falling back to the nearest unvisited node once all of those are visited)
+			bounding the work per step of a tour to candidate_count, instead of the number of nodes
+			candidates -> the nearest neighbours of each node, built by _init_candidates()
+		
+		dtype -> if set, the matrices hold compact 4 byte cells (rows of array.array, or numpy arrays) instead of lists of float objects
+			'float32' -> distances and pheromones as 32 bit floats
+			'int32' -> distances rounded to the nearest integer (as in TSPLIB) and stored as 32 bit ints, pheromones as 32 bit floats
+			_get_distance() then returns the stored (rounded) distances, while ants still add up their tour lengths as float
+			see dtypes
+		
+		distance_rows -> if set, distance_matrix is not kept whole, for instances too large for any NxN distance matrix
+			it is a distance_row_cache instead, which holds only the distance_rows most recently used rows
+			and recomputes any other row when it is needed (best suited to cheap distances, such as the built-in metrics)
+			so its memory is distance_rows*N cells, get_distance_cache_stats() tells how well that serves the ants
+			can't be combined with memmap_dir or distance_cache
+		
+		backend -> how mainloop() constructs the ants' tours, one of backends:
+			'threads' -> each ant is a Thread choosing its next location on its own (ant.run())
+			'batched' -> all ants are advanced in lockstep, one step at a time, with numpy (see _construct_tours_batched())
+				so each step costs a few numpy calls for the whole colony, rather than Python code per ant
+				requires numpy and all distances in memory (computed up front by mainloop() if not known yet), so can't be combined with distance_rows or memmap_dir
+			'processes' -> as 'batched', but the ants are split into batches constructed in parallel by workers worker processes
+				which read the distances and the weights of the steps (choice_info) from shared memory (see _construct_tours_processes())
+				with the same requirements as 'batched'
+		
+		workers -> the number of worker processes of the processes backend (or threads of executor 'pool'), defaults to os.cpu_count()
+		
+		executor -> how the threads backend runs the ants (ant.run()), see _run_ants()
+			None -> each ant in a new thread of its own, every iteration
+			'sequential' -> one after the other, without any threads
+			'pool' -> in a pool of workers threads, kept for all of mainloop()
+			a concurrent.futures Executor -> submitted to it (it is not shut down by the colony)
+				one running them in this process, such as a ThreadPoolExecutor, as the ants are threads updating the colony
+				(not a ProcessPoolExecutor, for that see backend 'processes')
+			with a seed, the ants draw from their own random streams, so the results are the same whichever is used
+		
+		seed -> if set (an int >= 0), makes runs reproducible: each ant draws its random numbers from its own random_stream
+			seeded from seed, the iteration and the ant's index, rather than all ants sharing the random module
+			with numpy, ants of the threads backend then choose exactly as in the batched backend (see ant._pick_path_lockstep())
+			and all distances are computed at the start of the first iteration (unless distance_rows or memmap_dir are set), so both backends give identical results
+			(but for the processes backend with the local update of ant_colony_system, which it can only make once all tours are constructed)
+		
+		update_strategy -> how the pheromones are updated after each iteration, one of update_strategies or an update_rule:
+			'ant_system' -> every ant deposits pheromones (the original Ant System)
+			'elitist' -> as 'ant_system', and the shortest tour so far as much as all ants on top (elitist_ant_system)
+			'rank' -> only the 5 shortest tours of the iteration, weighted by rank, and the shortest tour so far (rank_based_ant_system)
+			'max_min' -> only the shortest tour of the iteration, with the pheromone amounts kept between tau_min and tau_max (max_min_ant_system)
+			'colony_system' -> Ant Colony System: ants mostly take the most attractive step, the pheromones along their tours fall back towards
+				the initial amount, and only the shortest tour so far deposits pheromones (ant_colony_system)
+			an update_rule -> such as max_min_ant_system(best='global'), or a subclass of its own
+		
+		pheromone_bounds -> the (low, high) bounds of the pheromone amounts from update_strategy, if any, see _bound_pheromones()
+		
+		initial_pheromone_amount -> the pheromone amount all trails were set to after the first iteration by update_strategy, if any
+		
 		shortest_distance -> the shortest distance seen from an ant traversal
 		
 		shortets_path_seen -> the shortest path seen from a traversal (shortest_distance is the distance along this path)
@@ -216,32 +1456,171 @@ class ant_colony:
 		
 		#create internal mapping and mapping for return to caller
 		self.id_to_key, self.nodes = self._init_nodes(nodes)
-		#create matrix to hold distance calculations between nodes
-		self.distance_matrix = self._init_matrix(len(nodes))
+		
+		#symmetric
+		if type(symmetric) is not bool:
+			raise TypeError("symmetric must be bool")
+		
+		self.symmetric = symmetric
+		
+		#memmap_dir
+		if memmap_dir is not None:
+			if not isinstance(memmap_dir, str):
+				raise TypeError("memmap_dir must be str")
+			
+			if not os.path.isdir(memmap_dir):
+				raise ValueError("memmap_dir must be an existing directory, saw: " + memmap_dir)
+			
+			if numpy is None:
+				raise ImportError("memmap_dir requires numpy")
+		
+		self.memmap_dir = memmap_dir
+		#the paths of the files created in memmap_dir, see _memmap_file()
+		#	removed by _finish(), or once the colony is garbage collected if it never finishes
+		self.memmap_files = []
+		if memmap_dir is not None:
+			weakref.finalize(self, _remove_files, self.memmap_files)
+		
+		#memmap_pheromones
+		if type(memmap_pheromones) is not bool:
+			raise TypeError("memmap_pheromones must be bool")
+		
+		if memmap_pheromones and memmap_dir is None:
+			raise ValueError("memmap_pheromones requires memmap_dir")
+		
+		self.memmap_pheromones = memmap_pheromones
+		
+		#dtype
+		if dtype is not None:
+			if not isinstance(dtype, str):
+				raise TypeError("dtype must be str")
+			
+			if dtype not in dtypes:
+				raise ValueError("dtype must be one of: " + ", ".join(sorted(dtypes)) + ", saw: " + dtype)
+		
+		self.dtype = dtype
+		self.distance_typecode, self.pheromone_typecode = dtypes[dtype] if dtype is not None else ('d', 'd')
+		
 		#create matrix for master pheromone map, that records pheromone amounts along routes
-		self.pheromone_map = self._init_matrix(len(nodes))
+		self.pheromone_map = self._new_matrix(len(nodes), memmap_file=self._memmap_file('pheromone_map'), typecode=self.pheromone_typecode, contiguous=True)
 		#create a matrix for ants to add their pheromones to, before adding those to pheromone_map during the update_pheromone_map step
-		self.ant_updated_pheromone_map = self._init_matrix(len(nodes))
+		self.ant_updated_pheromone_map = self._new_matrix(len(nodes), memmap_file=self._memmap_file('ant_updated_pheromone_map'), typecode=self.pheromone_typecode, contiguous=True)
+		#with numpy, the pheromone amounts are pheromone_scale * pheromone_map, see _update_pheromone_map()
+		self.pheromone_scale = 1.0
+		#the cells of ant_updated_pheromone_map's array the ants deposited on this iteration, see _deposit_pheromones()
+		self.deposited_cells = None
 		
 		#distance_callback
+		self.distance_metric = None
+		if isinstance(distance_callback, str):
+			if distance_callback not in metrics:
+				raise ValueError("distance_callback names an unknown metric: " + distance_callback + ", should be one of: " + ", ".join(sorted(metrics)))
+			self.distance_metric = distance_callback
+			distance_callback = metrics[distance_callback][0]
+		
 		if not callable(distance_callback):
 			raise TypeError("distance_callback is not callable, should be method")
 			
 		self.distance_callback = distance_callback
+		#an async distance_callback can only be awaited, see mainloop_async()
+		self.distance_async = inspect.iscoroutinefunction(distance_callback)
 		
-		#start
-		if start is None:
-			self.start = 0
-		else:
-			self.start = None
-			#init start to internal id of node id passed
-			for key, value in self.id_to_key.items():
-				if value == start:
-					self.start = key
-			
-			#if we didn't find a key in the nodes passed in, then raise
-			if self.start is None:
-				raise KeyError("Key: " + str(start) + " not found in the nodes dict passed.")
+		#distance_batch
+		if type(distance_batch) is not bool:
+			raise TypeError("distance_batch must be bool")
+		
+		if distance_batch and self.distance_metric is not None:
+			raise ValueError("distance_batch can not be used with a built-in metric")
+		
+		self.distance_batch = distance_batch
+		
+		#distance_rows
+		if distance_rows is not None:
+			if type(distance_rows) is not int:
+				raise TypeError("distance_rows must be int")
+			
+			if distance_rows < 1:
+				raise ValueError("distance_rows must be >= 1")
+			
+			if memmap_dir is not None:
+				raise ValueError("distance_rows can not be used with memmap_dir")
+			
+			if distance_cache is not None:
+				raise ValueError("distance_rows can not be used with distance_cache")
+		
+		self.distance_rows = distance_rows
+		
+		if self.distance_async and (self.distance_rows is not None or self.memmap_dir is not None):
+			raise ValueError("an async distance_callback can not be used with distance_rows or memmap_dir, its distances are all gathered up front")
+		
+		#create matrix to hold distance calculations between nodes
+		#	with a built-in metric, fill it in one go instead of a callback per pair of nodes
+		#	(unless it is memmap'd, where it is filled a chunk at a time as it is used,
+		#	or with distance_rows, where only a few rows are held at a time)
+		precomputed = self.distance_metric is not None and numpy is not None and self.memmap_dir is None and self.distance_rows is None
+		self.distance_precomputed = precomputed
+		self.coordinates = None
+		if self.distance_metric is not None and numpy is not None and not precomputed:
+			self.coordinates = self._node_coordinates(self.distance_metric)
+		
+		if self.distance_rows is not None:
+			self.distance_matrix = distance_row_cache(len(nodes), self.distance_rows, self._compute_distance_row)
+		elif precomputed:
+			self.distance_matrix = self._distance_block(self._metric_matrix(self.distance_metric))
+			if self.symmetric:
+				self.distance_matrix = self._pack_matrix(self.distance_matrix, self.distance_typecode)
+		else:
+			self.distance_matrix = self._new_matrix(len(nodes), memmap_file=self._memmap_file('distance_matrix'), typecode=self.distance_typecode)
+		
+		#record which cells of distance_matrix have been computed, and how well that cache serves _get_distance()
+		#	(not needed by a distance_row_cache, which computes whole rows)
+		cells = len(nodes)*(len(nodes)+1)//2 if self.symmetric else len(nodes)*len(nodes)
+		self.distance_computed = bitmap(cells, value=precomputed) if self.distance_rows is None else None
+		self.distance_cache_hits = 0
+		self.distance_cache_misses = 0
+		self.distance_cache_loaded = 0
+		#guards _fill_distance_chunk(), so ants needing the same chunk at once only compute it once
+		self.distance_lock = Lock()
+		
+		#distance_cache
+		if distance_cache is not None and not isinstance(distance_cache, str):
+			raise TypeError("distance_cache must be str")
+		
+		if distance_cache_key is None:
+			distance_cache_key = self.distance_metric
+		if distance_cache_key is None:
+			#only a function defined at the top of a module (or a method of a class there) is named uniquely
+			#	every lambda of a module gets the same name, as do the nested functions of a function, whatever they compute
+			name = getattr(distance_callback, '__qualname__', None)
+			if distance_cache is not None and (name is None or '<' in name):
+				raise ValueError("distance_cache requires distance_cache_key for a distance_callback that is a lambda, a nested function or a callable object")
+			distance_cache_key = str(getattr(distance_callback, '__module__', None)) + '.' + str(name)
+		
+		if not isinstance(distance_cache_key, str):
+			raise TypeError("distance_cache_key must be str")
+		
+		self.distance_cache_key = distance_cache_key
+		self.distance_cache = None
+		#distances computed since the last _save_distance_cache(), as rows for the distances table
+		self.distance_cache_pending = []
+		if distance_cache is not None:
+			self.distance_cache = self._open_distance_cache(distance_cache)
+			if not precomputed:
+				self.distance_cache_loaded = self._load_distance_cache()
+		
+		#start
+		if start is None:
+			self.start = 0
+		else:
+			self.start = None
+			#init start to internal id of node id passed
+			for key, value in self.id_to_key.items():
+				if value == start:
+					self.start = key
+			
+			#if we didn't find a key in the nodes passed in, then raise
+			if self.start is None:
+				raise KeyError("Key: " + str(start) + " not found in the nodes dict passed.")
 		
 		#ant_count
 		if type(ant_count) is not int:
@@ -291,6 +1670,101 @@ class ant_colony:
 			
 		self.iterations = iterations
 		
+		#candidate_count
+		if candidate_count is not None:
+			if type(candidate_count) is not int:
+				raise TypeError("candidate_count must be int")
+			
+			if candidate_count < 1:
+				raise ValueError("candidate_count must be >= 1")
+		
+		self.candidate_count = candidate_count
+		self.candidates = None
+		#(with an async distance_callback, once its distances are gathered, see mainloop_async())
+		if candidate_count is not None and not self.distance_async:
+			self.candidates = self._init_candidates(min(candidate_count, len(self.nodes) - 1))
+		
+		#backend
+		if backend not in backends:
+			raise ValueError("backend must be one of: " + ", ".join(backends) + ", saw: " + str(backend))
+		
+		if backend in ('batched', 'processes'):
+			if numpy is None:
+				raise ImportError("backend '" + backend + "' requires numpy")
+			
+			if self.distance_rows is not None or self.memmap_dir is not None:
+				raise ValueError("backend '" + backend + "' can not be used with distance_rows or memmap_dir")
+		
+		self.backend = backend
+		#all of distance_matrix as an NxN numpy array, for the batched backend
+		self.dense_distances = None
+		
+		#workers
+		if workers is None:
+			workers = os.cpu_count() or 1
+		
+		if type(workers) is not int:
+			raise TypeError("workers must be int")
+		
+		if workers < 1:
+			raise ValueError("workers must be >= 1")
+		
+		self.workers = workers
+		#the pool of worker processes of the processes backend, and the shared memory they work on, see _start_processes()
+		self.process_pool = None
+		self.process_segments = None
+		self.process_arrays = None
+		
+		#executor
+		if executor is not None and not isinstance(executor, Executor):
+			if not isinstance(executor, str):
+				raise TypeError("executor must be str or a concurrent.futures Executor")
+			
+			if executor not in executors:
+				raise ValueError("executor must be one of: " + ", ".join(executors) + ", saw: " + executor)
+		
+		#the ants can't be pickled, and would update copies of the colony in other processes
+		if isinstance(executor, ProcessPoolExecutor):
+			raise ValueError("executor can not be a ProcessPoolExecutor, use backend='processes' instead")
+		
+		self.executor = executor
+		#the pool of threads of executor 'pool', see _run_ants()
+		self.thread_pool = None
+		
+		#update_strategy
+		if not isinstance(update_strategy, update_rule):
+			if not isinstance(update_strategy, str):
+				raise TypeError("update_strategy must be str or update_rule")
+			
+			if update_strategy not in update_strategies:
+				raise ValueError("update_strategy names an unknown strategy: " + update_strategy + ", should be one of: " + ", ".join(sorted(update_strategies)))
+			
+			update_strategy = update_strategies[update_strategy]()
+		
+		self.update_strategy = update_strategy
+		self.pheromone_bounds = None
+		self.initial_pheromone_amount = None
+		#held by ants of the threads backend for their local updates, see _local_update_step()
+		self.local_update_lock = Lock()
+		
+		#seed
+		if seed is not None:
+			if type(seed) is not int:
+				raise TypeError("seed must be int")
+			
+			if seed < 0:
+				raise ValueError("seed must be >= 0")
+		
+		self.seed = seed
+		#the number of iterations run so far, part of the key of each ant's random_stream
+		self.iteration = 0
+		
+		#beta*log(eta) of each step, and tau^alpha * eta^beta as of the last pheromone update, see _update_choice_info()
+		self.log_heuristic = None
+		self.choice_info = None
+		#running totals of each row of choice_info, see _update_choice_info()
+		self.choice_cumulative = None
+		
 		#other internal variable init
 		self.first_pass = True
 		self.ants = self._init_ants(self.start)
@@ -302,17 +1776,410 @@ class ant_colony:
 		uses the distance_callback to return the distance between nodes
 		if a distance has not been calculated before, then it is populated in distance_matrix and returned
 		if a distance has been called before, then its value is returned from distance_matrix
+		with distance_batch set, the whole row of start is populated at once by _fill_distance_row()
+		whether a distance was calculated is tracked in distance_computed (and not by its value, as 0 is a valid distance)
+		the distance returned is the one stored, so with dtype set it is rounded to the cells of distance_matrix
+		with distance_rows set, distance_matrix is a distance_row_cache, which computes (and counts) the rows itself
+		"""
+		if self.distance_rows is not None:
+			return self.distance_matrix[start][end]
+		
+		cell = self._distance_cell(start, end)
+		if self.distance_computed[cell]:
+			self.distance_cache_hits += 1
+			return self.distance_matrix[start][end]
+		
+		self.distance_cache_misses += 1
+		if self.memmap_dir is not None:
+			self._fill_distance_chunk(start, end)
+			return self.distance_matrix[start][end]
+		
+		if self.distance_batch:
+			self._fill_distance_row(start)
+			return self.distance_matrix[start][end]
+		
+		distance = self.distance_callback(self.nodes[start], self.nodes[end])
+		
+		if (type(distance) is not int) and (type(distance) is not float):
+			raise TypeError("distance_callback should return either int or float, saw: "+ str(type(distance)))
+		
+		self.distance_matrix[start][end] = self._distance_value(distance)
+		self.distance_computed.set(cell)
+		if self.distance_cache is not None:
+			self._record_distances(start, [end], [distance])
+		return self.distance_matrix[start][end]
+	
+	def _get_distances(self, start, ends):
+		"""
+		numpy version of _get_distance(), the distances from start to each of ends (a list of node ids) as a float array
+		read straight from distance_matrix when the distances are known to be there
+		(a built-in metric computed up front, or a row of a distance_row_cache), otherwise through _get_distance() one at a time
+		requires numpy
+		"""
+		if self.distance_rows is not None or self.distance_precomputed:
+			if self.distance_rows is None:
+				self.distance_cache_hits += len(ends)
+			return _gather(self.distance_matrix[start], numpy.array(ends, dtype=numpy.intp))
+		return numpy.array([self._get_distance(start, end) for end in ends], dtype=float)
+	
+	def _distances_callback(self):
+		"""
+		the distances_callback given to the ants, so they choose their paths with numpy: _get_distances()
+		if numpy is available, and the distances can be read as whole rows (see _get_distances())
+		"""
+		if numpy is None or (self.distance_rows is None and not self.distance_precomputed):
+			return None
+		return self._get_distances
+	
+	def _distance_value(self, distance):
+		"""
+		a distance as it is stored in distance_matrix
+		rounded to the nearest integer for an int32 dtype (as nint() in TSPLIB), a float otherwise
+		"""
+		if self.distance_typecode == 'i':
+			return int(math.floor(distance + 0.5))
+		return float(distance)
+	
+	def _distance_block(self, distances):
+		"""
+		numpy version of _distance_value(), gives an array of distances in the dtype of distance_matrix
+		"""
+		if self.distance_typecode == 'i':
+			distances = numpy.floor(distances + 0.5)
+		return numpy.asarray(distances).astype(numpy.dtype(self.distance_typecode), copy=False)
+	
+	def _distance_cell(self, start, end):
 		"""
-		if not self.distance_matrix[start][end]:
-			distance = self.distance_callback(self.nodes[start], self.nodes[end])
+		position of the distance from start to end in distance_computed
+		one per stored cell of distance_matrix (so a symmetric_matrix shares one between both directions)
+		"""
+		if self.symmetric:
+			return symmetric_matrix.index(start, end)
+		return start*len(self.nodes) + end
+	
+	def get_distance_cache_stats(self):
+		"""
+		returns how the lookups done through _get_distance() were served, as a dict:
+			hits -> lookups answered from distance_matrix
+			misses -> lookups that needed distance_callback
+			hit_rate -> hits / (hits + misses), None if there were no lookups yet
+			loaded -> distances that were loaded from distance_cache, rather than computed
+		with distance_rows set, these count lookups of rows of the distance_row_cache
+		and evictions (rows dropped to make room) and rows (rows held now) are given as well
+		"""
+		if self.distance_rows is not None:
+			stats = self.distance_matrix.get_stats()
+			stats['loaded'] = 0
+			return stats
+		
+		lookups = self.distance_cache_hits + self.distance_cache_misses
+		return {
+			'hits': self.distance_cache_hits,
+			'misses': self.distance_cache_misses,
+			'hit_rate': float(self.distance_cache_hits)/lookups if lookups else None,
+			'loaded': self.distance_cache_loaded,
+		}
+
+	def precompute_distances(self, workers=None):
+		"""
+		computes every distance of distance_matrix not computed yet, up front, in a pool of worker processes
+		for expensive pure Python distance_callbacks, which the ants would otherwise call one at a time (their threads share the GIL)
+		the missing distances are split into blocks of rows, evaluated in a ProcessPoolExecutor
+		and written by the workers into a shared memory buffer, which is then copied into distance_matrix
+		distance_callback (and the node values) must be picklable, so a module level function rather than a lambda
+		
+		workers -> the number of worker processes, defaults to os.cpu_count()
+			with 1, the distances are computed in this process instead
+		
+		returns the number of distances computed
+		"""
+		if workers is None:
+			workers = os.cpu_count() or 1
+		
+		if type(workers) is not int:
+			raise TypeError("workers must be int")
+		
+		if workers < 1:
+			raise ValueError("workers must be >= 1")
+		
+		if self.distance_rows is not None:
+			raise ValueError("precompute_distances can not be used with distance_rows, distance_matrix is not kept whole")
+		
+		size = len(self.nodes)
+		rows, total = self._missing_distances()
+		if not total:
+			return 0
+		
+		if self.distance_async:
+			raise TypeError("an async distance_callback can only be computed by precompute_distances_async()")
+		
+		if workers == 1:
+			for start, ends, offset in rows:
+				self._store_distances(start, ends, self._compute_distances(start, ends))
+			return total
+		
+		#about four blocks per worker, of roughly equal numbers of distances, so a slow block doesn't hold up the rest
+		block_size = max(1, total // (workers*4))
+		blocks = [[]]
+		filled = 0
+		for row in rows:
+			if filled >= block_size:
+				blocks.append([])
+				filled = 0
+			blocks[-1].append(row)
+			filled += len(row[1])
+		
+		shared = shared_memory.SharedMemory(create=True, size=total*array('d').itemsize)
+		try:
+			values = [self.nodes[id] for id in range(size)]
+			with ProcessPoolExecutor(workers, initializer=_init_precompute_worker, initargs=(self.distance_callback, self.distance_batch, values, shared.name)) as pool:
+				list(pool.map(_precompute_rows, blocks))
 			
-			if (type(distance) is not int) and (type(distance) is not float):
-				raise TypeError("distance_callback should return either int or float, saw: "+ str(type(distance)))
+			buffer = shared.buf.cast('d')
+			try:
+				for start, ends, offset in rows:
+					distances = buffer[offset:offset + len(ends)].tolist()
+					if self.distance_cache is not None:
+						self._record_distances(start, ends, distances)
+					self._store_distances(start, ends, distances)
+			finally:
+				buffer.release()
+		finally:
+			shared.close()
+			shared.unlink()
+		
+		return total
+	
+	async def precompute_distances_async(self):
+		"""
+		computes every distance of distance_matrix not computed yet with an async distance_callback (a coroutine function)
+		the missing distances are awaited async_batch at a time, concurrently with asyncio.gather()
+			(or in one call per batch with distance_batch), rather than one pair at a time
+		called by mainloop_async()
+		
+		returns the number of distances computed
+		"""
+		rows, total = self._missing_distances()
+		pairs = [(start, end) for start, ends, offset in rows for end in ends]
+		for first in range(0, total, async_batch):
+			batch = pairs[first:first + async_batch]
+			if self.distance_batch:
+				distances = await self.distance_callback([self.nodes[start] for start, end in batch], [self.nodes[end] for start, end in batch])
+			else:
+				distances = await asyncio.gather(*[self.distance_callback(self.nodes[start], self.nodes[end]) for start, end in batch])
 			
-			self.distance_matrix[start][end] = float(distance)
-			return distance
-		return self.distance_matrix[start][end]
+			distances = _check_distances(distances, len(batch))
+			for (start, end), distance in zip(batch, distances):
+				if self.distance_cache is not None:
+					self._record_distances(start, [end], [distance])
+				self._store_distances(start, [end], [distance])
+		
+		return total
+	
+	def _missing_distances(self):
+		"""
+		the distances of distance_matrix not computed yet, as a list of rows (start, ends, offset) and their total
+		offset counts the missing distances of the rows before, so they can be laid out one row after another (see precompute_distances())
+		for a symmetric_matrix, a row only holds the columns up to the row itself
+		"""
+		size = len(self.nodes)
+		rows = []
+		total = 0
+		for start in range(size):
+			columns = range(start + 1) if self.symmetric else range(size)
+			ends = [end for end in columns if not self.distance_computed[self._distance_cell(start, end)]]
+			if ends:
+				rows.append((start, ends, total))
+				total += len(ends)
+		return rows, total
+	
+	def _store_distances(self, start, ends, distances):
+		"""
+		writes the distances from start to each of ends into distance_matrix, and marks them in distance_computed
+		"""
+		row = self.distance_matrix[start]
+		for end, distance in zip(ends, distances):
+			row[end] = self._distance_value(distance)
+			self.distance_computed.set(self._distance_cell(start, end))
+
+	def _open_distance_cache(self, path):
+		"""
+		opens (creating if needed) the SQLite file at path that holds distance_cache
+		one table of distances, keyed by the metric (distance_cache_key) and the hashes of the node values on each end
+		"""
+		connection = sqlite3.connect(path, check_same_thread=False)
+		connection.execute("CREATE TABLE IF NOT EXISTS distances (metric TEXT NOT NULL, source TEXT NOT NULL, destination TEXT NOT NULL, distance REAL NOT NULL, PRIMARY KEY (metric, source, destination))")
+		connection.commit()
+		
+		#hash of each node value, by node id
+		self.node_hashes = [hashlib.sha1(repr(self.nodes[id]).encode('utf-8')).hexdigest() for id in range(len(self.nodes))]
+		return connection
+	
+	def _load_distance_cache(self):
+		"""
+		populates distance_matrix with the distances in distance_cache between any two of these nodes
+		(marking them in distance_computed), so they won't go through distance_callback
+		returns the number of distances loaded
+		"""
+		ids = dict()
+		for id, node_hash in enumerate(self.node_hashes):
+			ids.setdefault(node_hash, []).append(id)
+		
+		#only look up the rows for these nodes, by joining on a temporary table of their hashes
+		self.distance_cache.execute("CREATE TEMP TABLE IF NOT EXISTS colony_nodes (hash TEXT PRIMARY KEY)")
+		self.distance_cache.execute("DELETE FROM colony_nodes")
+		self.distance_cache.executemany("INSERT INTO colony_nodes VALUES (?)", [(node_hash,) for node_hash in ids])
+		rows = self.distance_cache.execute("SELECT source, destination, distance FROM distances JOIN colony_nodes AS a ON a.hash = source JOIN colony_nodes AS b ON b.hash = destination WHERE metric = ?", (self.distance_cache_key,))
+		
+		loaded = 0
+		for source, destination, distance in rows:
+			for start in ids[source]:
+				for end in ids[destination]:
+					self.distance_matrix[start][end] = self._distance_value(distance)
+					self.distance_computed.set(self._distance_cell(start, end))
+					loaded += 1
+		return loaded
+	
+	def _record_distances(self, start, ends, distances):
+		"""
+		queues distances computed from start to each of ends, to be written to distance_cache by _save_distance_cache()
+		"""
+		source = self.node_hashes[start]
+		for end, distance in zip(ends, distances):
+			self.distance_cache_pending.append((self.distance_cache_key, source, self.node_hashes[end], float(distance)))
+	
+	def _save_distance_cache(self):
+		"""
+		writes the distances computed since the last save to distance_cache
+		called at the end of mainloop()
+		"""
+		if self.distance_cache is None or not self.distance_cache_pending:
+			return
+		
+		pending, self.distance_cache_pending = self.distance_cache_pending, []
+		self.distance_cache.executemany("INSERT OR REPLACE INTO distances VALUES (?, ?, ?, ?)", pending)
+		self.distance_cache.commit()
+	
+	def _fill_distance_row(self, start):
+		"""
+		populates the row of distance_matrix for start with a single call to a batch distance_callback
+		only the distances of the row not computed yet are asked for
+		the returned distances are validated once, as a whole, rather than one value at a time
+		called from _get_distance() when distance_batch is set
+		"""
+		missing = [end for end in range(len(self.nodes)) if not self.distance_computed[self._distance_cell(start, end)]]
+		if not missing:
+			return
+		
+		self._store_distances(start, missing, self._compute_distances(start, missing))
+	
+	def _compute_distance_row(self, start):
+		"""
+		computes the whole row of distances from start, for a distance_row_cache
+		with a built-in metric in one numpy broadcast, otherwise through _compute_distances()
+		returned in the dtype of distance_matrix (a numpy array, or an array.array without numpy)
+		"""
+		if self.coordinates is not None:
+			return self._distance_block(metrics[self.distance_metric][1](self.coordinates[start:start + 1], self.coordinates)[0])
+		
+		distances = self._compute_distances(start, list(range(len(self.nodes))))
+		if numpy is not None:
+			return self._distance_block(distances)
+		return array(self.distance_typecode, [self._distance_value(distance) for distance in distances])
+	
+	def _compute_distances(self, start, ends):
+		"""
+		the distances from start to each node in ends through distance_callback
+		a single call with distance_batch set, a call per pair otherwise
+		the distances are validated as a whole by _check_distances(), and recorded for distance_cache
+		"""
+		if self.distance_batch:
+			distances = self.distance_callback([self.nodes[start]]*len(ends), [self.nodes[end] for end in ends])
+		else:
+			distances = [self.distance_callback(self.nodes[start], self.nodes[end]) for end in ends]
+		
+		distances = _check_distances(distances, len(ends))
+		if self.distance_cache is not None:
+			self._record_distances(start, ends, distances)
+		return distances
+	
+	def _fill_distance_chunk(self, start, end):
+		"""
+		populates the chunk of rows of distance_matrix (about chunk_cells cells) that holds the distance from start to end
+		so a memmap'd distance_matrix is written in large sequential pieces, rather than a cell at a time
+		with a built-in metric, the chunk is computed in one numpy broadcast
+		otherwise through distance_callback for the distances not computed yet (see _compute_distances())
+		for a symmetric_matrix, rows only hold the columns up to the row itself (its packed part of the triangle)
+		called from _get_distance() when memmap_dir is set
+		"""
+		#the stored row of this cell is the later node's, for a symmetric_matrix
+		row = max(start, end) if self.symmetric else start
+		size = len(self.nodes)
+		rows = max(1, chunk_cells // size)
+		first = (row // rows) * rows
+		last = min(first + rows, size)
+		
+		#cells of the chunk are contiguous in both layouts
+		if self.symmetric:
+			first_cell, last_cell = first*(first+1)//2, last*(last+1)//2
+		else:
+			first_cell, last_cell = first*size, last*size
+		
+		with self.distance_lock:
+			#another ant may have filled this chunk while we waited
+			if self.distance_computed[self._distance_cell(start, end)]:
+				return
+			
+			if self.distance_metric is not None:
+				coordinates = self.coordinates
+				block = self._distance_block(metrics[self.distance_metric][1](coordinates[first:last], coordinates[:last] if self.symmetric else coordinates))
+				if self.symmetric:
+					values = self.distance_matrix.values
+					for current in range(first, last):
+						offset = current*(current+1)//2
+						values[offset:offset + current + 1] = block[current - first, :current + 1]
+				else:
+					self.distance_matrix[first:last] = block
+			else:
+				for current in range(first, last):
+					columns = range(current + 1) if self.symmetric else range(size)
+					missing = numpy.array([column for column in columns if not self.distance_computed[self._distance_cell(current, column)]], dtype=int)
+					if not len(missing):
+						continue
+					
+					#written directly to the underlying buffer, a row at a time
+					distances = self._distance_block(self._compute_distances(current, missing.tolist()))
+					if self.symmetric:
+						self.distance_matrix.values[current*(current+1)//2 + missing] = distances
+					else:
+						self.distance_matrix[current][missing] = distances
+			
+			self.distance_computed.set_range(first_cell, last_cell)
+	
+	def _metric_matrix(self, metric):
+		"""
+		compute the full NxN matrix of distances between all nodes for one of the built-in metrics
+		done as a single numpy broadcast over the node values, rather than calling distance_callback for each pair
+		requires numpy
+		"""
+		coordinates = self._node_coordinates(metric)
+		return metrics[metric][1](coordinates, coordinates)
+	
+	def _node_coordinates(self, metric):
+		"""
+		the node values as a numpy array of coordinates, one row per node id
+		for use with the built-in metric's numpy version
+		"""
+		try:
+			coordinates = numpy.array([self.nodes[id] for id in range(len(self.nodes))], dtype=float)
+		except (TypeError, ValueError):
+			raise TypeError("node values must be coordinates (sequences of numbers of equal length) to use metric: " + metric)
 		
+		if coordinates.ndim != 2:
+			raise TypeError("node values must be coordinates (sequences of numbers of equal length) to use metric: " + metric)
+		
+		return coordinates
+	
 	def _init_nodes(self, nodes):
 		"""
 		create a mapping of internal id numbers (0 .. n) to the keys in the nodes passed 
@@ -330,6 +2197,40 @@ class ant_colony:
 			
 		return id_to_key, id_to_values
 		
+	def _new_matrix(self, size, value=0.0, memmap_file=None, typecode='d', contiguous=False):
+		"""
+		setup a matrix NxN for the colony, in the storage chosen on __init__()
+		a symmetric_matrix if self.symmetric, otherwise a list of lists from _init_matrix()
+		if memmap_file is set, the cells are held in a numpy.memmap of that file instead
+			(an NxN numpy array, or the values of a symmetric_matrix)
+		typecode -> the type of the cells (see dtypes), other than 'd' the rows are compact array.array's instead of lists of floats
+		contiguous -> if set (and numpy is available), the cells are held in one numpy array in memory
+			(as for memmap_file), so the whole matrix can be updated with a few numpy operations (see _update_pheromone_map())
+		"""
+		if contiguous and memmap_file is None and numpy is not None:
+			shape = (size*(size+1)//2,) if self.symmetric else (size, size)
+			values = numpy.full(shape, value, dtype=numpy.dtype(typecode))
+			if self.symmetric:
+				return symmetric_matrix(size, values=values)
+			return values
+		
+		if memmap_file is not None:
+			shape = (size*(size+1)//2,) if self.symmetric else (size, size)
+			values = numpy.memmap(memmap_file, dtype=numpy.dtype(typecode), mode='w+', shape=shape)
+			if value:
+				values[:] = value
+			if self.symmetric:
+				return symmetric_matrix(size, values=values)
+			return values
+		
+		if typecode == 'i':
+			value = int(value)
+		if self.symmetric:
+			return symmetric_matrix(size, float(value) if typecode != 'i' else value, typecode)
+		if typecode != 'd':
+			return [array(typecode, [value])*size for row in range(size)]
+		return self._init_matrix(size, value)
+	
 	def _init_matrix(self, size, value=0.0):
 		"""
 		setup a matrix NxN (where n = size)
@@ -341,6 +2242,95 @@ class ant_colony:
 			ret.append([float(value) for x in range(size)])
 		return ret
 	
+	def _memmap_file(self, name):
+		"""
+		the path of a new numpy.memmap file in memmap_dir, to hold the matrix name (such as 'distance_matrix')
+		or None, if that matrix is kept in memory
+		a unique file (name_*.dat), so another colony using the same memmap_dir doesn't truncate it, kept in memmap_files
+		"""
+		if self.memmap_dir is None:
+			return None
+		if name != 'distance_matrix' and not self.memmap_pheromones:
+			return None
+		handle, path = tempfile.mkstemp(suffix='.dat', prefix=name + '_', dir=self.memmap_dir)
+		os.close(handle)
+		self.memmap_files.append(path)
+		return path
+	
+	def _pack_matrix(self, matrix, typecode='d'):
+		"""
+		copy a full NxN numpy matrix into a symmetric_matrix, keeping its lower triangle
+		"""
+		values = array(typecode)
+		values.frombytes(numpy.ascontiguousarray(matrix[numpy.tril_indices(len(matrix))], dtype=numpy.dtype(typecode)).tobytes())
+		return symmetric_matrix(len(matrix), values=values)
+	
+	def _init_candidates(self, count):
+		"""
+		find the count nearest neighbours of each node, nearest first, as a list by node id
+		for the planar built-in metrics on 2d coordinates, nodes are bucketed in a grid (see _grid_candidates())
+		otherwise they are picked from the distances of each node to all others
+		"""
+		if count < 1:
+			return [[] for id in range(len(self.nodes))]
+		
+		if self.distance_metric in ('euclidean', 'manhattan', 'chebyshev') and len(self.nodes[0]) == 2:
+			return self._grid_candidates(count)
+		
+		if self.distance_precomputed and not self.symmetric:
+			#all distances are known: partition each row, then sort just the count nearest
+			distances = numpy.array(self.distance_matrix, dtype=float)
+			numpy.fill_diagonal(distances, numpy.inf)
+			nearest = numpy.argpartition(distances, count - 1, axis=1)[:, :count]
+			order = numpy.argsort(numpy.take_along_axis(distances, nearest, axis=1), axis=1, kind='stable')
+			return numpy.take_along_axis(nearest, order, axis=1).tolist()
+		
+		candidates = []
+		for start in range(len(self.nodes)):
+			others = [end for end in range(len(self.nodes)) if end != start]
+			candidates.append(heapq.nsmallest(count, others, key=lambda end: self._get_distance(start, end)))
+		return candidates
+	
+	def _grid_candidates(self, count):
+		"""
+		nearest neighbours of each node by bucketing the nodes in a grid of square cells (about 2 nodes per cell)
+		and searching the rings of cells around a node's cell, outward, until the count nearest are certain:
+			any node beyond ring r is at least r cell widths away along some axis, which none of the metrics can be less than
+		so only the cells near a node are searched, rather than all other nodes
+		"""
+		distance = metrics[self.distance_metric][0]
+		points = [self.nodes[id] for id in range(len(self.nodes))]
+		low_x = min([point[0] for point in points])
+		low_y = min([point[1] for point in points])
+		span = max(max([point[0] for point in points]) - low_x, max([point[1] for point in points]) - low_y)
+		cell_size = float(span) / max(1.0, math.sqrt(len(points)/2.0)) or 1.0
+		
+		cells = dict()
+		for id, point in enumerate(points):
+			cells.setdefault((int((point[0] - low_x)/cell_size), int((point[1] - low_y)/cell_size)), []).append(id)
+		rings = int(span/cell_size) + 1
+		
+		candidates = []
+		for id, point in enumerate(points):
+			cell_x, cell_y = int((point[0] - low_x)/cell_size), int((point[1] - low_y)/cell_size)
+			nearest = []
+			for ring in range(rings + 1):
+				#the cells at exactly ring steps from this node's cell: the top and bottom rows, then the sides between them
+				ring_cells = [(x, y) for x in range(cell_x - ring, cell_x + ring + 1) for y in set([cell_y - ring, cell_y + ring])]
+				if ring:
+					ring_cells += [(x, y) for x in (cell_x - ring, cell_x + ring) for y in range(cell_y - ring + 1, cell_y + ring)]
+				for ring_cell in ring_cells:
+					for other in cells.get(ring_cell, ()):
+						if other != id:
+							nearest.append((distance(point, points[other]), other))
+				
+				if len(nearest) >= count:
+					nearest = heapq.nsmallest(count, nearest)
+					if nearest[-1][0] <= ring*cell_size:
+						break
+			candidates.append([other for _, other in sorted(nearest)[:count]])
+		return candidates
+	
 	def _init_ants(self, start):
 		"""
 		on first pass:
@@ -349,13 +2339,63 @@ class ant_colony:
 		by default, all ants start at the first node, 0
 		as per problem description: https://www.codeeval.com/open_challenges/90/
 		"""
+		streams = self._ant_streams()
+		local_update = self._local_update_step if self._local_updating() else None
 		#allocate new ants on the first pass
 		if self.first_pass:
 			return [self.ant(start, self.nodes.keys(), self.pheromone_map, self._get_distance,
-				self.alpha, self.beta, first_pass=True) for x in range(self.ant_count)]
+				self.alpha, self.beta, first_pass=True, candidates=self.candidates, distances_callback=self._distances_callback(), choice_info=self.choice_info, choice_cumulative=self.choice_cumulative, stream=streams[x], q0=self.update_strategy.q0, local_update=local_update) for x in range(self.ant_count)]
 		#else, just reset them to use on another pass
-		for ant in self.ants:
-			ant.__init__(start, self.nodes.keys(), self.pheromone_map, self._get_distance, self.alpha, self.beta)
+		for x, ant in enumerate(self.ants):
+			ant.__init__(start, self.nodes.keys(), self.pheromone_map, self._get_distance, self.alpha, self.beta, candidates=self.candidates, distances_callback=self._distances_callback(), choice_info=self.choice_info, choice_cumulative=self.choice_cumulative, stream=streams[x], q0=self.update_strategy.q0, local_update=local_update)
+	
+	def _ant_streams(self):
+		"""
+		the random_stream of each ant for this iteration, keyed by (iteration, ant index)
+		a list of None without a seed (the ants then use the random module)
+		"""
+		if self.seed is None:
+			return [None]*self.ant_count
+		return [random_stream(self.seed, (self.iteration, x)) for x in range(self.ant_count)]
+	
+	def _run_ants(self, ants):
+		"""
+		runs each ant's tour (ant.run()) for the threads backend, as set by executor, and waits until all of them are finished
+		before moving on to modifying shared resources
+		an exception raised by an ant is raised here (except without an executor, where it stays in the ant's thread)
+		"""
+		if self.executor is None:
+			#start the multi-threaded ants, calls ant.run() in a new thread
+			for ant in ants:
+				ant.start()
+			
+			#source: http://stackoverflow.com/a/11968818/5343977
+			for ant in ants:
+				ant.join()
+			return
+		
+		if self.executor == 'sequential':
+			for ant in ants:
+				ant.run()
+			return
+		
+		executor = self.executor
+		if executor == 'pool':
+			if self.thread_pool is None:
+				self.thread_pool = ThreadPoolExecutor(self.workers)
+			executor = self.thread_pool
+		futures = [executor.submit(ant.run) for ant in ants]
+		for future in futures:
+			future.result()
+	
+	def _stop_thread_pool(self):
+		"""
+		shuts down the pool of threads of executor 'pool', called at the end of mainloop()
+		"""
+		if self.thread_pool is None:
+			return
+		self.thread_pool.shutdown()
+		self.thread_pool = None
 	
 	def _update_pheromone_map(self):
 		"""
@@ -364,7 +2404,45 @@ class ant_colony:
 		called by:
 			mainloop()
 			(after all ants have traveresed)
+		with symmetric matrices, each cell is only stored (and so updated) once
+		numpy matrices are decayed lazily: the pheromone amounts are pheromone_scale times the stored values
+			so decaying all of them is decaying pheromone_scale, and only the cells deposited on (deposited_cells) are updated
+			(deposits / pheromone_scale are added to them), in O(edges deposited) rather than O(N^2)
+			once pheromone_scale falls below pheromone_scale_floor, it is folded back into the stored values (see _apply_pheromone_scale())
+			the ants only compare pheromone amounts relative to each other, so they read the stored values as they are
 		"""
+		if isinstance(self.pheromone_map, symmetric_matrix):
+			values = self.pheromone_map.values
+			deposits = self.ant_updated_pheromone_map.values
+		else:
+			values = self.pheromone_map
+			deposits = self.ant_updated_pheromone_map
+		
+		if numpy is not None and isinstance(values, numpy.ndarray) and isinstance(deposits, numpy.ndarray):
+			#tau_xy <- (1-rho)*tau_xy + delta tau_xy	(ACO)
+			#	as pheromone_scale <- (1-rho)*pheromone_scale, values_xy <- values_xy + delta tau_xy / pheromone_scale
+			self.pheromone_scale *= (1-self.pheromone_evaporation_coefficient)
+			if self.pheromone_scale < pheromone_scale_floor:
+				self._apply_pheromone_scale()
+			
+			values = values.reshape(-1)
+			deposits = deposits.reshape(-1)
+			if self.deposited_cells is not None:
+				cells = self.deposited_cells
+				values[cells] += deposits[cells] / self.pheromone_scale
+				return
+			
+			#deposits made other than by _deposit_pheromones(), all cells
+			chunk = chunk_cells if isinstance(values, numpy.memmap) else values.size
+			for first in range(0, len(values), max(1, chunk)):
+				values[first:first + chunk] += deposits[first:first + chunk] / self.pheromone_scale
+			return
+		
+		if isinstance(self.pheromone_map, symmetric_matrix):
+			for cell in range(len(values)):
+				values[cell] = (1-self.pheromone_evaporation_coefficient)*values[cell] + deposits[cell]
+			return
+		
 		#always a square matrix
 		for start in range(len(self.pheromone_map)):
 			for end in range(len(self.pheromone_map)):
@@ -378,6 +2456,251 @@ class ant_colony:
 				#	delta tau_xy_k = Q / L_k
 				self.pheromone_map[start][end] += self.ant_updated_pheromone_map[start][end]
 	
+	def _bound_pheromones(self):
+		"""
+		after the first pass, sets all pheromone amounts of pheromone_map to update_strategy.initial_pheromone(), if it gives one (kept in initial_pheromone_amount)
+		then keeps them between the (low, high) bounds of update_strategy.bounds(), if it has any (kept in pheromone_bounds)
+		called from mainloop(), after _update_pheromone_map()
+		numpy matrices hold the pheromone amounts divided by pheromone_scale, so these are divided by it as well
+		"""
+		initial = self.update_strategy.initial_pheromone(self) if self.first_pass else None
+		if initial is not None:
+			self.initial_pheromone_amount = initial
+		self.pheromone_bounds = self.update_strategy.bounds(self)
+		if initial is None and self.pheromone_bounds is None:
+			return
+		low, high = self.pheromone_bounds if self.pheromone_bounds is not None else (None, None)
+		
+		values = self.pheromone_map.values if isinstance(self.pheromone_map, symmetric_matrix) else self.pheromone_map
+		if numpy is not None and isinstance(values, numpy.ndarray):
+			values = values.reshape(-1)
+			scale = self.pheromone_scale
+			chunk = chunk_cells if isinstance(values, numpy.memmap) else values.size
+			for first in range(0, len(values), max(1, chunk)):
+				cells = values[first:first + chunk]
+				if initial is not None:
+					cells.fill(initial / scale)
+				if self.pheromone_bounds is not None:
+					numpy.clip(cells, low / scale, high / scale, out=cells)
+			return
+		
+		def bound(value):
+			if initial is not None:
+				value = initial
+			if self.pheromone_bounds is not None:
+				value = min(max(value, low), high)
+			return value
+		
+		if isinstance(self.pheromone_map, symmetric_matrix):
+			for cell in range(len(values)):
+				values[cell] = bound(values[cell])
+			return
+		
+		for row in self.pheromone_map:
+			for end in range(len(row)):
+				row[end] = bound(row[end])
+	
+	def _apply_pheromone_scale(self):
+		"""
+		folds pheromone_scale into the stored values of pheromone_map (a numpy array), which then hold the pheromone amounts themselves
+		called from _update_pheromone_map() when pheromone_scale gets too small, and at the end of mainloop()
+		"""
+		if self.pheromone_scale == 1.0:
+			return
+		values = self.pheromone_map.values if isinstance(self.pheromone_map, symmetric_matrix) else self.pheromone_map
+		values = values.reshape(-1)
+		chunk = chunk_cells if isinstance(values, numpy.memmap) else values.size
+		for first in range(0, len(values), max(1, chunk)):
+			values[first:first + chunk] *= self.pheromone_scale
+		self.pheromone_scale = 1.0
+	
+	def _update_choice_info(self):
+		"""
+		rebuilds choice_info, the weights of each step (tau^alpha * eta^beta) that ants choose their next location by
+		done once per iteration, after _update_pheromone_map(), so ants only read these instead of computing them at every step
+		the weights are computed in log space (see _log_attractiveness()), and shifted so the highest one is 1.0 (see _shifted_weights())
+		the log of the heuristic (beta*log(eta) = -beta*log(distance)) is computed once, from all distances
+		(a built-in metric, after precompute_distances(), or loaded from distance_cache)
+			with a distance_callback, after the first pass, whose ants looked up all but a few of them
+			(those from each node to itself, and into the start node), which are then computed by precompute_distances()
+			from then on the ants read the distances as whole rows as well (see _distances_callback())
+		requires numpy, and all of distance_matrix in memory (not with memmap_dir or distance_rows), otherwise choice_info stays None
+		(the processes backend copies it into shared memory for its workers, see _construct_tours_processes())
+		choice_info has the layout of pheromone_map: an NxN numpy array, or a symmetric_matrix over a numpy array
+		without candidates, choice_cumulative is rebuilt as well: the running totals along each (full) row of choice_info
+			(leaving out the step from a node to itself), which ants draw their next location from (see ant._sample_unvisited())
+			(not for the batched backend, or with a seed, where ants choose as in _construct_tours_batched()
+			nor with the local update of ant_colony_system, which changes choice_info during the iteration)
+		"""
+		if numpy is None or self.memmap_dir is not None or self.distance_rows is not None:
+			return
+		
+		if self.log_heuristic is None:
+			if not self.distance_computed.all():
+				if self.distance_async:
+					return
+				self.precompute_distances(workers=1)
+			self.distance_precomputed = True
+			#a distance of 0 gives an infinite weight, ants take those steps first (see ant._roulette())
+			self.log_heuristic = _log_attractiveness_block(None, self._matrix_cells(self.distance_matrix, float), 0, self.beta).astype(numpy.dtype(self.pheromone_typecode), copy=False)
+		
+		cells = _choice_weights(self.log_heuristic, self._matrix_cells(self.pheromone_map, float), self.alpha, self.pheromone_typecode)
+		if self.symmetric:
+			self.choice_info = symmetric_matrix(len(self.nodes), values=cells)
+		else:
+			self.choice_info = cells.reshape(len(self.nodes), len(self.nodes))
+		
+		if self.candidates is None and self.backend == 'threads' and self.seed is None and not self.update_strategy.local_evaporation:
+			weights = numpy.array(self._dense_matrix(self.choice_info), dtype=float)
+			numpy.fill_diagonal(weights, 0.0)
+			self.choice_cumulative = numpy.cumsum(weights, axis=1, out=weights)
+	
+	def _dense_matrix(self, matrix):
+		"""
+		a matrix as a full NxN numpy array, whatever its layout
+		the matrix itself for a numpy array, a copy for a symmetric_matrix (unpacked) or a list of rows
+		requires numpy
+		"""
+		if isinstance(matrix, numpy.ndarray):
+			return matrix
+		if isinstance(matrix, symmetric_matrix):
+			rows, columns = numpy.indices((len(matrix), len(matrix)))
+			low, high = numpy.minimum(rows, columns), numpy.maximum(rows, columns)
+			return self._matrix_cells(matrix, 'd')[high*(high + 1)//2 + low]
+		return numpy.array(matrix, dtype=float)
+	
+	def _construct_tours_batched(self):
+		"""
+		the batched backend: constructs the tours of all ant_count ants at once, advancing them in lockstep (see _construct_tours())
+		each step gathers the rows of choice_info for every ant's location into an (ants x N) array of weights
+		zeroes those of visited locations (an (ants x N) mask), and picks every ant's next location with one cumulative sum (see _lockstep_step())
+		the same choices as ant._pick_path() makes (uniform on the first pass, only candidates if set, ...)
+		with a seed, each ant draws from its own random_stream, as a seeded ant of the threads backend does
+		with the local update of ant_colony_system, the pheromones and weights of the edges taken are updated after each step (see _local_step())
+		the tour lengths are added up step by step from dense_distances, in the same order as ant._update_distance_traveled()
+		returns a _tour per ant
+		"""
+		size = len(self.nodes)
+		ants = self.ant_count
+		if self.dense_distances is None:
+			#all distances are needed up front
+			self.precompute_distances(workers=1)
+			self.dense_distances = numpy.array(self._dense_matrix(self.distance_matrix), dtype=float)
+			self._update_choice_info()
+		
+		weights = None
+		local = None
+		if not self.first_pass:
+			weights = self._dense_matrix(self.choice_info)
+			if self._local_updating():
+				#see _local_step(), the stored pheromone values are the pheromone amounts divided by pheromone_scale
+				pheromones = self.pheromone_map.values if isinstance(self.pheromone_map, symmetric_matrix) else self.pheromone_map
+				local = (pheromones.reshape(-1), isinstance(self.pheromone_map, symmetric_matrix), self.update_strategy.local_evaporation, self.initial_pheromone_amount / self.pheromone_scale, self.alpha)
+		tosses = _ant_tosses(self.seed, self.iteration, range(ants), numpy.random)
+		routes, lengths = _construct_tours(weights, self.dense_distances, _candidate_mask(self.candidates, size), self.start, ants, tosses, self.update_strategy.q0, local)
+		return [_tour(route, float(length)) for route, length in zip(routes.tolist(), lengths.tolist())]
+	
+	def _construct_tours_processes(self):
+		"""
+		the processes backend: constructs the tours of all ant_count ants in a pool of workers worker processes
+		each worker constructs the tours of a batch of ants as the batched backend does (see _construct_batch())
+		all distances (once) and choice_info (each iteration, computed once here rather than by every worker) are copied into shared memory, as NxN arrays
+		and the workers write the routes back as int32 into shared memory as well, rather than passing them pickled
+		the pool and the shared memory are set up on the first call (see _start_processes()), and kept until _stop_processes()
+		returns a _tour per ant
+		"""
+		ants = self.ant_count
+		if self.process_pool is None:
+			self._start_processes()
+		if not self.first_pass:
+			self.process_arrays['weights'][...] = self._dense_matrix(self.choice_info)
+		
+		#a batch of ants per worker
+		bounds = [ants*x//self.workers for x in range(self.workers + 1)]
+		tasks = [(first, last, self.first_pass, self.iteration) for first, last in zip(bounds, bounds[1:]) if last > first]
+		list(self.process_pool.map(_construct_batch, tasks))
+		
+		return [_tour(route, length) for route, length in zip(self.process_arrays['routes'].tolist(), self.process_arrays['lengths'].tolist())]
+	
+	def _start_processes(self):
+		"""
+		creates the shared memory segments of the processes backend (see _construct_segments()) and its pool of worker processes
+		all distances are computed first, and copied into shared memory (and choice_info built from them)
+		"""
+		size = len(self.nodes)
+		self.precompute_distances(workers=1)
+		self._update_choice_info()
+		
+		self.process_segments = {}
+		self.process_arrays = {}
+		for name, (shape, dtype) in _construct_segments(size, self.ant_count, self.pheromone_typecode).items():
+			segment = shared_memory.SharedMemory(create=True, size=max(1, int(numpy.prod(shape))*numpy.dtype(dtype).itemsize))
+			self.process_segments[name] = segment
+			self.process_arrays[name] = numpy.ndarray(shape, dtype=dtype, buffer=segment.buf)
+		self.process_arrays['distances'][...] = self._dense_matrix(self.distance_matrix)
+		
+		segment_names = dict([(name, segment.name) for name, segment in self.process_segments.items()])
+		self.process_pool = ProcessPoolExecutor(self.workers, initializer=_init_construct_worker,
+			initargs=(segment_names, size, self.ant_count, self.pheromone_typecode, self.candidates, self.start, self.seed, self.update_strategy.q0))
+	
+	def _stop_processes(self):
+		"""
+		shuts down the pool of worker processes of the processes backend, and frees its shared memory
+		called at the end of mainloop()
+		"""
+		if self.process_pool is None:
+			return
+		self.process_pool.shutdown()
+		self.process_pool = None
+		
+		#the arrays over the segments have to go before the segments can be closed
+		self.process_arrays = None
+		for segment in self.process_segments.values():
+			segment.close()
+			segment.unlink()
+		self.process_segments = None
+	
+	def _matrix_cells(self, matrix, typecode):
+		"""
+		the stored cells of a matrix as a flat numpy array of typecode (see dtypes)
+		a view of the buffer for numpy arrays and symmetric_matrix's, a copy for lists of rows
+		"""
+		if isinstance(matrix, symmetric_matrix):
+			values = matrix.values
+			if not isinstance(values, numpy.ndarray):
+				values = numpy.frombuffer(values, dtype=values.typecode)
+		elif isinstance(matrix, numpy.ndarray):
+			values = matrix.reshape(-1)
+		else:
+			values = numpy.array(matrix).reshape(-1)
+		return values.astype(numpy.dtype(typecode), copy=False)
+	
+	def _deposit_pheromones(self, ants):
+		"""
+		adds the pheromones of all ants (delta tau_xy_k = Q / L_k along each ant's route) to ant_updated_pheromone_map
+		if it is held in a numpy array, with one numpy.add.at() scatter over the edges of all routes at once
+			(in the same order as _populate_ant_updated_pheromone_map() one ant at a time, so the sums are the same)
+		otherwise with _populate_ant_updated_pheromone_map() for each ant
+		called from mainloop()
+		"""
+		deposits = self.ant_updated_pheromone_map
+		if isinstance(deposits, symmetric_matrix):
+			deposits = deposits.values
+		self.deposited_cells = None
+		if numpy is None or not isinstance(deposits, numpy.ndarray) or not ants:
+			for ant in ants:
+				self._populate_ant_updated_pheromone_map(ant)
+			return
+		
+		routes = numpy.array([ant.get_route() for ant in ants], dtype=numpy.intp)
+		amounts = numpy.repeat(self.pheromone_constant / numpy.array([ant.get_distance_traveled() for ant in ants], dtype=float), routes.shape[1] - 1)
+		symmetric = isinstance(self.ant_updated_pheromone_map, symmetric_matrix)
+		cells = _route_cells(routes, len(self.nodes), symmetric)
+		numpy.add.at(deposits.reshape(-1), cells, amounts if symmetric else numpy.repeat(amounts, 2))
+		
+		#for _update_pheromone_map(), which only updates these
+		self.deposited_cells = numpy.unique(cells)
+	
 	def _populate_ant_updated_pheromone_map(self, ant):
 		"""
 		given an ant, populate ant_updated_pheromone_map with pheromone values according to ACO
@@ -397,55 +2720,238 @@ class ant_colony:
 			new_pheromone_value = self.pheromone_constant/ant.get_distance_traveled()
 			
 			self.ant_updated_pheromone_map[route[i]][route[i+1]] = current_pheromone_value + new_pheromone_value
-			self.ant_updated_pheromone_map[route[i+1]][route[i]] = current_pheromone_value + new_pheromone_value
+			#a symmetric_matrix holds both directions in the same cell
+			if not isinstance(self.ant_updated_pheromone_map, symmetric_matrix):
+				self.ant_updated_pheromone_map[route[i+1]][route[i]] = current_pheromone_value + new_pheromone_value
 		
+	def _local_updating(self):
+		"""
+		True if the ants make the local update of Ant Colony System this iteration
+		with update_strategy.local_evaporation (xi) set, once the initial pheromone amount (tau_0) is known, after the first pass
+		"""
+		return bool(self.update_strategy.local_evaporation) and self.initial_pheromone_amount is not None
+	
+	def _local_update_step(self, start, end):
+		"""
+		the local update of Ant Colony System, for a step from start to end as an ant of the threads backend takes it (see ant._traverse())
+		moves the pheromone amount of the edge back towards the initial amount (initial_pheromone_amount, tau_0)
+			tau_xy <- (1-xi)*tau_xy + xi*tau_0
+		and scales its weights in choice_info (if any) by the change in tau^alpha, so the ants' next steps see it
+		one step at a time (local_update_lock), the ants of the threads backend take their steps at the same time
+		"""
+		xi = self.update_strategy.local_evaporation
+		#the stored pheromone values are the pheromone amounts divided by pheromone_scale, see _update_pheromone_map()
+		tau_0 = self.initial_pheromone_amount / self.pheromone_scale
+		with self.local_update_lock:
+			old = float(self.pheromone_map[start][end])
+			new = (1-xi)*old + xi*tau_0
+			self.pheromone_map[start][end] = new
+			#a symmetric_matrix holds both directions in the same cell
+			if not isinstance(self.pheromone_map, symmetric_matrix):
+				self.pheromone_map[end][start] = new
+			
+			if self.choice_info is None or not old > 0:
+				return
+			ratio = pow(new / old, self.alpha)
+			self.choice_info[start][end] = self.choice_info[start][end] * ratio
+			if not isinstance(self.choice_info, symmetric_matrix):
+				self.choice_info[end][start] = self.choice_info[end][start] * ratio
+	
+	def _local_update(self, ants):
+		"""
+		the local update of Ant Colony System for the processes backend, applied for the tours of all ants once they are constructed
+		(each worker constructs its batch of tours on its own, so the ants can't update the pheromones for each other as they go)
+		each step of each ant moves the pheromone amount of its edge back towards the initial amount (initial_pheromone_amount, tau_0)
+			an edge taken k times gets tau_xy <- (1-xi)^k*tau_xy + (1-(1-xi)^k)*tau_0
+		the other backends update the pheromones at each step instead (see _local_step() and _local_update_step())
+		called from mainloop(), before the global update
+		"""
+		if not self._local_updating():
+			return
+		xi = self.update_strategy.local_evaporation
+		tau_0 = self.initial_pheromone_amount
+		
+		values = self.pheromone_map.values if isinstance(self.pheromone_map, symmetric_matrix) else self.pheromone_map
+		if numpy is not None and isinstance(values, numpy.ndarray):
+			routes = numpy.array([ant.get_route() for ant in ants], dtype=numpy.intp)
+			cells, counts = numpy.unique(_route_cells(routes, len(self.nodes), isinstance(self.pheromone_map, symmetric_matrix)), return_counts=True)
+			kept = pow(1 - xi, counts)
+			values = values.reshape(-1)
+			#the stored values are the pheromone amounts divided by pheromone_scale, see _update_pheromone_map()
+			values[cells] = kept*values[cells] + (1 - kept)*(tau_0 / self.pheromone_scale)
+			return
+		
+		for ant in ants:
+			route = ant.get_route()
+			for i in range(len(route)-1):
+				amount = (1-xi)*self.pheromone_map[route[i]][route[i+1]] + xi*tau_0
+				self.pheromone_map[route[i]][route[i+1]] = amount
+				#a symmetric_matrix holds both directions in the same cell
+				if not isinstance(self.pheromone_map, symmetric_matrix):
+					self.pheromone_map[route[i+1]][route[i]] = amount
+	
+	def _clear_deposits(self, ants):
+		"""
+		zeroes ant_updated_pheromone_map in place for the next iteration, rather than setting up a new matrix every iteration
+		only the cells deposited on are cleared: deposited_cells of a numpy array (all of it, if that is not known)
+			otherwise the edges along the routes of ants
+		called from mainloop()
+		"""
+		deposits = self.ant_updated_pheromone_map
+		values = deposits.values if isinstance(deposits, symmetric_matrix) else deposits
+		if numpy is not None and isinstance(values, numpy.ndarray):
+			if self.deposited_cells is not None:
+				values.reshape(-1)[self.deposited_cells] = 0
+			else:
+				values.fill(0)
+			self.deposited_cells = None
+			return
+		
+		for ant in ants:
+			route = ant.get_route()
+			for i in range(len(route)-1):
+				deposits[route[i]][route[i+1]] = 0.0
+				#a symmetric_matrix holds both directions in the same cell
+				if not isinstance(deposits, symmetric_matrix):
+					deposits[route[i+1]][route[i]] = 0.0
+	
 	def mainloop(self):
 		"""
 		Runs the worker ants, collects their returns and updates the pheromone map with pheromone values from workers
 			calls:
-			_update_pheromones()
-			ant.run()
+			_iterate()
+			_finish()
 		runs the simulation self.iterations times
+		the worker processes of the processes backend (and their shared memory), and the threads of executor 'pool'
+			are let go even if an iteration raises
 		"""
+		if self.distance_async:
+			raise TypeError("an async distance_callback can only be used with mainloop_async()")
 		
-		for _ in range(self.iterations):
-			#start the multi-threaded ants, calls ant.run() in a new thread
-			for ant in self.ants:
-				ant.start()
+		try:
+			for _ in range(self.iterations):
+				self._iterate()
+		finally:
+			self._stop_processes()
+			self._stop_thread_pool()
+		
+		return self._finish()
+	
+	async def mainloop_async(self):
+		"""
+		mainloop() for use in an asyncio event loop, yielding to the loop between iterations
+		with an async distance_callback (a coroutine function), all distances are first gathered with precompute_distances_async()
+		if the task running it is cancelled (between iterations, say by asyncio.wait_for()), the shortest path seen so far is returned
+			unless there is none yet, then the cancellation goes on as usual
+		as in mainloop(), the worker processes of the processes backend and the threads of executor 'pool' are let go however the iterations end
+		"""
+		try:
+			if self.distance_async:
+				await self.precompute_distances_async()
+				if self.candidate_count is not None and self.candidates is None:
+					self.candidates = self._init_candidates(min(self.candidate_count, len(self.nodes) - 1))
+					self.ants = self._init_ants(self.start)
 			
-			#source: http://stackoverflow.com/a/11968818/5343977
-			#wait until the ants are finished, before moving on to modifying shared resources
-			for ant in self.ants:
-				ant.join()
+			for _ in range(self.iterations):
+				self._iterate()
+				#let other tasks run (and this one be cancelled) between iterations
+				await asyncio.sleep(0)
+		except asyncio.CancelledError:
+			if self.shortest_path_seen is None:
+				raise
+		finally:
+			self._stop_processes()
+			self._stop_thread_pool()
+		
+		return self._finish()
+	
+	def _iterate(self):
+		"""
+		one iteration of mainloop(): constructs the ants' tours and updates the pheromone map with their pheromone values
+			calls:
+			_local_update()
+			update_strategy.deposits()
+			_update_pheromones()
+			ant.run() (or _construct_tours_batched() / _construct_tours_processes(), for the batched / processes backends)
+		"""
+		if self.first_pass and self.seed is not None and numpy is not None and self.distance_rows is None and self.memmap_dir is None and not self.distance_async:
+			#all distances are needed by the end of the first iteration, so choice_info is built then, as in the batched backend
+			#	(and seeded ants choose by it, see ant._pick_path()), computed here rather than in __init__()
+			self.precompute_distances(workers=1)
+		
+		#with a seed, the ants' local updates (of ant_colony_system) are only reproducible in lockstep
+		#	so the threads backend then constructs the tours as the batched backend does, which gives the same tours as its seeded ants otherwise
+		lockstep = self.backend == 'threads' and self.seed is not None and self._local_updating() and numpy is not None and self.distance_rows is None and self.memmap_dir is None
+		if self.backend == 'batched' or lockstep:
+			#all tours at once, in lockstep
+			ants = self._construct_tours_batched()
+		elif self.backend == 'processes':
+			#in lockstep as well, in batches of ants spread over worker processes
+			ants = self._construct_tours_processes()
+		else:
+			ants = self.ants
+			self._run_ants(ants)
+		
+		#pheromones along the ants' tours fall back towards their initial amount, with update_strategy 'colony_system'
+		#	(the ants of the other backends did so as they went)
+		if self.backend == 'processes':
+			self._local_update(ants)
+		
+		for ant in ants:
+			#if we haven't seen any paths yet, then populate for comparisons later
+			if not self.shortest_distance:
+				self.shortest_distance = ant.get_distance_traveled()
 			
-			for ant in self.ants:	
-				#update ant_updated_pheromone_map with this ant's constribution of pheromones along its route
-				self._populate_ant_updated_pheromone_map(ant)
+			if not self.shortest_path_seen:
+				self.shortest_path_seen = ant.get_route()
 				
-				#if we haven't seen any paths yet, then populate for comparisons later
-				if not self.shortest_distance:
-					self.shortest_distance = ant.get_distance_traveled()
-				
-				if not self.shortest_path_seen:
-					self.shortest_path_seen = ant.get_route()
-					
-				#if we see a shorter path, then save for return
-				if ant.get_distance_traveled() < self.shortest_distance:
-					self.shortest_distance = ant.get_distance_traveled()
-					self.shortest_path_seen = ant.get_route()
-			
-			#decay current pheromone values and add all pheromone values we saw during traversal (from ant_updated_pheromone_map)
-			self._update_pheromone_map()
-			
-			#flag that we finished the first pass of the ants traversal
-			if self.first_pass:
-				self.first_pass = False
-			
-			#reset all ants to default for the next iteration
+			#if we see a shorter path, then save for return
+			if ant.get_distance_traveled() < self.shortest_distance:
+				self.shortest_distance = ant.get_distance_traveled()
+				self.shortest_path_seen = ant.get_route()
+		
+		#update ant_updated_pheromone_map with the contributions of pheromones along the routes update_strategy picks
+		#	(after the shortest path so far is updated, which some strategies deposit on)
+		tours = self.update_strategy.deposits(self, ants)
+		self._deposit_pheromones(tours)
+		
+		#decay current pheromone values and add all pheromone values we saw during traversal (from ant_updated_pheromone_map)
+		self._update_pheromone_map()
+		#reset ant_updated_pheromone_map to record pheromones for ants on next pass
+		#	(while tours still hold their routes, the ants are reset below)
+		self._clear_deposits(tours)
+		#and keep them within the bounds of update_strategy, if any
+		self._bound_pheromones()
+		
+		#and the weights the ants choose their next steps by, from the new pheromone values
+		self._update_choice_info()
+		
+		#flag that we finished the first pass of the ants traversal
+		if self.first_pass:
+			self.first_pass = False
+		self.iteration += 1
+		
+		#reset all ants to default for the next iteration
+		if self.backend == 'threads':
 			self._init_ants(self.start)
-			
-			#reset ant_updated_pheromone_map to record pheromones for ants on next pass
-			self.ant_updated_pheromone_map = self._init_matrix(len(self.nodes), value=0)
+	
+	def _finish(self):
+		"""
+		the end of mainloop(), after all iterations
+		lets go of the backends' workers, removes the files of memmap_dir, saves distance_cache, and returns the shortest path seen (as the callers node id's)
+		"""
+		self._stop_processes()
+		self._stop_thread_pool()
+		
+		#so pheromone_map holds the pheromone amounts themselves
+		self._apply_pheromone_scale()
+		
+		#the matrices stay mapped, only their files in memmap_dir are removed
+		#	(where a mapped file can't be removed, as on Windows, once the colony is garbage collected)
+		_remove_files(self.memmap_files)
+		
+		#keep the distances we had to compute for the next run
+		self._save_distance_cache()
 		
 		#translate shortest path back into callers node id's
 		ret = []
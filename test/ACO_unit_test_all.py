@@ -22,6 +22,27 @@ from test_ant_colony_integration_testing import *
 from test_ant_colony_more_general import *
 from test_ant_colony_init_nodes import *
 from test_ant_colony_init import *
+from test_ant_colony_metric_matrix import *
+from test_ant_colony_fill_distance_row import *
+from test_ant_colony_fill_distance_chunk import *
+from test_ant_colony_distance_cache import *
+from test_ant_colony_init_candidates import *
+from test_ant_colony_precompute_distances import *
+from test_ant_colony_new_matrix import *
+from test_distance_row_cache import *
+from test_ant_colony_update_choice_info import *
+from test_location_set import *
+from test_ant_colony_construct_tours_batched import *
+from test_random_stream import *
+from test_ant_colony_construct_tours_processes import *
+from test_ant_colony_run_ants import *
+from test_ant_colony_mainloop_async import *
+from test_ant_colony_deposit_pheromones import *
+from test_ant_colony_clear_deposits import *
+from test_ant_colony_bound_pheromones import *
+from test_ant_colony_local_update import *
+from test_update_rules import *
+from test_symmetric_matrix import *
 	
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,101 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestAntColonyBoundPheromones(unittest.TestCase):
+	def make_test_object(self, symmetric, contiguous, initial=None, bounds=None):
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		class mock_update_rule(module.update_rule):
+			def initial_pheromone(self, colony):
+				return initial
+			def bounds(self, colony):
+				return bounds
+		
+		#setup test environment
+		test_object.nodes = {x: x for x in range(3)}
+		test_object.symmetric = symmetric
+		test_object.update_strategy = mock_update_rule()
+		test_object.pheromone_bounds = None
+		test_object.pheromone_scale = 1.0
+		test_object.first_pass = False
+		test_object.pheromone_map = test_object._new_matrix(3, contiguous=contiguous)
+		for start in range(3):
+			for end in range(3):
+				test_object.pheromone_map[start][end] = float(start + end)
+		return test_object
+	
+	def test_correct(self):
+		module.debug = False
+		
+		#testing
+		for symmetric in [False, True]:
+			for contiguous in [False, True]:
+				test_object = self.make_test_object(symmetric, contiguous, bounds=(1.0, 3.0))
+				test_object._bound_pheromones()
+				self.assertEqual(test_object.pheromone_bounds, (1.0, 3.0))
+				for start in range(3):
+					for end in range(3):
+						self.assertEqual(test_object.pheromone_map[start][end], min(max(float(start + end), 1.0), 3.0))
+	
+	def test_initial_pheromone(self):
+		module.debug = False
+		
+		#testing
+		for symmetric in [False, True]:
+			for contiguous in [False, True]:
+				#only after the first pass
+				test_object = self.make_test_object(symmetric, contiguous, initial=5.0)
+				test_object._bound_pheromones()
+				self.assertEqual(test_object.pheromone_map[2][2], 4.0)
+				
+				test_object.first_pass = True
+				test_object._bound_pheromones()
+				self.assertEqual(test_object.pheromone_bounds, None)
+				for start in range(3):
+					for end in range(3):
+						self.assertEqual(test_object.pheromone_map[start][end], 5.0)
+				
+				#and within the bounds
+				test_object = self.make_test_object(symmetric, contiguous, initial=5.0, bounds=(1.0, 3.0))
+				test_object.first_pass = True
+				test_object._bound_pheromones()
+				self.assertEqual(test_object.pheromone_map[0][0], 3.0)
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_pheromone_scale(self):
+		module.debug = False
+		test_object = self.make_test_object(False, True, bounds=(1.0, 3.0))
+		
+		#setup test environment
+		#the pheromone amounts are half the stored values
+		test_object.pheromone_scale = .5
+		
+		#testing
+		test_object._bound_pheromones()
+		self.assertEqual(test_object.pheromone_map.tolist(), [[2.0, 2.0, 2.0], [2.0, 2.0, 3.0], [2.0, 3.0, 4.0]])
+	
+	def test_no_bounds(self):
+		module.debug = False
+		test_object = self.make_test_object(False, False)
+		test_object.first_pass = True
+		
+		#testing
+		test_object._bound_pheromones()
+		self.assertEqual(test_object.pheromone_map, [[0.0, 1.0, 2.0], [1.0, 2.0, 3.0], [2.0, 3.0, 4.0]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestAntColonyClearDeposits(unittest.TestCase):
+	def test_correct(self):
+		module.debug = False
+		
+		#testing
+		for symmetric in [False, True]:
+			for contiguous in [False, True]:
+				test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, symmetric=symmetric, pheromone_constant=3.0)
+				test_object.ant_updated_pheromone_map = test_object._new_matrix(4, contiguous=contiguous)
+				matrix = test_object.ant_updated_pheromone_map
+				ants = [module._tour([0, 1, 2, 3], 2.0), module._tour([0, 2, 1, 3], 3.0)]
+				test_object._deposit_pheromones(ants)
+				self.assertAlmostEqual(matrix[1][2], 1.5 + 1.0)
+				
+				test_object._clear_deposits(ants)
+				#the same matrix, with every cell back to 0
+				self.assertTrue(test_object.ant_updated_pheromone_map is matrix)
+				for start in range(4):
+					for end in range(4):
+						self.assertEqual(matrix[start][end], 0.0)
+				self.assertEqual(test_object.deposited_cells, None)
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_only_deposited_cells(self):
+		module.debug = False
+		test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1)
+		
+		#setup test environment
+		test_object.ant_updated_pheromone_map = test_object._new_matrix(4, contiguous=True)
+		#a cell outside deposited_cells is left alone
+		test_object.ant_updated_pheromone_map[3][3] = 5.0
+		test_object.ant_updated_pheromone_map[0][1] = 1.0
+		test_object.deposited_cells = module.numpy.array([1], dtype=module.numpy.intp)
+		
+		#testing
+		test_object._clear_deposits([])
+		self.assertEqual(test_object.ant_updated_pheromone_map[0][1], 0.0)
+		self.assertEqual(test_object.ant_updated_pheromone_map[3][3], 5.0)
+		
+		#if they are not known, all of them are cleared
+		test_object._clear_deposits([])
+		self.assertEqual(test_object.ant_updated_pheromone_map[3][3], 0.0)
+	
+	def test_mainloop_list_storage(self):
+		module.debug = False
+		numpy = module.numpy
+		
+		#testing
+		#without numpy, the matrices are lists (or rows of array.array), cleared along the routes of the ants' tours
+		#	which have to be read before the ants are reset for the next iteration
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(12)}
+		try:
+			module.numpy = None
+			for options in [{}, {'symmetric': True}, {'dtype': 'float32'}]:
+				test_object = module.ant_colony(testing_nodes, module.euclidean_distance, ant_count=4, iterations=3, **options)
+				route = test_object.mainloop()
+				self.assertEqual(sorted(route), sorted(testing_nodes))
+				for start in range(12):
+					for end in range(12):
+						self.assertEqual(test_object.ant_updated_pheromone_map[start][end], 0.0)
+		finally:
+			module.numpy = numpy
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+@unittest.skipIf(module.numpy is None, "requires numpy")
+class TestAntColonyConstructToursBatched(unittest.TestCase):
+	def make_test_object(self, candidates=None):
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		#5 nodes on a line
+		test_object.nodes = {x: x for x in range(5)}
+		test_object.ant_count = 3
+		test_object.start = 0
+		test_object.candidates = candidates
+		test_object.seed = None
+		test_object.update_strategy = module.ant_system()
+		test_object.initial_pheromone_amount = None
+		test_object.iteration = 0
+		test_object.dense_distances = module.numpy.array([[abs(x - y) for y in range(5)] for x in range(5)], dtype=float)
+		return test_object
+	
+	def test_first_pass(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		test_object.first_pass = True
+		
+		#testing
+		tours = test_object._construct_tours_batched()
+		self.assertEqual(len(tours), 3)
+		for tour in tours:
+			route = tour.get_route()
+			self.assertEqual(route[0], 0)
+			self.assertEqual(sorted(route), [0, 1, 2, 3, 4])
+			self.assertEqual(tour.get_distance_traveled(), sum([abs(route[x] - route[x+1]) for x in range(4)]))
+	
+	def test_follows_choice_info(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		test_object.first_pass = False
+		
+		#setup test environment
+		#only the steps to the next node along the line have any weight
+		test_object.choice_info = module.numpy.zeros((5, 5))
+		for x in range(4):
+			test_object.choice_info[x][x+1] = 1.0
+		
+		#testing
+		for tour in test_object._construct_tours_batched():
+			self.assertEqual(tour.get_route(), [0, 1, 2, 3, 4])
+			self.assertEqual(tour.get_distance_traveled(), 4.0)
+	
+	def test_candidates(self):
+		module.debug = False
+		#each node only has the one before it as a candidate
+		test_object = self.make_test_object(candidates=[[1]] + [[x - 1] for x in range(1, 5)])
+		test_object.first_pass = False
+		
+		#setup test environment
+		test_object.choice_info = module.numpy.ones((5, 5))
+		
+		#testing
+		#the candidate of 0 is 1, then the candidates are visited, so the nearest unvisited node is taken
+		for tour in test_object._construct_tours_batched():
+			self.assertEqual(tour.get_route(), [0, 1, 2, 3, 4])
+	
+	def test_zero_weights(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		test_object.first_pass = False
+		
+		#setup test environment
+		#all weights rounded down to zero, then any unvisited node is as likely
+		test_object.choice_info = module.numpy.zeros((5, 5))
+		
+		#testing
+		for tour in test_object._construct_tours_batched():
+			self.assertEqual(sorted(tour.get_route()), [0, 1, 2, 3, 4])
+	
+	def test_greedy(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		test_object.first_pass = False
+		
+		#setup test environment
+		#practically always the most attractive step, the nearest node
+		test_object.update_strategy = module.ant_colony_system(q0=.999999)
+		test_object.seed = 1
+		test_object.choice_info = module.numpy.array([[1.0 / (1 + abs(x - y)) for y in range(5)] for x in range(5)])
+		
+		#testing
+		for tour in test_object._construct_tours_batched():
+			self.assertEqual(tour.get_route(), [0, 1, 2, 3, 4])
+	
+	def test_mainloop(self):
+		module.debug = False
+		
+		#testing
+		testing_nodes = {x: (x % 4, x // 4) for x in range(12)}
+		for distance_callback in ['euclidean', module.euclidean_distance]:
+			test_object = module.ant_colony(testing_nodes, distance_callback, ant_count=5, iterations=5, backend='batched')
+			route = test_object.mainloop()
+			self.assertEqual(sorted(route), sorted(testing_nodes))
+	
+	def test_seed(self):
+		module.debug = False
+		
+		#testing
+		#a seeded run gives the same result every time, and on either backend
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(15)}
+		for options in [{}, {'candidate_count': 3}, {'symmetric': True}]:
+			runs = []
+			for backend in ['threads', 'batched', 'threads', 'batched']:
+				test_object = module.ant_colony(testing_nodes, module.euclidean_distance, ant_count=6, iterations=4, backend=backend, seed=11, **options)
+				route = test_object.mainloop()
+				runs.append((route, test_object.shortest_distance, test_object._dense_matrix(test_object.pheromone_map).tolist()))
+			for run in runs[1:]:
+				self.assertEqual(run, runs[0])
+	
+	def test_seed_distances(self):
+		module.debug = False
+		
+		#setup test environment
+		calls = []
+		def testing_distance_callback(start, end):
+			calls.append((start, end))
+			return module.euclidean_distance(start, end)
+		
+		#testing
+		#with a seed, all distances are computed by the first iteration, not when the colony is created
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(15)}
+		test_object = module.ant_colony(testing_nodes, testing_distance_callback, ant_count=6, iterations=4, seed=11)
+		self.assertEqual(calls, [])
+		test_object._iterate()
+		self.assertTrue(test_object.distance_computed.all())
+		self.assertTrue(test_object.choice_info is not None)
+	
+	def test_seed_invalid(self):
+		module.debug = False
+		
+		#testing
+		with self.assertRaises(TypeError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', seed='11')
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', seed=-1)
+	
+	def test_backend_invalid(self):
+		module.debug = False
+		
+		#testing
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', backend='fibers')
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', backend='batched', distance_rows=1)
+
+if __name__ == '__main__':
+    unittest.main()
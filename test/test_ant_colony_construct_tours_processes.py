@@ -0,0 +1,119 @@
+import unittest
+import importlib
+import asyncio
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+@unittest.skipIf(module.numpy is None, "requires numpy")
+class TestAntColonyConstructToursProcesses(unittest.TestCase):
+	def test_mainloop(self):
+		module.debug = False
+		
+		#testing
+		testing_nodes = {x: (x % 4, x // 4) for x in range(12)}
+		test_object = module.ant_colony(testing_nodes, 'euclidean', ant_count=5, iterations=3, backend='processes', workers=2)
+		route = test_object.mainloop()
+		self.assertEqual(sorted(route), sorted(testing_nodes))
+		self.assertEqual(len(test_object.shortest_path_seen), 12)
+		
+		#the pool and the shared memory are let go at the end of mainloop()
+		self.assertEqual(test_object.process_pool, None)
+		self.assertEqual(test_object.process_segments, None)
+	
+	def test_stopped_on_error(self):
+		module.debug = False
+		
+		class test_failing_object(module.ant_colony):
+			def _update_choice_info(self):
+				if self.iteration == 1:
+					raise KeyError("broken iteration")
+				module.ant_colony._update_choice_info(self)
+		
+		#testing
+		#the pool and the shared memory are let go when an iteration raises as well
+		testing_nodes = {x: (x % 4, x // 4) for x in range(12)}
+		for run in ['mainloop', 'mainloop_async']:
+			test_object = test_failing_object(testing_nodes, 'euclidean', ant_count=5, iterations=3, backend='processes', workers=2)
+			with self.assertRaises(KeyError):
+				if run == 'mainloop':
+					test_object.mainloop()
+				else:
+					asyncio.run(test_object.mainloop_async())
+			self.assertEqual(test_object.iteration, 1)
+			self.assertEqual(test_object.process_pool, None)
+			self.assertEqual(test_object.process_segments, None)
+	
+	def test_tours(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start): pass
+		
+		#testing
+		#5 nodes on a line
+		test_object = test_empty_object({x: (x, 0) for x in range(5)}, 'euclidean', ant_count=3, backend='processes', workers=2)
+		try:
+			tours = test_object._construct_tours_processes()
+			self.assertEqual(test_object.process_arrays['routes'].dtype, module.numpy.int32)
+		finally:
+			test_object._stop_processes()
+		
+		self.assertEqual(len(tours), 3)
+		for tour in tours:
+			route = tour.get_route()
+			self.assertEqual(route[0], 0)
+			self.assertEqual(sorted(route), [0, 1, 2, 3, 4])
+			self.assertEqual(tour.get_distance_traveled(), sum([abs(route[x] - route[x+1]) for x in range(4)]))
+	
+	def test_weights(self):
+		module.debug = False
+		
+		#testing
+		#the workers choose by choice_info as the colony computed it, shared in place of the pheromones
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(9)}
+		for options in [{}, {'symmetric': True}, {'dtype': 'float32'}]:
+			test_object = module.ant_colony(testing_nodes, module.euclidean_distance, ant_count=4, iterations=2, backend='processes', workers=2, **options)
+			try:
+				test_object._iterate()
+				test_object._construct_tours_processes()
+				self.assertFalse('pheromones' in test_object.process_arrays)
+				weights = test_object.process_arrays['weights']
+				self.assertEqual(weights.dtype, module.numpy.dtype(test_object.pheromone_typecode))
+				self.assertEqual(weights.tolist(), module.numpy.array(test_object._dense_matrix(test_object.choice_info), dtype=weights.dtype).tolist())
+			finally:
+				test_object._stop_processes()
+	
+	def test_seed(self):
+		module.debug = False
+		
+		#testing
+		#a seeded run gives the same result as the batched backend, however the ants are split between the workers
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(15)}
+		for options in [{}, {'candidate_count': 3}, {'symmetric': True}, {'dtype': 'float32'}]:
+			runs = []
+			for backend, workers in [('batched', 1), ('processes', 1), ('processes', 3)]:
+				test_object = module.ant_colony(testing_nodes, module.euclidean_distance, ant_count=6, iterations=4, backend=backend, seed=11, workers=workers, **options)
+				route = test_object.mainloop()
+				runs.append((route, test_object.shortest_distance, test_object._dense_matrix(test_object.pheromone_map).tolist()))
+			for run in runs[1:]:
+				self.assertEqual(run, runs[0])
+	
+	def test_workers_invalid(self):
+		module.debug = False
+		
+		#testing
+		with self.assertRaises(TypeError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', workers='2')
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', workers=0)
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', backend='processes', distance_rows=1)
+
+if __name__ == '__main__':
+    unittest.main()
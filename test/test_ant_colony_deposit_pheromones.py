@@ -0,0 +1,78 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestAntColonyDepositPheromones(unittest.TestCase):
+	def test_correct(self):
+		module.debug = False
+		
+		#testing
+		for symmetric in [False, True]:
+			test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, symmetric=symmetric, pheromone_constant=3.0)
+			test_object.ant_updated_pheromone_map = test_object._new_matrix(4, contiguous=False)
+			test_object._deposit_pheromones([module._tour([0, 1, 2, 3], 2.0), module._tour([0, 2, 1, 3], 3.0), module._tour([3, 2, 1, 0], 7.0)])
+			#1.5 from the first ant, 1.0 from the second, 3/7 from the third
+			self.assertAlmostEqual(test_object.ant_updated_pheromone_map[1][2], 1.5 + 1.0 + 3.0/7)
+			self.assertAlmostEqual(test_object.ant_updated_pheromone_map[2][1], 1.5 + 1.0 + 3.0/7)
+			self.assertAlmostEqual(test_object.ant_updated_pheromone_map[0][2], 1.0)
+			self.assertAlmostEqual(test_object.ant_updated_pheromone_map[3][0], 0.0)
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_contiguous(self):
+		module.debug = False
+		
+		#setup test environment
+		ants = [module._tour([0, 1, 2, 3], 2.0), module._tour([0, 2, 1, 3], 3.0), module._tour([3, 2, 1, 0], 7.0)]
+		
+		#testing
+		#all routes at once, the same sums as one ant at a time
+		for symmetric in [False, True]:
+			expected = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, symmetric=symmetric, pheromone_constant=3.0)
+			expected.ant_updated_pheromone_map = expected._new_matrix(4, contiguous=False)
+			for ant in ants:
+				expected._populate_ant_updated_pheromone_map(ant)
+			
+			test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, symmetric=symmetric, pheromone_constant=3.0)
+			test_object.ant_updated_pheromone_map = test_object._new_matrix(4, contiguous=True)
+			test_object._deposit_pheromones(ants)
+			for start in range(4):
+				for end in range(4):
+					self.assertEqual(test_object.ant_updated_pheromone_map[start][end], expected.ant_updated_pheromone_map[start][end])
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_update_pheromone_map(self):
+		module.debug = False
+		test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, pheromone_constant=3.0, pheromone_evaporation_coefficient=.5)
+		
+		#setup test environment
+		test_object.ant_updated_pheromone_map = test_object._new_matrix(4, contiguous=True)
+		test_object.pheromone_map = test_object._new_matrix(4, value=2.0, contiguous=True)
+		test_object._deposit_pheromones([module._tour([0, 1, 2, 3], 2.0)])
+		self.assertEqual(sorted(test_object.deposited_cells.tolist()), [1, 4, 6, 9, 11, 14])
+		
+		#testing
+		#only pheromone_scale decays, the deposits are added relative to it
+		test_object._update_pheromone_map()
+		self.assertEqual(test_object.pheromone_scale, .5)
+		self.assertEqual(test_object.pheromone_map[1][2], 5.0)
+		self.assertEqual(test_object.pheromone_map[3][0], 2.0)
+		
+		#folded back into the stored values, once pheromone_scale falls below pheromone_scale_floor
+		test_object.deposited_cells = module.numpy.array([], dtype=module.numpy.intp)
+		for iteration in range(38):
+			test_object._update_pheromone_map()
+		self.assertEqual(test_object.pheromone_scale, .5**39)
+		test_object._update_pheromone_map()
+		self.assertEqual(test_object.pheromone_scale, 1.0)
+		self.assertEqual(test_object.pheromone_map[1][2], 5.0*.5**40)
+		self.assertEqual(test_object.pheromone_map[3][0], 2.0*.5**40)
+
+if __name__ == '__main__':
+    unittest.main()
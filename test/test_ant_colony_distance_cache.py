@@ -0,0 +1,120 @@
+import unittest
+import importlib
+import tempfile
+import shutil
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir) 
+
+import ant_colony as module
+
+def distance_callback_at_module_level(start, end):
+	return 1
+
+class TestAntColonyDistanceCache(unittest.TestCase):
+	def setUp(self):
+		self.cache_dir = tempfile.mkdtemp()
+		self.distance_cache = os.path.join(self.cache_dir, 'distances.sqlite')
+	
+	def tearDown(self):
+		shutil.rmtree(self.cache_dir)
+	
+	def test_correct(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		self.calls = []
+		def testing_distance_callback(start, end):
+			self.calls.append((start, end))
+			return abs(start[0] - end[0])
+		
+		#first run, everything is computed
+		test_object = test_empty_object({'a': (0,), 'b': (5,)}, testing_distance_callback, distance_cache=self.distance_cache, distance_cache_key='testing')
+		self.assertEqual(test_object._get_distance(0, 1), 5)
+		self.assertEqual(test_object._get_distance(1, 0), 5)
+		self.assertEqual(len(self.calls), 2)
+		test_object._save_distance_cache()
+		test_object.distance_cache.close()
+		
+		#second run over an overlapping set of nodes (under different names), only the new pairs are computed
+		self.calls = []
+		test_object = test_empty_object({'x': (5,), 'y': (0,), 'z': (9,)}, testing_distance_callback, distance_cache=self.distance_cache, distance_cache_key='testing')
+		self.assertEqual(test_object.distance_cache_loaded, 2)
+		self.assertEqual(test_object._get_distance(0, 1), 5)
+		self.assertEqual(test_object._get_distance(1, 0), 5)
+		self.assertEqual(self.calls, [])
+		self.assertEqual(test_object._get_distance(0, 2), 4)
+		self.assertEqual(self.calls, [((5,), (9,))])
+		self.assertEqual(test_object.get_distance_cache_stats()['loaded'], 2)
+		test_object.distance_cache.close()
+		
+		#cleanup
+		del self.calls
+	
+	def test_distance_cache_key(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		def testing_distance_callback(start, end):
+			return 1
+		
+		#testing
+		#named after a function defined at the top of a module
+		test_object = test_empty_object({0: (0,), 1: (1,)}, distance_callback_at_module_level, distance_cache=self.distance_cache)
+		self.assertTrue(test_object.distance_cache_key.endswith('.distance_callback_at_module_level'))
+		test_object._get_distance(0, 1)
+		test_object._save_distance_cache()
+		test_object.distance_cache.close()
+		
+		#distances of another metric are not shared
+		test_object = test_empty_object({0: (0,), 1: (1,)}, testing_distance_callback, distance_cache=self.distance_cache, distance_cache_key='other')
+		self.assertEqual(test_object.distance_cache_loaded, 0)
+		test_object.distance_cache.close()
+		
+		with self.assertRaisesRegex(TypeError, 'distance_cache_key must be str'):
+			test_empty_object({0: (0,)}, testing_distance_callback, distance_cache=self.distance_cache, distance_cache_key=1)
+	
+	def test_distance_cache_key_required(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		def testing_distance_callback(start, end):
+			return abs(start[0] - end[0])
+		
+		class testing_callable_object:
+			def __call__(self, start, end):
+				return 1
+		
+		#testing
+		#every lambda (or nested function) of a module would get the same name, whatever it computes
+		for distance_callback in [lambda start, end: 1, testing_distance_callback, testing_callable_object()]:
+			with self.assertRaisesRegex(ValueError, 'distance_cache_key'):
+				test_empty_object({0: (0,), 1: (1,)}, distance_callback, distance_cache=self.distance_cache)
+			#unless named by distance_cache_key, or without distance_cache
+			test_object = test_empty_object({0: (0,), 1: (1,)}, distance_callback, distance_cache=self.distance_cache, distance_cache_key='testing')
+			test_object.distance_cache.close()
+			test_empty_object({0: (0,), 1: (1,)}, distance_callback)
+		
+		#so the distances of two lambdas are never mixed up
+		manhattan = lambda start, end: float(sum([abs(a - b) for a, b in zip(start, end)]))
+		euclidean = lambda start, end: module.euclidean_distance(start, end)
+		test_object = test_empty_object({0: (0, 0), 1: (3, 4)}, manhattan, distance_cache=self.distance_cache, distance_cache_key='manhattan')
+		self.assertEqual(test_object._get_distance(0, 1), 7.0)
+		test_object._save_distance_cache()
+		test_object.distance_cache.close()
+		test_object = test_empty_object({0: (0, 0), 1: (3, 4)}, euclidean, distance_cache=self.distance_cache, distance_cache_key='euclidean')
+		self.assertEqual(test_object.distance_cache_loaded, 0)
+		self.assertEqual(test_object._get_distance(0, 1), 5.0)
+		test_object.distance_cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
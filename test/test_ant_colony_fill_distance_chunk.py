@@ -0,0 +1,131 @@
+import unittest
+import importlib
+import tempfile
+import shutil
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir) 
+
+import ant_colony as module
+
+@unittest.skipIf(module.numpy is None, "requires numpy")
+class TestAntColonyFillDistanceChunk(unittest.TestCase):
+	def setUp(self):
+		self.memmap_dir = tempfile.mkdtemp()
+		#small chunks, so that the test nodes span several of them
+		self.chunk_cells_backup = module.chunk_cells
+		module.chunk_cells = 8
+	
+	def tearDown(self):
+		module.chunk_cells = self.chunk_cells_backup
+		shutil.rmtree(self.memmap_dir)
+	
+	def test_metric_populated_by_chunk(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		testing_nodes = {x: (x, 0) for x in range(6)}
+		
+		#testing
+		test_object = test_empty_object(testing_nodes, 'manhattan', memmap_dir=self.memmap_dir)
+		self.assertTrue(isinstance(test_object.distance_matrix, module.numpy.memmap))
+		self.assertFalse(test_object.distance_computed[0])
+		
+		#8 cells per chunk -> 1 row of 6 nodes per chunk, so only row 2 is populated
+		self.assertEqual(test_object._get_distance(2, 5), 3.0)
+		self.assertEqual([test_object.distance_computed[x] for x in range(36)], [12 <= x < 18 for x in range(36)])
+		self.assertEqual(list(test_object.distance_matrix[2]), [2.0, 1.0, 0.0, 1.0, 2.0, 3.0])
+		
+		#the rest of the row is then served from the memmap
+		self.assertEqual(test_object._get_distance(2, 0), 2.0)
+		self.assertEqual(test_object.get_distance_cache_stats()['misses'], 1)
+	
+	def test_symmetric_callback_populated_by_chunk(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		testing_nodes = {x: x for x in range(6)}
+		
+		self.calls = []
+		def testing_distance_callback(start, end):
+			self.calls.append((start, end))
+			return abs(start - end)
+		
+		#testing
+		test_object = test_empty_object(testing_nodes, testing_distance_callback, symmetric=True, memmap_dir=self.memmap_dir)
+		
+		#8 cells per chunk -> 1 row per chunk, the distance from 1 to 4 is held in row 4 of the packed triangle
+		#	which only needs the columns up to 4
+		self.assertEqual(test_object._get_distance(1, 4), 3)
+		self.assertEqual(self.calls, [(4, 0), (4, 1), (4, 2), (4, 3), (4, 4)])
+		self.assertEqual(test_object._get_distance(4, 2), 2)
+		self.assertEqual(test_object._get_distance(0, 4), 4)
+		self.assertEqual(len(self.calls), 5)
+		
+		#cleanup
+		del self.calls
+	
+	def test_pheromones_memmapped(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		#testing
+		test_object = test_empty_object({x: (x, 0) for x in range(3)}, 'euclidean', memmap_dir=self.memmap_dir, memmap_pheromones=True)
+		self.assertTrue(isinstance(test_object.pheromone_map, module.numpy.memmap))
+		self.assertEqual(os.path.dirname(test_object.pheromone_map.filename), os.path.realpath(self.memmap_dir))
+		self.assertTrue(os.path.basename(test_object.pheromone_map.filename).startswith('pheromone_map_'))
+		
+		test_object.pheromone_map[:] = 1.0
+		test_object.ant_updated_pheromone_map[0][1] = 2.0
+		test_object.pheromone_evaporation_coefficient = .5
+		test_object._update_pheromone_map()
+		#the decay is kept in pheromone_scale until folded into the stored values
+		self.assertEqual(test_object.pheromone_scale, .5)
+		test_object._apply_pheromone_scale()
+		self.assertEqual(test_object.pheromone_map.tolist(), [[.5, 2.5, .5], [.5, .5, .5], [.5, .5, .5]])
+	
+	def test_shared_memmap_dir(self):
+		module.debug = False
+		
+		#testing
+		#each colony has files of its own, a second one in the same directory leaves the first one's distances alone
+		first = module.ant_colony({x: (x, 0) for x in range(30)}, 'manhattan', ant_count=2, iterations=2, memmap_dir=self.memmap_dir, memmap_pheromones=True)
+		self.assertEqual(first._get_distance(25, 27), 2.0)
+		second = module.ant_colony({x: (x, 0) for x in range(3)}, 'manhattan', ant_count=2, iterations=2, memmap_dir=self.memmap_dir, memmap_pheromones=True)
+		self.assertEqual(len(os.listdir(self.memmap_dir)), 6)
+		self.assertEqual(first._get_distance(25, 27), 2.0)
+		self.assertEqual(first._get_distance(28, 21), 7.0)
+		
+		#and removes them when it finishes
+		second.mainloop()
+		self.assertEqual(sorted(os.listdir(self.memmap_dir)), sorted([os.path.basename(path) for path in first.memmap_files]))
+		first.mainloop()
+		self.assertEqual(os.listdir(self.memmap_dir), [])
+		self.assertEqual(first.memmap_files, [])
+		#while the matrices are still mapped
+		self.assertEqual(first._get_distance(25, 27), 2.0)
+	
+	def test_memmap_invalid(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		#testing
+		with self.assertRaisesRegex(ValueError, 'memmap_dir must be an existing directory'):
+			test_empty_object({0: (0, 0)}, 'euclidean', memmap_dir=os.path.join(self.memmap_dir, 'missing'))
+		
+		with self.assertRaisesRegex(ValueError, 'memmap_pheromones requires memmap_dir'):
+			test_empty_object({0: (0, 0)}, 'euclidean', memmap_pheromones=True)
+
+if __name__ == '__main__':
+    unittest.main()
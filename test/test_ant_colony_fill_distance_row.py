@@ -0,0 +1,151 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir) 
+
+import ant_colony as module
+
+class TestAntColonyFillDistanceRow(unittest.TestCase):
+	def test_correct(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			#def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.distance_matrix = [[0.0 for x in range(4)] for y in range(4)]
+		test_object.nodes = {x: x*10 for x in range(4)}
+		test_object.distance_batch = True
+		test_object.distance_typecode = 'd'
+		test_object.distance_rows = None
+		test_object.symmetric = False
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
+		test_object.distance_computed = module.bitmap(16)
+		test_object.distance_cache_hits = 0
+		test_object.distance_cache_misses = 0
+		
+		self.calls = []
+		def mock_distance_callback(starts, ends):
+			self.calls.append((starts, ends))
+			return [abs(start - end) for start, end in zip(starts, ends)]
+		
+		test_object.distance_callback = mock_distance_callback
+		
+		#testing
+		#a single call fills the whole row
+		self.assertEqual(test_object._get_distance(1, 3), 20)
+		self.assertEqual(self.calls, [([10, 10, 10, 10], [0, 10, 20, 30])])
+		self.assertEqual(test_object.distance_matrix[1], [10.0, 0.0, 10.0, 20.0])
+		
+		#the rest of the row is then served from distance_matrix
+		self.assertEqual(test_object._get_distance(1, 0), 10)
+		self.assertEqual(test_object._get_distance(1, 1), 0)
+		self.assertEqual(len(self.calls), 1)
+		
+		#later rows only ask for the distances not yet computed
+		test_object.distance_matrix[2][0] = 20.0
+		test_object.distance_computed.set(8)
+		self.assertEqual(test_object._get_distance(2, 3), 10)
+		self.assertEqual(self.calls[1], ([20, 20, 20], [10, 20, 30]))
+		
+		#cleanup
+		del self.calls
+	
+	def test_distance_callback_returns_other_than_int_or_float(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.distance_matrix = [[0.0 for x in range(3)] for y in range(3)]
+		test_object.nodes = {x: x for x in range(3)}
+		test_object.distance_batch = True
+		test_object.distance_typecode = 'd'
+		test_object.distance_rows = None
+		test_object.distance_cache = None
+		test_object.symmetric = False
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
+		test_object.distance_computed = module.bitmap(9)
+		
+		def mock_distance_callback(starts, ends):
+			return [1, 'a', 2]
+		
+		test_object.distance_callback = mock_distance_callback
+		
+		#testing
+		with self.assertRaisesRegex(TypeError, 'distance_callback should return a sequence of int or float'):
+			test_object._fill_distance_row(0)
+	
+	def test_distance_callback_returns_wrong_count(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.distance_matrix = [[0.0 for x in range(3)] for y in range(3)]
+		test_object.nodes = {x: x for x in range(3)}
+		test_object.distance_batch = True
+		test_object.distance_typecode = 'd'
+		test_object.distance_rows = None
+		test_object.distance_cache = None
+		test_object.symmetric = False
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
+		test_object.distance_computed = module.bitmap(9)
+		
+		def mock_distance_callback(starts, ends):
+			return [1, 2]
+		
+		test_object.distance_callback = mock_distance_callback
+		
+		#testing
+		with self.assertRaisesRegex(ValueError, 'distance_callback should return 3 distances'):
+			test_object._fill_distance_row(0)
+	
+	def test_distance_batch_invalid(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		def test_distance_callback(starts, ends):
+			pass
+		
+		#testing
+		with self.assertRaisesRegex(TypeError, 'distance_batch must be bool'):
+			test_empty_object({0: 0}, test_distance_callback, distance_batch=1)
+		
+		with self.assertRaisesRegex(ValueError, 'distance_batch can not be used with a built-in metric'):
+			test_empty_object({0: (0, 0)}, 'euclidean', distance_batch=True)
+
+if __name__ == '__main__':
+    unittest.main()
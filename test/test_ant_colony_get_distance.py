@@ -43,11 +43,65 @@ class TestAntColonyGetDistance(unittest.TestCase):
 		test_object.distance_callback = mock_distance_callback
 		
 		test_object.nodes = {x:x for x in range(10)}
+		test_object.distance_batch = False
+		test_object.distance_typecode = 'd'
+		test_object.distance_rows = None
+		test_object.symmetric = False
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
+		test_object.distance_computed = module.bitmap(100)
+		test_object.distance_cache_hits = 0
+		test_object.distance_cache_misses = 0
 		
 		#testing
 		self.assertEqual(test_object._get_distance(0, 1), 1)
 		self.assertEqual(test_object.distance_matrix[0][1], 1)
 		
+	def test_zero_distance_is_cached(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			#def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, count, start=0): pass
+			def _add_pheromone_value(self, route, pheromone_values): pass
+			def _dissipate_pheromones(self): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.distance_matrix = [[0.0 for x in range(2)] for y in range(2)]
+		
+		self.calls = 0
+		def mock_distance_callback(start, end):
+			self.calls += 1
+			return 0
+		
+		test_object.distance_callback = mock_distance_callback
+		
+		#both nodes at the same location
+		test_object.nodes = {0: (1, 1), 1: (1, 1)}
+		test_object.distance_batch = False
+		test_object.distance_typecode = 'd'
+		test_object.distance_rows = None
+		test_object.symmetric = False
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
+		test_object.distance_computed = module.bitmap(4)
+		test_object.distance_cache_hits = 0
+		test_object.distance_cache_misses = 0
+		test_object.distance_cache_loaded = 0
+		
+		#testing
+		for x in range(3):
+			self.assertEqual(test_object._get_distance(0, 1), 0)
+		self.assertEqual(self.calls, 1)
+		self.assertEqual(test_object.get_distance_cache_stats(), {'hits': 2, 'misses': 1, 'hit_rate': 2/3.0, 'loaded': 0})
+		
+		#cleanup
+		del self.calls
+		
 	def test_distance_callback_returns_other_than_int_or_float(self):
 		module.debug = False
 		
@@ -81,6 +135,15 @@ class TestAntColonyGetDistance(unittest.TestCase):
 		test_object.distance_callback = mock_distance_callback
 		
 		test_object.nodes = {x:x for x in range(10)}
+		test_object.distance_batch = False
+		test_object.distance_typecode = 'd'
+		test_object.distance_rows = None
+		test_object.symmetric = False
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
+		test_object.distance_computed = module.bitmap(100)
+		test_object.distance_cache_hits = 0
+		test_object.distance_cache_misses = 0
 		
 		#testing
 		#testing
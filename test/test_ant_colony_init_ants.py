@@ -25,7 +25,7 @@ class TestAntColonyInitAnts(unittest.TestCase):
 		
 		#setup test environment
 		class mock_ant:
-			def __init__(self, *args):
+			def __init__(self, *args, **kwargs):
 				self.ant_init_called = True
 			
 		ant_backup = test_object.ant
@@ -35,6 +35,15 @@ class TestAntColonyInitAnts(unittest.TestCase):
 		test_object.pheromone_map = []
 		test_object.alpha = 0
 		test_object.beta = 0
+		test_object.candidates = None
+		test_object.distance_rows = None
+		test_object.distance_precomputed = False
+		test_object.choice_info = None
+		test_object.choice_cumulative = None
+		test_object.seed = None
+		test_object.update_strategy = module.ant_system()
+		test_object.initial_pheromone_amount = None
+		test_object.ant_count = 1
 		
 		#testing
 		test_object._init_ants(start=0)
@@ -56,7 +65,7 @@ class TestAntColonyInitAnts(unittest.TestCase):
 		
 		#setup test environment
 		class mock_ant:
-			def __init__(self, init_location, possible_locations, pheromone_map, distance_callback, alpha, beta, first_pass=False):
+			def __init__(self, init_location, possible_locations, pheromone_map, distance_callback, alpha, beta, first_pass=False, candidates=None, distances_callback=None, choice_info=None, choice_cumulative=None, stream=None, q0=0.0, local_update=None):
 				self.first_pass = first_pass
 				
 			def is_mock_ant(self):
@@ -70,6 +79,14 @@ class TestAntColonyInitAnts(unittest.TestCase):
 		test_object.pheromone_map = []
 		test_object.alpha = 0
 		test_object.beta = 0
+		test_object.candidates = None
+		test_object.distance_rows = None
+		test_object.distance_precomputed = False
+		test_object.choice_info = None
+		test_object.choice_cumulative = None
+		test_object.seed = None
+		test_object.update_strategy = module.ant_system()
+		test_object.initial_pheromone_amount = None
 		
 		#testing
 		#this messes up on assertEqual() as they're not the same object, but the same type of object
@@ -0,0 +1,85 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir) 
+
+import ant_colony as module
+
+class TestAntColonyInitCandidates(unittest.TestCase):
+	def test_grid(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		#a 10x10 grid of nodes, one unit apart, plus one node far away
+		test_object.nodes = {x: (x % 10, x // 10) for x in range(100)}
+		test_object.nodes[100] = (50, 50)
+		test_object.distance_metric = 'manhattan'
+		
+		#testing
+		candidates = test_object._init_candidates(4)
+		self.assertEqual(len(candidates), 101)
+		#the corner node has its 2 neighbours at 1, then 3 nodes at 2
+		self.assertEqual(candidates[0][:2], [1, 10])
+		self.assertTrue(candidates[0][2] in [2, 11, 20])
+		#inner nodes have their 4 direct neighbours
+		self.assertEqual(sorted(candidates[55]), [45, 54, 56, 65])
+		#the far away node still finds the nearest ones
+		self.assertEqual(candidates[100][0], 99)
+	
+	def test_from_distances(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.nodes = {x: x for x in range(5)}
+		test_object.distance_metric = None
+		test_object.distance_precomputed = False
+		
+		def mock_get_distance(start, end):
+			return (end - start) % 5
+		
+		test_object._get_distance = mock_get_distance
+		
+		#testing
+		self.assertEqual(test_object._init_candidates(2), [[1, 2], [2, 3], [3, 4], [4, 0], [0, 1]])
+	
+	def test_candidate_count_invalid(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		def test_distance_callback(start, end):
+			pass
+		
+		#testing
+		with self.assertRaisesRegex(TypeError, 'candidate_count must be int'):
+			test_empty_object({0: 0}, test_distance_callback, candidate_count=1.5)
+		
+		with self.assertRaisesRegex(ValueError, 'candidate_count must be >= 1'):
+			test_empty_object({0: 0}, test_distance_callback, candidate_count=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestAntColonyLocalUpdate(unittest.TestCase):
+	def test_correct(self):
+		module.debug = False
+		
+		#testing
+		for symmetric in [False, True]:
+			for contiguous in [False, True]:
+				test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, symmetric=symmetric, update_strategy=module.ant_colony_system(local_evaporation=.5))
+				test_object.initial_pheromone_amount = 1.0
+				test_object.pheromone_map = test_object._new_matrix(4, value=5.0, contiguous=contiguous)
+				test_object._local_update([module._tour([0, 1, 2, 3], 9.0), module._tour([0, 2, 1, 3], 9.0)])
+				#taken twice (both ways), half way back to 1.0 each time
+				self.assertAlmostEqual(test_object.pheromone_map[1][2], 2.0)
+				self.assertAlmostEqual(test_object.pheromone_map[2][1], 2.0)
+				#taken once
+				self.assertAlmostEqual(test_object.pheromone_map[0][1], 3.0)
+				self.assertAlmostEqual(test_object.pheromone_map[3][1], 3.0)
+				#not taken
+				self.assertAlmostEqual(test_object.pheromone_map[0][3], 5.0)
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_pheromone_scale(self):
+		module.debug = False
+		test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, update_strategy=module.ant_colony_system(local_evaporation=.5))
+		
+		#setup test environment
+		test_object.initial_pheromone_amount = 1.0
+		test_object.pheromone_map = test_object._new_matrix(4, value=5.0, contiguous=True)
+		#the pheromone amounts are half the stored values
+		test_object.pheromone_scale = .5
+		
+		#testing
+		test_object._local_update([module._tour([0, 1, 2, 3], 9.0), module._tour([0, 2, 1, 3], 9.0)])
+		self.assertAlmostEqual(test_object.pheromone_map[0][1], 3.5)
+		self.assertAlmostEqual(test_object.pheromone_map[1][2], 2.75)
+	
+	def test_off(self):
+		module.debug = False
+		
+		#testing
+		#without local_evaporation, or before the initial pheromone amount is known
+		for update_strategy, initial_pheromone_amount in [(module.ant_system(), 1.0), (module.ant_colony_system(), None)]:
+			test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, update_strategy=update_strategy)
+			test_object.initial_pheromone_amount = initial_pheromone_amount
+			test_object.pheromone_map = test_object._new_matrix(4, value=5.0)
+			test_object._local_update([module._tour([0, 1, 2, 3], 9.0), module._tour([0, 2, 1, 3], 9.0)])
+			self.assertEqual(test_object.pheromone_map, [[5.0]*4]*4)
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_local_step(self):
+		module.debug = False
+		
+		#setup test environment
+		#two ants from 0 to 1, one from 2 to 3
+		weights = module.numpy.ones((4, 4))
+		starts = module.numpy.array([0, 0, 2])
+		ends = module.numpy.array([1, 1, 3])
+		
+		#testing
+		for symmetric in [False, True]:
+			pheromones = module.numpy.full(10 if symmetric else 16, 5.0)
+			weights = module.numpy.ones((4, 4))
+			module._local_step(weights, starts, ends, pheromones, symmetric, .5, 1.0, 2.0)
+			matrix = module.symmetric_matrix(4, values=pheromones) if symmetric else pheromones.reshape(4, 4)
+			#taken twice, then half way back to 1.0 twice
+			self.assertAlmostEqual(matrix[0][1], 2.0)
+			self.assertAlmostEqual(matrix[1][0], 2.0)
+			self.assertAlmostEqual(matrix[3][2], 3.0)
+			self.assertAlmostEqual(matrix[0][2], 5.0)
+			#the weights by (tau_new / tau_old)^alpha, both ways
+			self.assertAlmostEqual(weights[0][1], (2.0/5)**2)
+			self.assertAlmostEqual(weights[1][0], (2.0/5)**2)
+			self.assertAlmostEqual(weights[2][3], (3.0/5)**2)
+			self.assertAlmostEqual(weights[3][2], (3.0/5)**2)
+			self.assertEqual(weights[0][2], 1.0)
+	
+	def test_local_update_step(self):
+		module.debug = False
+		
+		#testing
+		#as an ant of the threads backend takes each step
+		for symmetric in [False, True]:
+			for contiguous in [False, True]:
+				test_object = module.ant_colony({x: (x, 0) for x in range(4)}, 'euclidean', ant_count=1, alpha=1.0, symmetric=symmetric, update_strategy=module.ant_colony_system(local_evaporation=.5))
+				test_object.initial_pheromone_amount = 1.0
+				test_object.pheromone_map = test_object._new_matrix(4, value=5.0, contiguous=contiguous)
+				if module.numpy is not None and contiguous:
+					test_object.choice_info = test_object._new_matrix(4, value=1.0, contiguous=True)
+				test_object._local_update_step(0, 1)
+				test_object._local_update_step(1, 0)
+				self.assertAlmostEqual(test_object.pheromone_map[0][1], 2.0)
+				self.assertAlmostEqual(test_object.pheromone_map[1][0], 2.0)
+				self.assertAlmostEqual(test_object.pheromone_map[0][2], 5.0)
+				if test_object.choice_info is not None:
+					self.assertAlmostEqual(test_object.choice_info[0][1], 2.0/5)
+					self.assertAlmostEqual(test_object.choice_info[1][0], 2.0/5)
+					self.assertAlmostEqual(test_object.choice_info[0][2], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,7 @@ class TestAntColonyMainLoop(unittest.TestCase):
 			def _init_ants(self, start): pass
 			def _update_pheromone_map(self): pass
 			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def _update_choice_info(self): pass
 			#def mainloop(self): pass
 		test_object = test_empty_object()
 		
@@ -57,6 +58,22 @@ class TestAntColonyMainLoop(unittest.TestCase):
 		test_object.iterations = 1
 		
 		test_object.first_pass = None
+		test_object.symmetric = False
+		test_object.pheromone_typecode = 'd'
+		test_object.backend = 'threads'
+		test_object.seed = None
+		test_object.iteration = 0
+		test_object.process_pool = None
+		test_object.executor = None
+		test_object.distance_async = False
+		test_object.ant_updated_pheromone_map = []
+		test_object.pheromone_scale = 1.0
+		test_object.update_strategy = module.ant_system()
+		test_object.pheromone_bounds = None
+		test_object.initial_pheromone_amount = None
+		test_object.thread_pool = None
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
 		test_object.nodes = dict()
 		test_object.shortest_distance = None
 		test_object.shortest_path_seen = [0]
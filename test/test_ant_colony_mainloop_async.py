@@ -0,0 +1,106 @@
+import unittest
+import importlib
+import asyncio
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestAntColonyMainloopAsync(unittest.TestCase):
+	def setUp(self):
+		self.testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(12)}
+		self.running = 0
+		self.most_running = 0
+		self.calls = 0
+	
+	async def async_distance_callback(self, start, end):
+		self.calls += 1
+		self.running += 1
+		self.most_running = max(self.most_running, self.running)
+		await asyncio.sleep(0)
+		self.running -= 1
+		return module.euclidean_distance(start, end)
+	
+	def test_correct(self):
+		module.debug = False
+		
+		#testing
+		test_object = module.ant_colony(self.testing_nodes, self.async_distance_callback, ant_count=4, iterations=3, seed=2, candidate_count=4)
+		route = asyncio.run(test_object.mainloop_async())
+		self.assertEqual(sorted(route), sorted(self.testing_nodes))
+		
+		#every distance once, awaited together rather than one at a time
+		self.assertEqual(self.calls, 12*12)
+		self.assertEqual(self.most_running, 12*12)
+		self.assertEqual(test_object.iteration, 3)
+		
+		#the same as with the same callback run synchronously
+		sync_object = module.ant_colony(self.testing_nodes, module.euclidean_distance, ant_count=4, iterations=3, seed=2, candidate_count=4)
+		self.assertEqual(sync_object.mainloop(), route)
+	
+	def test_batches(self):
+		module.debug = False
+		
+		#setup test environment
+		batch_backup = module.async_batch
+		module.async_batch = 50
+		self.batches = []
+		async def async_distance_batch_callback(starts, ends):
+			self.batches.append(len(starts))
+			return [module.euclidean_distance(start, end) for start, end in zip(starts, ends)]
+		
+		#testing
+		try:
+			test_object = module.ant_colony(self.testing_nodes, async_distance_batch_callback, distance_batch=True, symmetric=True)
+			self.assertEqual(asyncio.run(test_object.precompute_distances_async()), 12*13//2)
+		finally:
+			module.async_batch = batch_backup
+		self.assertEqual(self.batches, [50, 28])
+		self.assertEqual(test_object._get_distance(3, 7), module.euclidean_distance(self.testing_nodes[3], self.testing_nodes[7]))
+	
+	def test_cancel_returns_shortest_path_seen(self):
+		module.debug = False
+		
+		#testing
+		async def run():
+			test_object = module.ant_colony(self.testing_nodes, self.async_distance_callback, ant_count=2, iterations=10**6)
+			task = asyncio.ensure_future(test_object.mainloop_async())
+			while test_object.iteration < 2:
+				await asyncio.sleep(0)
+			task.cancel()
+			return test_object, await task
+		test_object, route = asyncio.run(run())
+		self.assertEqual(sorted(route), sorted(self.testing_nodes))
+		self.assertTrue(test_object.iteration < 10**6)
+	
+	def test_cancel_before_any_tour(self):
+		module.debug = False
+		
+		#testing
+		async def run():
+			test_object = module.ant_colony(self.testing_nodes, self.async_distance_callback, ant_count=2, iterations=5)
+			task = asyncio.ensure_future(test_object.mainloop_async())
+			await asyncio.sleep(0)
+			task.cancel()
+			await task
+		with self.assertRaises(asyncio.CancelledError):
+			asyncio.run(run())
+	
+	def test_async_distance_callback_invalid(self):
+		module.debug = False
+		
+		#testing
+		test_object = module.ant_colony(self.testing_nodes, self.async_distance_callback)
+		with self.assertRaises(TypeError):
+			test_object.mainloop()
+		with self.assertRaises(TypeError):
+			test_object.precompute_distances(workers=1)
+		with self.assertRaises(ValueError):
+			module.ant_colony(self.testing_nodes, self.async_distance_callback, distance_rows=2)
+
+if __name__ == '__main__':
+    unittest.main()
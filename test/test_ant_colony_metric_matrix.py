@@ -0,0 +1,84 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir) 
+
+import ant_colony as module
+
+class TestAntColonyMetricMatrix(unittest.TestCase):
+	def test_pairwise_metrics(self):
+		module.debug = False
+		
+		self.assertEqual(module.euclidean_distance((0, 0), (3, 4)), 5.0)
+		self.assertEqual(module.manhattan_distance((0, 0), (3, -4)), 7.0)
+		self.assertEqual(module.chebyshev_distance((0, 0), (3, -4)), 4.0)
+		#airbnb and dropbox headquarters in SF CA, as in distance_on_earth() from the integration tests
+		self.assertAlmostEqual(module.haversine_distance((37.7689269, -122.4029053), (37.7768800, -122.3911496)), 1.36002518696)
+		
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_correct(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.nodes = {0: (0, 7), 1: (3, 9), 2: (12, 4), 3: (14, 11), 4: (8, 11)}
+		
+		#testing
+		#every built-in metric should give the same matrix as calling its pairwise version on each pair of nodes
+		for metric in module.metrics:
+			matrix = test_object._metric_matrix(metric)
+			for start in test_object.nodes:
+				for end in test_object.nodes:
+					self.assertAlmostEqual(matrix[start][end], module.metrics[metric][0](test_object.nodes[start], test_object.nodes[end]))
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_nodes_not_coordinates(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.nodes = {0: 'a', 1: 'b'}
+		
+		#testing
+		with self.assertRaisesRegex(TypeError, 'node values must be coordinates'):
+			test_object._metric_matrix('euclidean')
+	
+	def test_init_with_metric_name(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		#testing
+		test_object = test_empty_object({0: (0, 0), 1: (3, 4)}, 'euclidean')
+		self.assertEqual(test_object.distance_metric, 'euclidean')
+		self.assertEqual(test_object.distance_callback, module.euclidean_distance)
+		self.assertEqual(test_object._get_distance(0, 1), 5.0)
+		
+		with self.assertRaisesRegex(ValueError, 'distance_callback names an unknown metric'):
+			test_empty_object({0: (0, 0), 1: (3, 4)}, 'no such metric')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import importlib
+from array import array
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestAntColonyNewMatrix(unittest.TestCase):
+	def make_test_object(self):
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		return test_empty_object()
+	
+	def test_default(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#setup test environment
+		test_object.symmetric = False
+		
+		#testing
+		self.assertEqual(test_object._new_matrix(2, value=1), [[1.0, 1.0], [1.0, 1.0]])
+	
+	def test_compact_rows(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#setup test environment
+		test_object.symmetric = False
+		
+		#testing
+		matrix = test_object._new_matrix(3, value=1, typecode='f')
+		self.assertEqual(len(matrix), 3)
+		for row in matrix:
+			self.assertTrue(isinstance(row, array))
+			self.assertEqual(row.itemsize, 4)
+			self.assertEqual(list(row), [1.0, 1.0, 1.0])
+		
+		matrix = test_object._new_matrix(3, typecode='i')
+		self.assertEqual(matrix[2].typecode, 'i')
+		self.assertEqual(list(matrix[2]), [0, 0, 0])
+	
+	def test_symmetric(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#setup test environment
+		test_object.symmetric = True
+		
+		#testing
+		matrix = test_object._new_matrix(3, typecode='i')
+		self.assertTrue(isinstance(matrix, module.symmetric_matrix))
+		self.assertEqual(matrix.values.typecode, 'i')
+		self.assertEqual(len(matrix.values), 6)
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_contiguous(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#testing
+		for symmetric in [False, True]:
+			test_object.symmetric = symmetric
+			matrix = test_object._new_matrix(3, value=2, typecode='f', contiguous=True)
+			values = matrix.values if symmetric else matrix
+			self.assertTrue(isinstance(values, module.numpy.ndarray))
+			self.assertEqual(values.dtype, module.numpy.float32)
+			self.assertEqual(matrix[2][1], 2.0)
+	
+	def test_int32_distances_are_rounded(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start): pass
+		
+		def testing_distance_callback(start, end):
+			return abs(start - end) * 1.25
+		
+		test_object = test_empty_object({x: x for x in range(4)}, testing_distance_callback, dtype='int32')
+		self.assertEqual(test_object.distance_matrix[0].typecode, 'i')
+		if module.numpy is None:
+			self.assertEqual(test_object.pheromone_map[0].typecode, 'f')
+		else:
+			self.assertEqual(test_object.pheromone_map.dtype, module.numpy.float32)
+		
+		#testing
+		#1.25 -> 1, 2.5 -> 3 (rounded half up, as nint() in TSPLIB), 3.75 -> 4
+		self.assertEqual([test_object._get_distance(0, end) for end in range(4)], [0, 1, 3, 4])
+		#the same again, from distance_matrix
+		self.assertEqual([test_object._get_distance(0, end) for end in range(4)], [0, 1, 3, 4])
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_metric(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start): pass
+		
+		test_object = test_empty_object({x: (x * 1.5, 0) for x in range(3)}, 'euclidean', dtype='int32')
+		
+		#testing
+		self.assertEqual(test_object.distance_matrix.dtype, module.numpy.int32)
+		self.assertEqual(test_object.distance_matrix[0].tolist(), [0, 2, 3])
+		
+		test_object = test_empty_object({x: (x * 1.5, 0) for x in range(3)}, 'euclidean', dtype='float32', symmetric=True)
+		self.assertEqual(test_object.distance_matrix.values.typecode, 'f')
+		self.assertEqual(test_object._get_distance(0, 2), 3.0)
+	
+	def test_dtype_invalid(self):
+		module.debug = False
+		
+		#testing
+		with self.assertRaises(TypeError):
+			module.ant_colony({0: 0}, lambda start, end: 0, dtype=4)
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: 0}, lambda start, end: 0, dtype='float16')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+#distance callbacks go to the worker processes, so they have to be picklable (module level)
+def mock_invalid_distance_callback(start, end):
+	return 'a'
+
+def mock_numpy_distance_callback(start, end):
+	return module.numpy.float64(end[0] - start[0])
+
+class TestAntColonyPrecomputeDistances(unittest.TestCase):
+	def make_test_object(self, symmetric=False):
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.nodes = {x: (x, x*2) for x in range(5)}
+		test_object.distance_callback = module.euclidean_distance
+		test_object.distance_batch = False
+		test_object.distance_typecode = 'd'
+		test_object.distance_rows = None
+		test_object.distance_async = False
+		test_object.symmetric = symmetric
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
+		if symmetric:
+			test_object.distance_matrix = module.symmetric_matrix(5)
+			test_object.distance_computed = module.bitmap(15)
+		else:
+			test_object.distance_matrix = [[0.0 for x in range(5)] for y in range(5)]
+			test_object.distance_computed = module.bitmap(25)
+		return test_object
+	
+	def test_correct(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#testing
+		self.assertEqual(test_object.precompute_distances(workers=2), 25)
+		for start in range(5):
+			for end in range(5):
+				self.assertEqual(test_object.distance_matrix[start][end], module.euclidean_distance(test_object.nodes[start], test_object.nodes[end]))
+		self.assertTrue(all([test_object.distance_computed[cell] for cell in range(25)]))
+		
+		#everything is computed now, so a second call has nothing to do
+		self.assertEqual(test_object.precompute_distances(workers=2), 0)
+	
+	def test_only_missing_distances(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#setup test environment
+		test_object.distance_matrix[1][2] = -1.0
+		test_object.distance_computed.set(1*5 + 2)
+		
+		#testing
+		self.assertEqual(test_object.precompute_distances(workers=2), 24)
+		self.assertEqual(test_object.distance_matrix[1][2], -1.0)
+		self.assertEqual(test_object.distance_matrix[2][1], module.euclidean_distance(test_object.nodes[2], test_object.nodes[1]))
+	
+	def test_symmetric(self):
+		module.debug = False
+		test_object = self.make_test_object(symmetric=True)
+		
+		#testing
+		#only the lower triangle (with the diagonal) is computed
+		self.assertEqual(test_object.precompute_distances(workers=2), 15)
+		for start in range(5):
+			for end in range(5):
+				self.assertEqual(test_object.distance_matrix[start][end], module.euclidean_distance(test_object.nodes[start], test_object.nodes[end]))
+	
+	def test_single_worker(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#setup test environment
+		#in this process, so the callback may be a lambda
+		test_object.distance_callback = lambda start, end: float(end[0] - start[0])
+		
+		#testing
+		self.assertEqual(test_object.precompute_distances(workers=1), 25)
+		self.assertEqual(test_object.distance_matrix[1][4], 3.0)
+	
+	def test_distance_callback_returns_other_than_int_or_float(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#setup test environment
+		test_object.distance_callback = mock_invalid_distance_callback
+		
+		#testing
+		with self.assertRaises(TypeError):
+			test_object.precompute_distances(workers=2)
+		with self.assertRaises(TypeError):
+			test_object.precompute_distances(workers=1)
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_numpy_distances(self):
+		module.debug = False
+		
+		#testing
+		#the workers accept the same distances as this process does, such as numpy floats
+		for workers in [1, 2]:
+			test_object = self.make_test_object()
+			test_object.distance_callback = mock_numpy_distance_callback
+			self.assertEqual(test_object.precompute_distances(workers=workers), 25)
+			self.assertEqual(test_object.distance_matrix[1][4], 3.0)
+			self.assertEqual(type(test_object.distance_matrix[1][4]), float)
+	
+	def test_workers_invalid(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#testing
+		with self.assertRaises(TypeError):
+			test_object.precompute_distances(workers='2')
+		with self.assertRaises(ValueError):
+			test_object.precompute_distances(workers=0)
+
+if __name__ == '__main__':
+    unittest.main()
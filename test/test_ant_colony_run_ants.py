@@ -0,0 +1,152 @@
+import unittest
+import importlib
+import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+#a stand-in for an ant, recording which thread runs it in ran
+class mock_ant:
+	def __init__(self, id, ran):
+		self.id = id
+		self.ran = ran
+	def start(self):
+		raise AssertionError("no threads should be started")
+	def run(self):
+		self.ran.append((self.id, threading.current_thread()))
+
+class TestAntColonyRunAnts(unittest.TestCase):
+	def test_sequential(self):
+		module.debug = False
+		test_object = module.ant_colony({0: (0, 0)}, 'euclidean', ant_count=1, executor='sequential', workers=2)
+		
+		#testing
+		ran = []
+		test_object._run_ants([mock_ant(x, ran) for x in range(4)])
+		self.assertEqual([id for id, thread in ran], [0, 1, 2, 3])
+		for id, thread in ran:
+			self.assertTrue(thread is threading.current_thread())
+	
+	def test_pool(self):
+		module.debug = False
+		test_object = module.ant_colony({0: (0, 0)}, 'euclidean', ant_count=1, executor='pool', workers=2)
+		
+		#testing
+		ran = []
+		test_object._run_ants([mock_ant(x, ran) for x in range(4)])
+		pool = test_object.thread_pool
+		self.assertEqual(sorted([id for id, thread in ran]), [0, 1, 2, 3])
+		
+		#the same pool is used again on the next iteration
+		test_object._run_ants([mock_ant(x, ran) for x in range(4)])
+		self.assertTrue(test_object.thread_pool is pool)
+		self.assertEqual(len(ran), 8)
+		
+		test_object._stop_thread_pool()
+		self.assertEqual(test_object.thread_pool, None)
+	
+	def test_executor(self):
+		module.debug = False
+		
+		#testing
+		ran = []
+		with ThreadPoolExecutor(2) as executor:
+			test_object = module.ant_colony({0: (0, 0)}, 'euclidean', ant_count=1, executor=executor)
+			test_object._run_ants([mock_ant(x, ran) for x in range(4)])
+		self.assertEqual(sorted([id for id, thread in ran]), [0, 1, 2, 3])
+		self.assertEqual(test_object.thread_pool, None)
+	
+	def test_exception_is_raised(self):
+		module.debug = False
+		test_object = module.ant_colony({0: (0, 0)}, 'euclidean', ant_count=1, workers=2)
+		
+		#setup test environment
+		class broken_ant:
+			def run(self):
+				raise KeyError("broken ant")
+		
+		#testing
+		for executor in ['sequential', 'pool']:
+			test_object.executor = executor
+			with self.assertRaises(KeyError):
+				test_object._run_ants([broken_ant()])
+		test_object._stop_thread_pool()
+	
+	def test_stopped_on_error(self):
+		module.debug = False
+		
+		class test_failing_object(module.ant_colony):
+			def _update_choice_info(self):
+				if self.iteration == 1:
+					raise KeyError("broken iteration")
+				module.ant_colony._update_choice_info(self)
+		
+		#testing
+		#the pool is shut down when an iteration raises as well
+		testing_nodes = {x: (x % 4, x // 4) for x in range(12)}
+		for run in ['mainloop', 'mainloop_async']:
+			test_object = test_failing_object(testing_nodes, 'euclidean', ant_count=5, iterations=3, executor='pool', workers=2)
+			with self.assertRaises(KeyError):
+				if run == 'mainloop':
+					test_object.mainloop()
+				else:
+					asyncio.run(test_object.mainloop_async())
+			self.assertEqual(test_object.iteration, 1)
+			self.assertEqual(test_object.thread_pool, None)
+	
+	def test_mainloop(self):
+		module.debug = False
+		
+		#testing
+		#a seeded run gives the same result however the ants are run
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(15)}
+		runs = []
+		for executor in [None, 'sequential', 'pool', ThreadPoolExecutor(2)]:
+			test_object = module.ant_colony(testing_nodes, module.euclidean_distance, ant_count=6, iterations=3, seed=5, executor=executor, workers=3)
+			runs.append((test_object.mainloop(), test_object.shortest_distance))
+			self.assertEqual(test_object.thread_pool, None)
+		for run in runs[1:]:
+			self.assertEqual(run, runs[0])
+	
+	def test_mainloop_without_numpy(self):
+		module.debug = False
+		numpy = module.numpy
+		
+		#testing
+		#the same, with ants that choose without numpy
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(15)}
+		try:
+			module.numpy = None
+			for update_strategy in ['ant_system', 'colony_system']:
+				runs = []
+				for executor in [None, 'sequential', 'pool']:
+					test_object = module.ant_colony(testing_nodes, module.euclidean_distance, ant_count=6, iterations=3, seed=5, executor=executor, workers=3, update_strategy=update_strategy)
+					runs.append((test_object.mainloop(), test_object.shortest_distance))
+					self.assertEqual(test_object.thread_pool, None)
+				for run in runs[1:]:
+					self.assertEqual(run, runs[0])
+		finally:
+			module.numpy = numpy
+	
+	def test_executor_invalid(self):
+		module.debug = False
+		
+		#testing
+		with self.assertRaises(TypeError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', executor=4)
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', executor='fibers')
+		#the ants are threads of this process
+		with ProcessPoolExecutor(1) as executor:
+			with self.assertRaisesRegex(ValueError, 'ProcessPoolExecutor'):
+				module.ant_colony({0: (0, 0)}, 'euclidean', executor=executor)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+@unittest.skipIf(module.numpy is None, "requires numpy")
+class TestAntColonyUpdateChoiceInfo(unittest.TestCase):
+	def make_test_object(self, symmetric=False):
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.nodes = {x: x for x in range(3)}
+		test_object.symmetric = symmetric
+		test_object.memmap_dir = None
+		test_object.distance_rows = None
+		test_object.candidates = None
+		test_object.pheromone_typecode = 'd'
+		test_object.backend = 'threads'
+		test_object.alpha = 1.0
+		test_object.beta = 2.0
+		test_object.log_heuristic = None
+		test_object.choice_info = None
+		test_object.choice_cumulative = None
+		test_object.seed = None
+		test_object.update_strategy = module.ant_system()
+		return test_object
+	
+	def test_correct(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#setup test environment
+		test_object.distance_matrix = [[0.0, 1.0, 2.0], [1.0, 0.0, 4.0], [2.0, 4.0, 0.0]]
+		test_object.distance_computed = module.bitmap(9, value=True)
+		test_object.pheromone_map = [[0.0, 2.0, 3.0], [2.0, 0.0, 1.0], [3.0, 1.0, 0.0]]
+		
+		#testing
+		test_object._update_choice_info()
+		#tau^alpha * eta^beta (2.0, 3.0/4 and 1.0/16), divided by the highest of them
+		self.assertAlmostEqual(test_object.choice_info[0][1], 1.0)
+		self.assertAlmostEqual(test_object.choice_info[0][2], 3.0/8)
+		self.assertAlmostEqual(test_object.choice_info[1][2], 1.0/32)
+		#running totals of each row, without the step from a node to itself
+		for row, expected in zip(test_object.choice_cumulative.tolist(), [[0.0, 1.0, 1.375], [1.0, 1.0, 1.03125], [0.375, 0.40625, 0.40625]]):
+			for value, expected_value in zip(row, expected):
+				self.assertAlmostEqual(value, expected_value)
+		
+		#only the pheromones change between iterations
+		log_heuristic = test_object.log_heuristic
+		test_object.pheromone_map[0][1] = 4.0
+		test_object._update_choice_info()
+		self.assertTrue(test_object.log_heuristic is log_heuristic)
+		self.assertAlmostEqual(test_object.choice_info[0][1], 1.0)
+		self.assertAlmostEqual(test_object.choice_info[0][2], 3.0/16)
+	
+	def test_no_underflow(self):
+		module.debug = False
+		test_object = self.make_test_object()
+		
+		#setup test environment
+		#tau^alpha * eta^beta of every step is far below the smallest float
+		test_object.alpha = 50.0
+		test_object.distance_matrix = [[0.0, 1.0, 2.0], [1.0, 0.0, 4.0], [2.0, 4.0, 0.0]]
+		test_object.distance_computed = module.bitmap(9, value=True)
+		test_object.pheromone_map = [[0.0, 1e-10, 2e-10], [1e-10, 0.0, 1e-10], [2e-10, 1e-10, 0.0]]
+		
+		#testing
+		test_object._update_choice_info()
+		self.assertAlmostEqual(test_object.choice_info[0][2], 1.0)
+		self.assertAlmostEqual(test_object.choice_info[0][1], 2.0**-50)
+		self.assertTrue(test_object.choice_info[1][2] > 0.0)
+	
+	def test_symmetric(self):
+		module.debug = False
+		test_object = self.make_test_object(symmetric=True)
+		
+		#setup test environment
+		test_object.distance_matrix = module.symmetric_matrix(3)
+		test_object.distance_matrix[1][0] = 1.0
+		test_object.distance_matrix[2][0] = 2.0
+		test_object.distance_matrix[2][1] = 4.0
+		test_object.distance_computed = module.bitmap(6, value=True)
+		test_object.pheromone_map = module.symmetric_matrix(3, 1.0)
+		
+		#testing
+		test_object._update_choice_info()
+		self.assertTrue(isinstance(test_object.choice_info, module.symmetric_matrix))
+		self.assertAlmostEqual(test_object.choice_info[0][2], 1.0/4)
+		self.assertAlmostEqual(test_object.choice_info[2][0], 1.0/4)
+		for row, expected in zip(test_object.choice_cumulative.tolist(), [[0.0, 1.0, 1.25], [1.0, 1.0, 1.0625], [0.25, 0.3125, 0.3125]]):
+			for value, expected_value in zip(row, expected):
+				self.assertAlmostEqual(value, expected_value)
+		
+		#none with candidates, which keep to their few nearest locations
+		test_object.candidates = [[1], [0], [0]]
+		test_object.choice_cumulative = None
+		test_object._update_choice_info()
+		self.assertEqual(test_object.choice_cumulative, None)
+	
+	def test_distance_callback(self):
+		module.debug = False
+		
+		#setup test environment
+		calls = []
+		def testing_distance_callback(start, end):
+			calls.append((start, end))
+			return module.euclidean_distance(start, end)
+		
+		#testing
+		#the ants of the first pass never look up some distances (into the start node, from a node to itself)
+		#	which are computed once after it, so choice_info is built for a plain distance_callback as well
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(30)}
+		test_object = module.ant_colony(testing_nodes, testing_distance_callback, ant_count=20, iterations=20)
+		test_object._iterate()
+		self.assertTrue(test_object.distance_computed.all())
+		self.assertEqual(len(calls), 900)
+		self.assertTrue(test_object.choice_info is not None)
+		self.assertTrue(test_object.choice_cumulative is not None)
+		self.assertTrue(test_object.ants[0].choice_info is test_object.choice_info)
+		self.assertTrue(test_object._distances_callback() is not None)
+		
+		#and the ants choose by it from then on, without computing any more distances
+		route = test_object.mainloop()
+		self.assertEqual(sorted(route), sorted(testing_nodes))
+		self.assertEqual(len(calls), 900)
+	
+	def test_bitmap_all(self):
+		module.debug = False
+		
+		#testing
+		test_object = module.bitmap(11)
+		self.assertFalse(test_object.all())
+		test_object.set_range(0, 10)
+		self.assertFalse(test_object.all())
+		test_object.set(10)
+		self.assertTrue(test_object.all())
+		self.assertTrue(module.bitmap(16, value=True).all())
+
+if __name__ == '__main__':
+    unittest.main()
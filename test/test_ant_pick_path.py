@@ -795,10 +795,292 @@ class TestAntPickPath(unittest.TestCase):
 		random.random = mock_random
 		
 		#test_object._pick_path()
+		#with no pheromone on any path, all 9 are as likely
+		self.assertEqual(test_object._pick_path(), 9)
+		
+		random.random = lambda: .1
 		self.assertEqual(test_object._pick_path(), 1)
 		
 		#restore random.random()
 		random.random = random_random_backup
 		
+	def test_corner_case_of_attractiveness_underflowing(self):
+		module.debug = False
+		
+		#inherit from ant so we can call _pick_path correctly
+		class test_empty_object(module.ant_colony.ant):
+			#override each method EXCEPT _pick_path, to get a clean testing environment
+			def __init__(self): pass
+			def run(self): pass
+			def _traverse(self): pass
+			def _update_route(self): pass
+			def _update_distance_traveled(self): pass
+		test_object = test_empty_object()
+		
+		#setting up object environment
+		test_object.first_pass = False
+		test_object.location = 0
+		test_object.possible_locations = [1, 2]
+		#tau^alpha * eta^beta of both paths is far below the smallest float, 1 is 2^50 times as attractive as 2
+		test_object.pheromone_map = [[0.0, 2e-10, 1e-10] for x in range(3)]
+		test_object.distance_callback = lambda start, end: 1000.0
+		test_object.alpha = 50
+		test_object.beta = 50
+		
+		#testing
+		import random
+		random_random_backup = random.random
+		random.random = lambda: .99
+		self.assertEqual(test_object._pick_path(), 1)
+		random.random = lambda: 1.0
+		self.assertEqual(test_object._pick_path(), 2)
+		
+		#restore random.random()
+		random.random = random_random_backup
+		
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_lockstep(self):
+		module.debug = False
+		
+		#setup test environment
+		def mock_distance_callback(start, end):
+			return abs(end - start)
+		
+		stream = module.random_stream(0, (0, 0))
+		#only the steps from 0 to 2 and 3 have any weight, 3 three times as much
+		choice_info = module.numpy.zeros((5, 5))
+		choice_info[0][2] = 1.0
+		choice_info[0][3] = 3.0
+		
+		#testing
+		test_object = module.ant_colony.ant(0, range(5), None, mock_distance_callback, 1, 1, choice_info=choice_info, stream=stream)
+		self.assertTrue(test_object.seeded)
+		stream.block = [0.2, 0.3, 0.99]
+		stream.position = 0
+		self.assertEqual([test_object._pick_path() for x in range(3)], [2, 3, 3])
+		
+		#on the first pass, any unvisited location is as likely, in order
+		test_object.first_pass = True
+		stream.block = [0.0, 0.5, 0.99]
+		stream.position = 0
+		self.assertEqual([test_object._pick_path() for x in range(3)], [1, 3, 4])
+		
+		#without a stream, the random module is used
+		self.assertTrue(module.ant_colony.ant(0, range(5), None, mock_distance_callback, 1, 1).stream is module.random)
+	
+	def test_greedy(self):
+		module.debug = False
+		
+		#setup test environment
+		def mock_distance_callback(start, end):
+			return abs(end - start)
+		
+		class mock_stream:
+			def random(self):
+				return 0.1
+		
+		#testing
+		#seeded, a toss below q0 takes the most attractive location, the others are stretched over [0, 1) for a random choice
+		if module.numpy is not None:
+			stream = module.random_stream(0, (0, 0))
+			choice_info = module.numpy.zeros((5, 5))
+			choice_info[0][2] = 1.0
+			choice_info[0][3] = 3.0
+			test_object = module.ant_colony.ant(0, range(5), None, mock_distance_callback, 1, 1, choice_info=choice_info, stream=stream, q0=.5)
+			stream.block = [0.2, 0.6, 0.99]
+			stream.position = 0
+			self.assertEqual([test_object._pick_path() for x in range(3)], [3, 2, 3])
+			
+			#without a stream, from choice_info
+			test_object = module.ant_colony.ant(0, range(5), None, mock_distance_callback, 1, 1, choice_info=choice_info, q0=.5)
+			test_object.stream = mock_stream()
+			self.assertEqual(test_object._pick_path(), 3)
+		
+		#or computed from the pheromones and distances, the nearest location here
+		test_object = module.ant_colony.ant(0, range(5), [[0.0, 1.0, 1.0, 1.0, 1.0]], mock_distance_callback, 1, 1, q0=.5)
+		test_object.stream = mock_stream()
+		self.assertEqual(test_object._pick_path(), 1)
+	
+	def test_candidates(self):
+		#inherit from ant so we can call _pick_path correctly
+		class test_empty_object(module.ant_colony.ant):
+			#override each method EXCEPT _pick_path, to get a clean testing environment
+			def __init__(self): pass
+			def run(self): pass
+			def _traverse(self): pass
+			def _update_route(self): pass
+			def _update_distance_traveled(self): pass
+		test_object = test_empty_object()
+		
+		#setting up object environment
+		test_object.first_pass = False
+		test_object.location = 0
+		#0 and 1 are visited
+		test_object.possible_locations = [x for x in range(2, 10)]
+		test_object.pheromone_map = [[1.0 for x in range(10)] for y in range(10)]
+		test_object.alpha = 1
+		test_object.beta = 1
+		
+		#only the candidates of 0 should ever be scored
+		self.scored = []
+		def mock_distance_callback(start, end):
+			self.scored.append(end)
+			return abs(end - start)
+		
+		test_object.distance_callback = mock_distance_callback
+		test_object.candidates = [[1, 2, 3]] + [[] for x in range(9)]
+		
+		module.debug = False
+		self.assertTrue(test_object._pick_path() in [2, 3])
+		self.assertEqual(sorted(self.scored), [2, 3])
+		
+		#once all candidates are visited, the nearest unvisited node is taken
+		test_object.possible_locations = [9, 5, 4, 8]
+		self.assertEqual(test_object._pick_path(), 4)
+		
+		#cleanup
+		del self.scored
+		
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_vectorized(self):
+		#inherit from ant so we can call _pick_path correctly
+		class test_empty_object(module.ant_colony.ant):
+			#override each method EXCEPT _pick_path, to get a clean testing environment
+			def __init__(self): pass
+			def run(self): pass
+			def _traverse(self): pass
+			def _update_route(self): pass
+			def _update_distance_traveled(self): pass
+		test_object = test_empty_object()
+		
+		#setting up object environment
+		#enough locations for numpy to be used
+		size = module.vectorized_locations + 1
+		test_object.first_pass = False
+		test_object.location = 0
+		test_object.possible_locations = list(range(1, size))
+		test_object.pheromone_map = [[0.0 for x in range(size)] for y in range(size)]
+		test_object.alpha = 1
+		test_object.beta = 1
+		
+		#only two paths have pheromones, the second twice as attractive
+		test_object.pheromone_map[0][3] = 1.0
+		test_object.pheromone_map[0][7] = 2.0
+		
+		self.distance_calls = []
+		def mock_distances_callback(start, ends):
+			self.distance_calls.append((start, ends))
+			return module.numpy.array([float(end) for end in ends])
+		test_object.distances_callback = mock_distances_callback
+		
+		#weights are 1/3 for 3 and 2/7 for 7
+		import random
+		random_random_backup = random.random
+		
+		random.random = lambda: 0.5
+		self.assertEqual(test_object._pick_path(), 3)
+		#the distance of the chosen step is kept for _update_distance_traveled()
+		self.assertEqual(test_object.next_step, (0, 3, 3.0))
+		
+		random.random = lambda: 0.6
+		self.assertEqual(test_object._pick_path(), 7)
+		self.assertEqual(test_object.next_step, (0, 7, 7.0))
+		self.assertEqual(len(self.distance_calls), 2)
+		
+		#a location at distance 0 is taken over all others
+		test_object.distances_callback = lambda start, ends: module.numpy.array([0.0 if end == 5 else 1.0 for end in ends])
+		self.assertEqual(test_object._pick_path(), 5)
+		
+		#restore random.random()
+		random.random = random_random_backup
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_gather(self):
+		row = module.numpy.array([0.0, 1.0, 2.0, 3.0])
+		indices = module.numpy.array([3, 1])
+		self.assertEqual(module._gather(row, indices).tolist(), [3.0, 1.0])
+		self.assertEqual(module._gather(module.array('f', row), indices).tolist(), [3.0, 1.0])
+		self.assertEqual(module._gather(row.tolist(), indices).tolist(), [3.0, 1.0])
+		
+		matrix = module.symmetric_matrix(4)
+		for x in range(4):
+			for y in range(x + 1):
+				matrix[x][y] = x*10 + y
+		self.assertEqual(module._gather(matrix[1], module.numpy.array([0, 1, 2, 3])).tolist(), [10.0, 11.0, 21.0, 31.0])
+		
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_choice_info(self):
+		#inherit from ant so we can call _pick_path correctly
+		class test_empty_object(module.ant_colony.ant):
+			#override each method EXCEPT _pick_path, to get a clean testing environment
+			def __init__(self): pass
+			def run(self): pass
+			def _traverse(self): pass
+			def _update_route(self): pass
+			def _update_distance_traveled(self): pass
+		test_object = test_empty_object()
+		
+		#setting up object environment
+		test_object.first_pass = False
+		test_object.location = 0
+		test_object.possible_locations = [1, 2, 3]
+		#the weights are read from choice_info, so neither pheromones nor distances are looked at
+		test_object.pheromone_map = None
+		test_object.distance_callback = None
+		test_object.choice_info = module.numpy.array([[0.0, 1.0, 0.0, 3.0]]*4)
+		
+		import random
+		random_random_backup = random.random
+		
+		random.random = lambda: 0.2
+		self.assertEqual(test_object._pick_path(), 1)
+		random.random = lambda: 0.3
+		self.assertEqual(test_object._pick_path(), 3)
+		
+		#restore random.random()
+		random.random = random_random_backup
+		
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_choice_cumulative(self):
+		#inherit from ant so we can call _pick_path correctly
+		class test_empty_object(module.ant_colony.ant):
+			#override each method EXCEPT _pick_path, to get a clean testing environment
+			def __init__(self): pass
+			def run(self): pass
+			def _traverse(self): pass
+			def _update_route(self): pass
+			def _update_distance_traveled(self): pass
+		test_object = test_empty_object()
+		
+		#setting up object environment
+		test_object.first_pass = False
+		test_object.location = 0
+		test_object.possible_locations = [2, 3]
+		test_object.choice_info = module.numpy.array([[0.0, 1.0, 1.0, 2.0]]*4)
+		test_object.choice_cumulative = module.numpy.cumsum(test_object.choice_info, axis=1)
+		
+		import random
+		random_random_backup = random.random
+		
+		#draws of 0.3 and 0.6 of the row's total (4.0) land on 2 and 3
+		random.random = lambda: 0.3
+		self.assertEqual(test_object._pick_path(), 2)
+		random.random = lambda: 0.6
+		self.assertEqual(test_object._pick_path(), 3)
+		
+		#a draw landing on a visited location is drawn again
+		self.tosses = [0.1, 0.1, 0.9]
+		random.random = lambda: self.tosses.pop(0)
+		self.assertEqual(test_object._pick_path(), 3)
+		self.assertEqual(self.tosses, [])
+		
+		#if every draw lands on a visited location, only the unvisited ones are weighed (2 of 3 at 0.5)
+		self.tosses = [0.1]*module.rejection_attempts + [0.5]
+		self.assertEqual(test_object._pick_path(), 3)
+		self.assertEqual(self.tosses, [])
+		
+		#restore random.random()
+		random.random = random_random_backup
+		
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -37,5 +37,36 @@ class TestAntUpdateDistanceTraveled(unittest.TestCase):
 		
 		self.assertEqual(test_object.distance_traveled, 1)
 
+	def test_reuses_distance_of_picked_step(self):
+		class test_empty_object(module.ant_colony.ant):
+			def __init__(self): pass
+			def run(self): pass
+			def _traverse(self): pass
+			def _update_route(self): pass
+			def _pick_path(self): pass
+		test_object = test_empty_object()
+		
+		#setting up object environment
+		test_object.distance_traveled = 0
+		test_object.next_step = (0, 1, 5.0)
+		
+		self.calls = 0
+		def mock_distance_callback(start, end):
+			self.calls += 1
+			return 1
+		
+		test_object.distance_callback = mock_distance_callback
+		
+		#_pick_path() already looked this step up
+		test_object._update_distance_traveled(0, 1)
+		self.assertEqual(test_object.distance_traveled, 5.0)
+		self.assertEqual(self.calls, 0)
+		self.assertEqual(test_object.next_step, None)
+		
+		#any other step still goes through distance_callback
+		test_object._update_distance_traveled(1, 2)
+		self.assertEqual(test_object.distance_traveled, 6.0)
+		self.assertEqual(self.calls, 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
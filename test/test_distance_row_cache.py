@@ -0,0 +1,86 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestDistanceRowCache(unittest.TestCase):
+	def test_correct(self):
+		module.debug = False
+		
+		#setup test environment
+		self.computed = []
+		def mock_compute_row(row):
+			self.computed.append(row)
+			return [abs(row - column) for column in range(5)]
+		test_object = module.distance_row_cache(5, 2, mock_compute_row)
+		
+		#testing
+		self.assertEqual(len(test_object), 5)
+		self.assertEqual(test_object[3][0], 3)
+		self.assertEqual(test_object[3][4], 1)
+		self.assertEqual(self.computed, [3])
+		self.assertEqual(test_object.get_stats(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'evictions': 0, 'rows': 1})
+	
+	def test_least_recently_used_row_is_dropped(self):
+		module.debug = False
+		
+		#setup test environment
+		self.computed = []
+		def mock_compute_row(row):
+			self.computed.append(row)
+			return [row]*4
+		test_object = module.distance_row_cache(4, 2, mock_compute_row)
+		
+		#testing
+		test_object[0]
+		test_object[1]
+		#0 is now more recently used than 1
+		test_object[0]
+		#so 1 is dropped for 2
+		test_object[2]
+		self.assertEqual(sorted(test_object.rows), [0, 2])
+		test_object[1]
+		self.assertEqual(self.computed, [0, 1, 2, 1])
+		self.assertEqual(test_object.get_stats()['evictions'], 2)
+		self.assertEqual(test_object.get_stats()['rows'], 2)
+	
+	def test_colony(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start): pass
+		
+		testing_nodes = {x: (x % 7, x // 7) for x in range(20)}
+		for distance_callback in ['euclidean', module.euclidean_distance]:
+			test_object = test_empty_object(testing_nodes, distance_callback, distance_rows=3)
+			self.assertTrue(isinstance(test_object.distance_matrix, module.distance_row_cache))
+			self.assertEqual(test_object.distance_computed, None)
+			
+			#testing
+			for start in range(20):
+				for end in range(20):
+					self.assertAlmostEqual(test_object._get_distance(start, end), module.euclidean_distance(testing_nodes[start], testing_nodes[end]))
+			stats = test_object.get_distance_cache_stats()
+			self.assertEqual(stats['misses'], 20)
+			self.assertEqual(stats['evictions'], 17)
+			self.assertEqual(stats['rows'], 3)
+	
+	def test_distance_rows_invalid(self):
+		module.debug = False
+		
+		#testing
+		with self.assertRaises(TypeError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', distance_rows='3')
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', distance_rows=0)
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', distance_rows=3, distance_cache=':memory:')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestLocationSet(unittest.TestCase):
+	def test_correct(self):
+		module.debug = False
+		
+		#works from any iterable of node ids, like the dict keys passed in by ant_colony._init_ants()
+		test_object = module.location_set({x: None for x in range(5)}.keys())
+		
+		#testing
+		self.assertEqual(len(test_object), 5)
+		self.assertEqual(sorted(test_object), [0, 1, 2, 3, 4])
+		self.assertTrue(3 in test_object)
+		self.assertFalse(5 in test_object)
+		
+		#the last location takes the place of the removed one
+		test_object.remove(1)
+		self.assertEqual(list(test_object), [0, 4, 2, 3])
+		self.assertEqual(test_object[1], 4)
+		self.assertFalse(1 in test_object)
+		
+		test_object.remove(3)
+		test_object.remove(0)
+		self.assertEqual(sorted(test_object), [2, 4])
+		
+		with self.assertRaises(ValueError):
+			test_object.remove(1)
+		
+		test_object.remove(2)
+		test_object.remove(4)
+		self.assertEqual(len(test_object), 0)
+		self.assertFalse(test_object)
+	
+	def test_reset(self):
+		module.debug = False
+		
+		#setup test environment
+		test_object = module.location_set(range(4))
+		test_object.remove(2)
+		buffers = (test_object.locations, test_object.present, test_object.positions)
+		
+		#testing
+		test_object.reset(range(4))
+		self.assertEqual(sorted(test_object), [0, 1, 2, 3])
+		self.assertTrue(2 in test_object)
+		#the same buffers are used again
+		self.assertTrue(test_object.locations is buffers[0])
+		self.assertTrue(test_object.present is buffers[1])
+		self.assertTrue(test_object.positions is buffers[2])
+		
+		#locations left over from an unfinished tour are cleared
+		test_object.reset([1, 2])
+		self.assertFalse(0 in test_object)
+		self.assertFalse(3 in test_object)
+		test_object.remove(2)
+		self.assertEqual(list(test_object), [1])
+	
+	def test_ant_reuses_location_set(self):
+		module.debug = False
+		
+		#setup test environment
+		def mock_distance_callback(start, end):
+			return 1
+		
+		#testing
+		test_object = module.ant_colony.ant(0, {x: None for x in range(3)}.keys(), [[1.0]*3]*3, mock_distance_callback, 1, 1)
+		possible_locations = test_object.possible_locations
+		self.assertEqual(sorted(possible_locations), [1, 2])
+		
+		test_object.run()
+		self.assertEqual(sorted(test_object.get_route()), [0, 1, 2])
+		
+		test_object.__init__(0, {x: None for x in range(3)}.keys(), [[1.0]*3]*3, mock_distance_callback, 1, 1)
+		self.assertTrue(test_object.possible_locations is possible_locations)
+		self.assertEqual(sorted(possible_locations), [1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
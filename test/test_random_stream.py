@@ -0,0 +1,56 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestRandomStream(unittest.TestCase):
+	def test_correct(self):
+		module.debug = False
+		
+		#testing
+		test_object = module.random_stream(7, (0, 1))
+		values = [test_object.random() for x in range(module.random_block + 10)]
+		for value in values:
+			self.assertTrue(0.0 <= value < 1.0)
+		#a new block is drawn once the first is used up
+		self.assertEqual(test_object.position, 10)
+		
+		#the same seed and key give the same numbers
+		same = module.random_stream(7, (0, 1))
+		self.assertEqual([same.random() for x in range(module.random_block + 10)], values)
+		
+		#another key or seed does not
+		self.assertNotEqual([module.random_stream(7, (0, 2)).random() for x in range(10)], values[:10])
+		self.assertNotEqual([module.random_stream(7, (1, 1)).random() for x in range(10)], values[:10])
+		self.assertNotEqual([module.random_stream(8, (0, 1)).random() for x in range(10)], values[:10])
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_spawn(self):
+		module.debug = False
+		
+		#testing
+		#the same as the streams SeedSequence.spawn() gives
+		spawned = module.numpy.random.SeedSequence(7).spawn(2)[1].spawn(3)[2]
+		expected = module.numpy.random.Generator(module.numpy.random.PCG64(spawned)).random(5).tolist()
+		test_object = module.random_stream(7, (1, 2))
+		self.assertEqual([test_object.random() for x in range(5)], expected)
+	
+	def test_choice(self):
+		module.debug = False
+		
+		#setup test environment
+		test_object = module.random_stream(3, (0, 0))
+		test_object.block = [0.0, 0.5, 0.99]
+		test_object.position = 0
+		
+		#testing
+		self.assertEqual([test_object.choice(['a', 'b', 'c', 'd']) for x in range(3)], ['a', 'c', 'd'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir) 
+
+import ant_colony as module
+
+class TestSymmetricMatrix(unittest.TestCase):
+	def test_correct(self):
+		module.debug = False
+		
+		test_object = module.symmetric_matrix(4, value=1.0)
+		
+		#only the lower triangle (diagonal included) is stored
+		self.assertEqual(len(test_object.values), 10)
+		self.assertEqual(len(test_object), 4)
+		self.assertEqual(list(test_object[2]), [1.0, 1.0, 1.0, 1.0])
+		
+		#[i][j] and [j][i] are the same cell
+		test_object[1][3] = 5.0
+		self.assertEqual(test_object[3][1], 5.0)
+		test_object[2][0] = 7.0
+		self.assertEqual(test_object[0][2], 7.0)
+		self.assertEqual(list(test_object[3]), [1.0, 5.0, 1.0, 1.0])
+	
+	def test_get_distance_computed_once_per_pair(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			#def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.distance_matrix = module.symmetric_matrix(3)
+		test_object.nodes = {x: x for x in range(3)}
+		test_object.distance_batch = False
+		test_object.distance_typecode = 'd'
+		test_object.distance_rows = None
+		test_object.symmetric = True
+		test_object.memmap_dir = None
+		test_object.distance_cache = None
+		test_object.distance_computed = module.bitmap(6)
+		test_object.distance_cache_hits = 0
+		test_object.distance_cache_misses = 0
+		
+		self.calls = 0
+		def mock_distance_callback(start, end):
+			self.calls += 1
+			return abs(start - end)
+		
+		test_object.distance_callback = mock_distance_callback
+		
+		#testing
+		self.assertEqual(test_object._get_distance(0, 2), 2)
+		self.assertEqual(test_object._get_distance(2, 0), 2)
+		self.assertEqual(self.calls, 1)
+		
+		#cleanup
+		del self.calls
+	
+	def test_update_pheromone_map(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def __init__(self): pass
+			def _get_distance(self, start, end): pass
+			def _init_matrix(self, size, value=None): pass
+			def _init_ants(self, start): pass
+			#def _update_pheromone_map(self): pass
+			def _populate_ant_updated_pheromone_map(self, ant): pass
+			def mainloop(self): pass
+		test_object = test_empty_object()
+		
+		#setup test environment
+		test_object.pheromone_map = module.symmetric_matrix(2, value=1.0)
+		test_object.ant_updated_pheromone_map = module.symmetric_matrix(2)
+		test_object.ant_updated_pheromone_map[0][1] = 2.0
+		test_object.pheromone_evaporation_coefficient = .5
+		
+		#testing
+		test_object._update_pheromone_map()
+		self.assertEqual(list(test_object.pheromone_map.values), [.5, 2.5, .5])
+		self.assertEqual(test_object.pheromone_map[1][0], 2.5)
+	
+	def test_symmetric_invalid_type(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		def test_distance_callback(start, end):
+			pass
+		
+		#testing
+		with self.assertRaisesRegex(TypeError, 'symmetric must be bool'):
+			test_empty_object({0: 0}, test_distance_callback, symmetric=1)
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_init_with_metric_name(self):
+		module.debug = False
+		
+		class test_empty_object(module.ant_colony):
+			def _init_ants(self, start=0): pass
+		
+		#testing
+		#the precomputed distances are packed as well
+		test_object = test_empty_object({0: (0, 0), 1: (3, 4), 2: (6, 8)}, 'euclidean', symmetric=True)
+		self.assertTrue(isinstance(test_object.distance_matrix, module.symmetric_matrix))
+		self.assertEqual(list(test_object.distance_matrix.values), [0.0, 5.0, 0.0, 10.0, 5.0, 0.0])
+		self.assertTrue(isinstance(test_object.pheromone_map, module.symmetric_matrix))
+
+if __name__ == '__main__':
+    unittest.main()
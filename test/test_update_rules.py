@@ -0,0 +1,200 @@
+import unittest
+import importlib
+
+#source: http://stackoverflow.com/a/11158224/5343977
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+import ant_colony as module
+
+class TestUpdateRules(unittest.TestCase):
+	def make_colony(self):
+		class mock_colony:
+			pass
+		colony = mock_colony()
+		colony.nodes = {x: x for x in range(10)}
+		colony.ant_count = 3
+		colony.pheromone_constant = 3.0
+		colony.pheromone_evaporation_coefficient = .5
+		colony.shortest_path_seen = [0, 2, 1]
+		colony.shortest_distance = 2.0
+		return colony
+	
+	def test_ant_system(self):
+		module.debug = False
+		ants = [module._tour([0, 1, 2], 6.0), module._tour([0, 2, 1], 4.0), module._tour([1, 0, 2], 5.0)]
+		
+		#testing
+		for test_object in [module.update_rule(), module.ant_system()]:
+			self.assertTrue(test_object.deposits(self.make_colony(), ants) is ants)
+			self.assertEqual(test_object.initial_pheromone(self.make_colony()), None)
+			self.assertEqual(test_object.bounds(self.make_colony()), None)
+	
+	def test_elitist_ant_system(self):
+		module.debug = False
+		ants = [module._tour([0, 1, 2], 6.0), module._tour([0, 2, 1], 4.0), module._tour([1, 0, 2], 5.0)]
+		
+		#testing
+		#all ants, and the shortest path so far as much as the 3 ants on top
+		tours = module.elitist_ant_system().deposits(self.make_colony(), ants)
+		self.assertEqual(tours[:3], ants)
+		self.assertEqual(tours[3].get_route(), [0, 2, 1])
+		self.assertAlmostEqual(tours[3].get_distance_traveled(), 2.0/3)
+		#(3 + 3) * Q / (rho * 2.0)
+		self.assertAlmostEqual(module.elitist_ant_system().initial_pheromone(self.make_colony()), 18.0)
+		
+		tours = module.elitist_ant_system(elitist_weight=4).deposits(self.make_colony(), ants)
+		self.assertAlmostEqual(tours[3].get_distance_traveled(), 0.5)
+		
+		with self.assertRaises(TypeError):
+			module.elitist_ant_system(elitist_weight='4')
+		with self.assertRaises(ValueError):
+			module.elitist_ant_system(elitist_weight=0)
+	
+	def test_rank_based_ant_system(self):
+		module.debug = False
+		
+		#testing
+		#the 2 shortest tours of the iteration, 2 and 1 times as much, and the shortest path so far 3 times as much
+		tours = module.rank_based_ant_system(ranks=3).deposits(self.make_colony(), [module._tour([0, 1, 2], 6.0), module._tour([0, 2, 1], 4.0), module._tour([1, 0, 2], 5.0)])
+		self.assertEqual([tour.get_route() for tour in tours], [[0, 2, 1], [1, 0, 2], [0, 2, 1]])
+		for tour, expected in zip(tours, [4.0/2, 5.0/1, 2.0/3]):
+			self.assertAlmostEqual(tour.get_distance_traveled(), expected)
+		#3*2/2 * Q / (rho * 2.0)
+		self.assertAlmostEqual(module.rank_based_ant_system(ranks=3).initial_pheromone(self.make_colony()), 9.0)
+		
+		with self.assertRaises(TypeError):
+			module.rank_based_ant_system(ranks=2.0)
+		with self.assertRaises(ValueError):
+			module.rank_based_ant_system(ranks=0)
+	
+	def test_max_min_ant_system(self):
+		module.debug = False
+		ants = [module._tour([0, 1, 2], 6.0), module._tour([0, 2, 1], 4.0), module._tour([1, 0, 2], 5.0)]
+		
+		#testing
+		#only the shortest tour of the iteration
+		tours = module.max_min_ant_system().deposits(self.make_colony(), ants)
+		self.assertEqual(tours, [ants[1]])
+		#or of all iterations
+		tours = module.max_min_ant_system(best='global').deposits(self.make_colony(), ants)
+		self.assertEqual([(tour.get_route(), tour.get_distance_traveled()) for tour in tours], [([0, 2, 1], 2.0)])
+		
+		#tau_max = Q / (rho * 2.0)
+		test_object = module.max_min_ant_system(p_best=.5)
+		self.assertAlmostEqual(test_object.initial_pheromone(self.make_colony()), 3.0)
+		low, high = test_object.bounds(self.make_colony())
+		self.assertAlmostEqual(high, 3.0)
+		p_dec = pow(.5, 1/10.0)
+		self.assertAlmostEqual(low, 3.0 * (1 - p_dec) / (4 * p_dec))
+		
+		#no bounds without evaporation
+		colony = self.make_colony()
+		colony.pheromone_evaporation_coefficient = 0.0
+		self.assertEqual(test_object.bounds(colony), None)
+		
+		with self.assertRaises(TypeError):
+			module.max_min_ant_system(best=1)
+		with self.assertRaises(ValueError):
+			module.max_min_ant_system(best='local')
+		with self.assertRaises(TypeError):
+			module.max_min_ant_system(p_best='.05')
+		with self.assertRaises(ValueError):
+			module.max_min_ant_system(p_best=1)
+	
+	def test_ant_colony_system(self):
+		module.debug = False
+		colony = self.make_colony()
+		colony.initial_pheromone_amount = None
+		
+		#testing
+		test_object = module.ant_colony_system(q0=.5, local_evaporation=.2)
+		self.assertEqual((test_object.q0, test_object.local_evaporation), (.5, .2))
+		self.assertEqual((module.update_rule.q0, module.update_rule.local_evaporation), (0.0, 0.0))
+		#only the shortest path so far, rho times as much
+		tours = test_object.deposits(colony, [module._tour([0, 1, 2], 6.0), module._tour([0, 2, 1], 4.0), module._tour([1, 0, 2], 5.0)])
+		self.assertEqual([(tour.get_route(), tour.get_distance_traveled()) for tour in tours], [([0, 2, 1], 4.0)])
+		#tau_0 = Q / (N * 2.0)
+		self.assertAlmostEqual(test_object.initial_pheromone(colony), .15)
+		self.assertEqual(test_object.bounds(colony), None)
+		colony.initial_pheromone_amount = .15
+		self.assertEqual(test_object.bounds(colony), (.15, float('inf')))
+		
+		#no global update without evaporation
+		colony.pheromone_evaporation_coefficient = 0.0
+		self.assertEqual(test_object.deposits(colony, [module._tour([0, 1, 2], 6.0), module._tour([0, 2, 1], 4.0), module._tour([1, 0, 2], 5.0)]), [])
+		
+		with self.assertRaises(TypeError):
+			module.ant_colony_system(q0='.9')
+		with self.assertRaises(ValueError):
+			module.ant_colony_system(q0=1)
+		with self.assertRaises(TypeError):
+			module.ant_colony_system(local_evaporation=None)
+		with self.assertRaises(ValueError):
+			module.ant_colony_system(local_evaporation=-.1)
+	
+	def test_mainloop(self):
+		module.debug = False
+		
+		#testing
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(15)}
+		for update_strategy in sorted(module.update_strategies) + [module.max_min_ant_system(best='global')]:
+			test_object = module.ant_colony(testing_nodes, 'euclidean', ant_count=5, iterations=5, update_strategy=update_strategy)
+			route = test_object.mainloop()
+			self.assertEqual(sorted(route), sorted(testing_nodes))
+			if update_strategy == 'max_min':
+				low, high = test_object.pheromone_bounds
+				for row in test_object._dense_matrix(test_object.pheromone_map).tolist() if module.numpy is not None else test_object.pheromone_map:
+					for value in row:
+						self.assertTrue(low*(1 - 1e-9) <= value <= high*(1 + 1e-9))
+	
+	def test_mainloop_without_numpy(self):
+		module.debug = False
+		numpy = module.numpy
+		
+		#testing
+		#every strategy on list storage, and a seeded run gives the same result every time
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(12)}
+		try:
+			module.numpy = None
+			for update_strategy in sorted(module.update_strategies):
+				for options in [{}, {'symmetric': True}, {'seed': 3}]:
+					runs = []
+					for run in range(2 if 'seed' in options else 1):
+						test_object = module.ant_colony(testing_nodes, module.euclidean_distance, ant_count=4, iterations=4, update_strategy=update_strategy, **options)
+						route = test_object.mainloop()
+						self.assertEqual(sorted(route), sorted(testing_nodes))
+						self.assertTrue(isinstance(test_object.pheromone_map, (list, module.symmetric_matrix)))
+						runs.append((route, test_object.shortest_distance, [[test_object.pheromone_map[start][end] for end in range(12)] for start in range(12)]))
+					self.assertEqual(runs[-1], runs[0])
+		finally:
+			module.numpy = numpy
+	
+	@unittest.skipIf(module.numpy is None, "requires numpy")
+	def test_seed(self):
+		module.debug = False
+		
+		#testing
+		#a seeded run gives the same result on every backend
+		testing_nodes = {x: ((x * 7) % 11, (x * 5) % 13) for x in range(15)}
+		for update_strategy in ['elitist', 'rank', 'max_min', 'colony_system']:
+			runs = []
+			for backend in ['threads', 'batched']:
+				test_object = module.ant_colony(testing_nodes, module.euclidean_distance, ant_count=6, iterations=4, backend=backend, seed=3, update_strategy=update_strategy)
+				route = test_object.mainloop()
+				runs.append((route, test_object.shortest_distance, test_object._dense_matrix(test_object.pheromone_map).tolist()))
+			self.assertEqual(runs[0], runs[1])
+	
+	def test_update_strategy_invalid(self):
+		module.debug = False
+		
+		#testing
+		with self.assertRaises(TypeError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', update_strategy=module.max_min_ant_system)
+		with self.assertRaises(ValueError):
+			module.ant_colony({0: (0, 0)}, 'euclidean', update_strategy='min_max')
+
+if __name__ == '__main__':
+    unittest.main()